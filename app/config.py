@@ -11,9 +11,80 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
 TEMP_PATH = os.getenv("TEMP_PATH", "/tmp/pdf_service")
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+
 YOUTUBE_CHANNEL_ID = os.getenv("YOUTUBE_CHANNEL_ID", "")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
 YOUTUBE_COOKIES_PATH = os.getenv("YOUTUBE_COOKIES_PATH", "")
+YOUTUBE_COOKIES_SYNC_INTERVAL = int(os.getenv("YOUTUBE_COOKIES_SYNC_INTERVAL", "300"))
+YOUTUBE_COOKIES_CHECK_INTERVAL = int(os.getenv("YOUTUBE_COOKIES_CHECK_INTERVAL", "3600"))
+YOUTUBE_BROWSER_STATE_PATH = os.getenv(
+    "YOUTUBE_BROWSER_STATE_PATH",
+    os.path.join(TEMP_PATH, "youtube_browser_state.json")
+)
+YOUTUBE_CHANNEL_CACHE_PATH = os.getenv(
+    "YOUTUBE_CHANNEL_CACHE_PATH",
+    os.path.join(TEMP_PATH, "youtube_cache.db")
+)
+YOUTUBE_CHANNEL_CACHE_MEMORY_SIZE = int(os.getenv("YOUTUBE_CHANNEL_CACHE_MEMORY_SIZE", "10000"))
+YOUTUBE_CHANNEL_NEGATIVE_TTL = int(os.getenv("YOUTUBE_CHANNEL_NEGATIVE_TTL", "600"))
+YOUTUBE_CHANNEL_METADATA_TTL = int(os.getenv("YOUTUBE_CHANNEL_METADATA_TTL", "86400"))
+YOUTUBE_TRANSCRIPT_CACHE_PATH = os.getenv(
+    "YOUTUBE_TRANSCRIPT_CACHE_PATH",
+    os.path.join(TEMP_PATH, "youtube_transcripts.db")
+)
+YOUTUBE_TRANSCRIPT_CACHE_MEMORY_SIZE = int(os.getenv("YOUTUBE_TRANSCRIPT_CACHE_MEMORY_SIZE", "200"))
+YOUTUBE_TRANSCRIPT_CACHE_MAX_MB = int(os.getenv("YOUTUBE_TRANSCRIPT_CACHE_MAX_MB", "500"))
+YOUTUBE_TRANSCRIPT_NEGATIVE_TTL = int(os.getenv("YOUTUBE_TRANSCRIPT_NEGATIVE_TTL", "21600"))
+YOUTUBE_TRANSCRIPT_WORKERS = int(os.getenv("YOUTUBE_TRANSCRIPT_WORKERS", "4"))
+YOUTUBE_TRANSCRIPT_QUEUE_LIMIT = int(os.getenv("YOUTUBE_TRANSCRIPT_QUEUE_LIMIT", "32"))
+YOUTUBE_TRANSCRIPT_TIMEOUT = int(os.getenv("YOUTUBE_TRANSCRIPT_TIMEOUT", "60"))
+# Read caption metadata only and fetch the json3 track directly (false: let yt-dlp write subtitle files)
+YOUTUBE_TRANSCRIPT_LEAN = os.getenv("YOUTUBE_TRANSCRIPT_LEAN", "true").lower() == "true"
+YOUTUBE_API_CACHE_PATH = os.getenv(
+    "YOUTUBE_API_CACHE_PATH",
+    os.path.join(TEMP_PATH, "youtube_api_cache.db")
+)
+YOUTUBE_API_CACHE_TTL = int(os.getenv("YOUTUBE_API_CACHE_TTL", "300"))
+# Per-endpoint overrides, e.g. "channels=86400,videos=3600"
+YOUTUBE_API_CACHE_TTLS = os.getenv("YOUTUBE_API_CACHE_TTLS", "")
+YOUTUBE_API_STALE_TTL = int(os.getenv("YOUTUBE_API_STALE_TTL", "3600"))
+YOUTUBE_API_DAILY_QUOTA = int(os.getenv("YOUTUBE_API_DAILY_QUOTA", "10000"))
+YOUTUBE_SUBSCRIPTION_SNAPSHOT_PATH = os.getenv(
+    "YOUTUBE_SUBSCRIPTION_SNAPSHOT_PATH",
+    os.path.join(TEMP_PATH, "youtube_subscriptions.db")
+)
+YOUTUBE_UPLOADS_DB_PATH = os.getenv(
+    "YOUTUBE_UPLOADS_DB_PATH",
+    os.path.join(TEMP_PATH, "youtube_uploads.db")
+)
+YOUTUBE_VIDEO_CACHE_TTL = int(os.getenv("YOUTUBE_VIDEO_CACHE_TTL", "600"))
+YOUTUBE_VIDEO_CACHE_SIZE = int(os.getenv("YOUTUBE_VIDEO_CACHE_SIZE", "10000"))
+YOUTUBE_BATCH_CONCURRENCY = int(os.getenv("YOUTUBE_BATCH_CONCURRENCY", "8"))
+YOUTUBE_FEED_CONCURRENCY = int(os.getenv("YOUTUBE_FEED_CONCURRENCY", "16"))
+YOUTUBE_FEED_CACHE_TTL = int(os.getenv("YOUTUBE_FEED_CACHE_TTL", "60"))
+YOUTUBE_FEED_STALE_TTL = int(os.getenv("YOUTUBE_FEED_STALE_TTL", "900"))
+YOUTUBE_FEED_CACHE_SIZE = int(os.getenv("YOUTUBE_FEED_CACHE_SIZE", "5000"))
+YOUTUBE_WATCHER_ENABLED = os.getenv("YOUTUBE_WATCHER_ENABLED", "true").lower() == "true"
+YOUTUBE_WATCHER_DB_PATH = os.getenv(
+    "YOUTUBE_WATCHER_DB_PATH",
+    os.path.join(TEMP_PATH, "youtube_watcher.db")
+)
+YOUTUBE_WATCHER_MIN_INTERVAL = int(os.getenv("YOUTUBE_WATCHER_MIN_INTERVAL", "300"))
+YOUTUBE_WATCHER_MAX_INTERVAL = int(os.getenv("YOUTUBE_WATCHER_MAX_INTERVAL", "21600"))
+YOUTUBE_WATCHER_WEBHOOK_URL = os.getenv("YOUTUBE_WATCHER_WEBHOOK_URL", "")
+YOUTUBE_WATCHER_WEBHOOK_SECRET = os.getenv("YOUTUBE_WATCHER_WEBHOOK_SECRET", "")
+YOUTUBE_WEBSUB_HUB_URL = os.getenv("YOUTUBE_WEBSUB_HUB_URL", "https://pubsubhubbub.appspot.com/subscribe")
+# Public URL of this service's /hooks/youtube/websub path, as reachable by the hub
+YOUTUBE_WEBSUB_CALLBACK_URL = os.getenv("YOUTUBE_WEBSUB_CALLBACK_URL", "")
+YOUTUBE_WEBSUB_LEASE_SECONDS = int(os.getenv("YOUTUBE_WEBSUB_LEASE_SECONDS", "432000"))
+YOUTUBE_WEBSUB_DB_PATH = os.getenv(
+    "YOUTUBE_WEBSUB_DB_PATH",
+    os.path.join(TEMP_PATH, "youtube_websub.db")
+)
+YOUTUBE_BROWSER_CONCURRENCY = int(os.getenv("YOUTUBE_BROWSER_CONCURRENCY", "2"))
 
 
 def find_poppler_path():
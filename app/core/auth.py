@@ -1,12 +1,17 @@
 from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import API_KEY
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path.startswith("/api/"):
+class AuthMiddleware:
+    # Plain ASGI: BaseHTTPMiddleware wraps receive and hides client disconnects from endpoints
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request = Request(scope)
+        if scope["type"] == "http" and request.url.path.startswith("/api/"):
             api_key = request.headers.get("x-api-key")
             
             if not api_key or api_key != API_KEY:
@@ -15,6 +20,4 @@ class AuthMiddleware(BaseHTTPMiddleware):
                     detail="Unauthorized"
                 )
         
-        response = await call_next(request)
-        return response
-
+        await self.app(scope, receive, send)
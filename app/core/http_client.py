@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, AsyncIterator
+
+import httpx
+
+from app.config import HTTP_TIMEOUT, HTTP_MAX_CONNECTIONS, HTTP_MAX_CONNECTIONS_PER_HOST
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class HttpClient:
+    """
+    App-wide async HTTP client with keep-alive pooling.
+    
+    Wraps one httpx.AsyncClient (HTTP/2 when the h2 package is installed)
+    and caps the number of in-flight requests per host.
+    """
+    
+    def __init__(self):
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=min(HTTP_TIMEOUT, 5.0)),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS
+            ),
+            follow_redirects=True
+        )
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        host = httpx.URL(url).host
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores.setdefault(
+                host, asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST)
+            )
+        async with semaphore:
+            yield
+    
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        async with self._host_slot(url):
+            return await self._client.request(method, url, **kwargs)
+    
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+    
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+    
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_client: Optional[HttpClient] = None
+
+
+async def start_http_client() -> HttpClient:
+    """Create the shared client (called from the app lifespan)."""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+        logger.info(f"HTTP client started (http2={HTTP2_AVAILABLE})")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> HttpClient:
+    """Return the shared client, creating it on first use outside the app lifespan."""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
@@ -2,9 +2,8 @@ import logging
 import json
 import time
 from datetime import datetime
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import LOG_LEVEL
 
@@ -18,24 +17,36 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+class LoggingMiddleware:
+    # Plain ASGI: BaseHTTPMiddleware wraps receive and hides client disconnects from endpoints
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         start_time = time.time()
+        status_code = None
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
-        response = await call_next(request)
+        await self.app(scope, receive, send_with_status)
         
         duration_ms = round((time.time() - start_time) * 1000, 2)
         
         log_data = {
             "time": datetime.utcnow().isoformat() + "Z",
             "level": "info",
-            "method": request.method,
-            "path": request.url.path,
-            "status": response.status_code,
+            "method": scope["method"],
+            "path": Request(scope).url.path,
+            "status": status_code,
             "duration_ms": duration_ms
         }
         
         logger.info(json.dumps(log_data))
-        
-        return response
-
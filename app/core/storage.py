@@ -0,0 +1,19 @@
+import os
+import sqlite3
+
+
+def open_database(path: str) -> sqlite3.Connection:
+    """
+    Open (and create if needed) a SQLite database for service caches.
+    
+    The connection may be shared between threads; callers serialize access
+    with their own lock. WAL mode keeps readers from blocking the writer.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
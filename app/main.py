@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from slowapi import _rate_limit_exceeded_handler
@@ -7,9 +9,33 @@ from app.core.auth import AuthMiddleware
 from app.core.logger import LoggingMiddleware
 from app.core.errors import validation_exception_handler, general_exception_handler
 from app.core.rate_limiter import limiter
+from app.core.http_client import start_http_client, close_http_client
+from app.config import YOUTUBE_WATCHER_ENABLED, YOUTUBE_WEBSUB_CALLBACK_URL
 from app.routes.router import api_router
-
-app = FastAPI(title="Utility Service Platform", version="1.0.0")
+from app.services.youtube.cookies import start_cookie_manager, stop_cookie_manager
+from app.services.youtube.transcript_pool import stop_transcript_pool
+from app.services.youtube.watcher import start_watcher, stop_watcher
+from app.services.youtube.websub import start_websub, stop_websub
+from app.services.youtube.websub_routes import callback_router as youtube_websub_callback_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_http_client()
+    start_cookie_manager()
+    if YOUTUBE_WATCHER_ENABLED:
+        start_watcher()
+    if YOUTUBE_WEBSUB_CALLBACK_URL:
+        start_websub()
+    yield
+    await stop_websub()
+    await stop_watcher()
+    await stop_transcript_pool()
+    await stop_cookie_manager()
+    await close_http_client()
+
+
+app = FastAPI(title="Utility Service Platform", version="1.0.0", lifespan=lifespan)
 
 app.state.limiter = limiter
 
@@ -21,6 +47,8 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 app.include_router(api_router, prefix="/api")
+# WebSub hub callbacks live outside /api: the hub cannot send an API key
+app.include_router(youtube_websub_callback_router, prefix="/hooks/youtube", tags=["youtube-websub"])
 
 
 @app.get("/health")
@@ -0,0 +1,162 @@
+"""
+Persistent cache mapping normalized channel URLs/handles to channel IDs.
+
+Channel IDs never change, so positive entries never expire. Lookups that
+YouTube answered with "not found" are cached for a short TTL so repeated
+typos do not trigger new fetches. A bounded in-memory LRU sits in front of
+SQLite so hot entries are answered without touching disk.
+
+Channel metadata (title, handle, avatar, counts...) parsed from the same
+page fetches is stored alongside, keyed by channel ID, with its own TTL.
+"""
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Dict, Any
+
+from app.config import (
+    YOUTUBE_CHANNEL_CACHE_PATH,
+    YOUTUBE_CHANNEL_CACHE_MEMORY_SIZE,
+    YOUTUBE_CHANNEL_NEGATIVE_TTL,
+    YOUTUBE_CHANNEL_METADATA_TTL,
+)
+from app.core.storage import open_database
+
+logger = logging.getLogger(__name__)
+
+# expires_at value for entries that never expire
+NEVER_EXPIRES = 0.0
+
+
+class ChannelIdCache:
+    """Two-tier (memory LRU + SQLite) cache of channel IDs."""
+    
+    def __init__(self, path: str, memory_size: int, negative_ttl: int, metadata_ttl: int):
+        self._memory: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._metadata: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._memory_size = memory_size
+        self._negative_ttl = negative_ttl
+        self._metadata_ttl = metadata_ttl
+        self._lock = threading.Lock()
+        self._db = open_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS channel_ids ("
+            "key TEXT PRIMARY KEY, "
+            "channel_id TEXT, "
+            "expires_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS channel_metadata ("
+            "channel_id TEXT PRIMARY KEY, "
+            "data TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL)"
+        )
+    
+    def get(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a normalized key.
+        
+        Returns:
+            Tuple of (found, channel_id). channel_id is None for a cached
+            "not found" answer.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._db.execute(
+                    "SELECT channel_id, expires_at FROM channel_ids WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    return False, None
+                entry = (row[0], row[1])
+            
+            channel_id, expires_at = entry
+            if expires_at != NEVER_EXPIRES and expires_at <= now:
+                self._memory.pop(key, None)
+                self._db.execute("DELETE FROM channel_ids WHERE key = ?", (key,))
+                return False, None
+            
+            self._remember(self._memory, key, entry)
+            return True, channel_id
+    
+    def set(self, key: str, channel_id: str) -> None:
+        """Store a resolved channel ID permanently."""
+        self._store(key, channel_id, NEVER_EXPIRES)
+    
+    def set_missing(self, key: str) -> None:
+        """Store a "channel not found" answer for the negative TTL."""
+        self._store(key, None, time.time() + self._negative_ttl)
+    
+    def _store(self, key: str, channel_id: Optional[str], expires_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO channel_ids (key, channel_id, expires_at, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, channel_id, expires_at, time.time())
+            )
+            self._remember(self._memory, key, (channel_id, expires_at))
+    
+    def get_metadata(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """Return cached channel metadata if it is younger than the metadata TTL."""
+        now = time.time()
+        with self._lock:
+            entry = self._metadata.get(channel_id)
+            if entry is None:
+                row = self._db.execute(
+                    "SELECT data, fetched_at FROM channel_metadata WHERE channel_id = ?",
+                    (channel_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = (json.loads(row[0]), row[1])
+            
+            metadata, fetched_at = entry
+            if fetched_at + self._metadata_ttl <= now:
+                self._metadata.pop(channel_id, None)
+                return None
+            
+            self._remember(self._metadata, channel_id, entry)
+            return dict(metadata)
+    
+    def set_metadata(self, channel_id: str, metadata: Dict[str, Any]) -> None:
+        """Store channel metadata, stamped with the current time."""
+        fetched_at = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO channel_metadata (channel_id, data, fetched_at) "
+                "VALUES (?, ?, ?)",
+                (channel_id, json.dumps(metadata), fetched_at)
+            )
+            self._remember(self._metadata, channel_id, (metadata, fetched_at))
+    
+    def _remember(self, lru: OrderedDict, key: str, entry: Tuple[Any, float]) -> None:
+        """Insert/refresh an entry in a memory LRU (caller holds the lock)."""
+        lru[key] = entry
+        lru.move_to_end(key)
+        while len(lru) > self._memory_size:
+            lru.popitem(last=False)
+
+
+_cache: Optional[ChannelIdCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_channel_id_cache() -> ChannelIdCache:
+    """Return the process-wide channel ID cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ChannelIdCache(
+                    YOUTUBE_CHANNEL_CACHE_PATH,
+                    YOUTUBE_CHANNEL_CACHE_MEMORY_SIZE,
+                    YOUTUBE_CHANNEL_NEGATIVE_TTL,
+                    YOUTUBE_CHANNEL_METADATA_TTL
+                )
+                logger.info(f"Channel ID cache opened: {YOUTUBE_CHANNEL_CACHE_PATH}")
+    return _cache
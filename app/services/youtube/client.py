@@ -1,22 +1,67 @@
 import re
 import json
+import time
 import logging
 import asyncio
-import requests
-from urllib.parse import unquote
-from typing import Dict, Any, Optional, List
+import httpx
+from datetime import datetime
+from urllib.parse import unquote, urlparse
+from collections import Counter
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Iterable, AsyncIterator
 
-from app.config import YOUTUBE_API_KEY, YOUTUBE_CHANNEL_ID
+from app.config import (
+    YOUTUBE_API_KEY,
+    YOUTUBE_CHANNEL_ID,
+    YOUTUBE_BROWSER_STATE_PATH,
+    YOUTUBE_BATCH_CONCURRENCY,
+    YOUTUBE_BROWSER_CONCURRENCY,
+)
+from app.core.http_client import get_http_client
+from app.services.youtube.channel_cache import get_channel_id_cache
+from app.services.youtube.data_api import api_get
+from app.services.youtube.transcript_client import extract_video_id
 
 logger = logging.getLogger(__name__)
 
-YOUTUBE_API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+YOUTUBE_OEMBED_URL = "https://www.youtube.com/oembed"
 
 CHANNEL_ID_REGEX = re.compile(r"^UC[A-Za-z0-9_-]{22}$")
 CHANNEL_ID_URL_PATTERN = re.compile(r"/channel/(UC[a-zA-Z0-9_-]{22})")
 CANONICAL_LINK_PATTERN = re.compile(
     r'<link[^>]+rel="canonical"[^>]+href="https://www\.youtube\.com/channel/([^"]+)"'
 )
+CHANNEL_ID_KEY_PATTERN = re.compile(r'"channelId":"(UC[A-Za-z0-9_-]{22})"')
+
+# Priority paths - these contain the main channel ID
+PRIORITY_CHANNEL_ID_PATHS = [
+    ["header", "c4TabbedHeaderRenderer", "channelId"],
+    ["metadata", "channelMetadataRenderer", "externalId"],
+    ["header", "pageHeaderRenderer", "content", "pageHeaderViewModel",
+     "actions", "flexibleActionsViewModel", "actionsRows", 0,
+     "actions", 0, "buttonViewModel", "onTap", "innertubeCommand",
+     "browseEndpoint", "browseId"],
+]
+
+# Regex equivalents of the first two priority paths, matched on raw HTML
+PRIORITY_CHANNEL_ID_PATTERNS = [
+    re.compile(r'"c4TabbedHeaderRenderer":\{"channelId":"(UC[A-Za-z0-9_-]{22})"'),
+    re.compile(
+        r'"channelMetadataRenderer":\{(?:[^{}"]|"(?:[^"\\]|\\.)*")*?'
+        r'"externalId":"(UC[A-Za-z0-9_-]{22})"'
+    ),
+]
+
+# Owner channel ID on a watch page, most specific first
+WATCH_PAGE_CHANNEL_ID_PATTERNS = [
+    re.compile(r'<meta itemprop="channelId" content="(UC[A-Za-z0-9_-]{22})"'),
+    re.compile(r'"externalChannelId":"(UC[A-Za-z0-9_-]{22})"'),
+    re.compile(r'"videoDetails":\{"videoId":"[A-Za-z0-9_-]{11}".*?"channelId":"(UC[A-Za-z0-9_-]{22})"'),
+]
+
+_JSON_DECODER = json.JSONDecoder()
+
+COUNT_PATTERN = re.compile(r"([\d][\d.,]*)\s*([KMB])?\b", re.IGNORECASE)
+COUNT_MULTIPLIERS = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
 
 # Consent button selectors for Playwright
 CONSENT_BUTTON_SELECTORS = [
@@ -29,10 +74,110 @@ CONSENT_BUTTON_SELECTORS = [
     'form[action*="consent"] button',
 ]
 
+# Partial response: only the subscription fields we return
+SUBSCRIPTION_FIELDS = (
+    "nextPageToken,pageInfo/totalResults,"
+    "items/snippet(title,description,resourceId/channelId,thumbnails/default/url)"
+)
+
+# channels.list accepts up to 50 IDs per call
+CHANNELS_BATCH_SIZE = 50
+
+# Pre-answered consent cookies so EU servers get the channel page, not the consent wall
+CONSENT_COOKIE_HEADER = {"Cookie": "SOCS=CAI; CONSENT=YES+cb"}
+
+# Only these hosts are fetched or cached; anything else could plant a fake ID under a real handle
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be"}
+
+RESOLVER_TIERS = ["url", "cache", "http", "api", "oembed", "browser"]
+
+_tier_stats: Dict[str, Dict[str, float]] = {
+    tier: {"calls": 0, "hits": 0, "errors": 0, "total_ms": 0.0, "last_ms": 0.0}
+    for tier in RESOLVER_TIERS
+}
+
+# Each browser lookup launches Chromium; cap how many run at once
+_browser_semaphore: Optional[asyncio.Semaphore] = None
+
+
+class ChannelNotFoundError(ValueError):
+    """Raised when YouTube reports that a channel does not exist."""
+
+
+def _parse_subscription_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a subscriptions.list item to the response format."""
+    snippet = item.get("snippet", {})
+    resource_id = snippet.get("resourceId", {})
+    sub_channel_id = resource_id.get("channelId", "")
+    
+    return {
+        "channel_name": snippet.get("title", ""),
+        "channel_id": sub_channel_id,
+        "channel_url": f"https://www.youtube.com/channel/{sub_channel_id}" if sub_channel_id else "",
+        "description": snippet.get("description", ""),
+        "thumbnail": snippet.get("thumbnails", {}).get("default", {}).get("url", "")
+    }
+
+
+def _subscriptions_api_error(e: httpx.HTTPError) -> ValueError:
+    """Translate a Data API failure into the error reported to callers."""
+    if isinstance(e, httpx.HTTPStatusError):
+        if e.response.status_code == 403:
+            return ValueError(
+                "Error 403: Forbidden. The subscriptions are still marked as 'Private' "
+                "in the YouTube account settings. Note: It can take 10-15 mins for "
+                "privacy setting changes to propagate."
+            )
+        return ValueError(f"YouTube API error: {e.response.status_code} - {e.response.text}")
+    return ValueError(f"Failed to connect to YouTube API: {str(e)}")
+
+
+async def _fetch_subscriptions_page(
+    channel_id: str,
+    max_results: int = 50,
+    page_token: Optional[str] = None,
+    ttl: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Fetch one page of subscriptions.
+    
+    Only the fields used in the response are requested (partial response).
+    Pages come from the Data API response cache and are revalidated with
+    their stored ETag once the cache TTL has passed (ttl=0 always revalidates).
+    
+    Raises:
+        ValueError: On API or connection errors
+    """
+    params = {
+        "part": "snippet",
+        "channelId": channel_id,
+        "maxResults": min(max_results, 50),
+        "pageToken": page_token,
+        "fields": SUBSCRIPTION_FIELDS
+    }
+    
+    try:
+        return await api_get("subscriptions", params, ttl=ttl, stale_ttl=0 if ttl == 0 else None)
+    except httpx.HTTPError as e:
+        raise _subscriptions_api_error(e)
+
 
-def get_public_subscriptions(
+def _subscriptions_target(channel_id: Optional[str]) -> str:
+    """Validate configuration and return the channel to list subscriptions for."""
+    if not YOUTUBE_API_KEY:
+        raise ValueError("YOUTUBE_API_KEY is not configured")
+    
+    target_channel_id = channel_id or YOUTUBE_CHANNEL_ID
+    if not target_channel_id:
+        raise ValueError("Channel ID is required")
+    return target_channel_id
+
+
+async def get_public_subscriptions(
     channel_id: Optional[str] = None,
-    max_results: int = 50
+    max_results: int = 50,
+    page_token: Optional[str] = None,
+    include_statistics: bool = False
 ) -> Dict[str, Any]:
     """
     Get public subscriptions for a YouTube channel.
@@ -40,61 +185,150 @@ def get_public_subscriptions(
     Args:
         channel_id: Channel ID to get subscriptions for. Defaults to configured channel.
         max_results: Maximum number of results per page (max 50).
+        page_token: Page to fetch (next_page_token from a previous call).
+        include_statistics: Add subscriber/video/view counts of each
+            subscribed channel (one batched channels.list call per page).
     
     Returns:
         Dictionary containing subscription data with channel names and URLs.
     """
-    if not YOUTUBE_API_KEY:
-        raise ValueError("YOUTUBE_API_KEY is not configured")
+    target_channel_id = _subscriptions_target(channel_id)
+    data = await _fetch_subscriptions_page(target_channel_id, max_results, page_token)
+    subscriptions = [_parse_subscription_item(item) for item in data.get("items", [])]
+    if include_statistics:
+        await _add_statistics(subscriptions)
     
-    target_channel_id = channel_id or YOUTUBE_CHANNEL_ID
-    if not target_channel_id:
-        raise ValueError("Channel ID is required")
+    return {
+        "total_results": data.get("pageInfo", {}).get("totalResults", 0),
+        "next_page_token": data.get("nextPageToken"),
+        "subscriptions": subscriptions
+    }
+
+
+async def iter_subscription_pages(
+    channel_id: Optional[str] = None,
+    ttl: Optional[int] = None,
+    include_statistics: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Follow every subscriptions page for a channel.
     
-    url = f"{YOUTUBE_API_BASE_URL}/subscriptions"
+    Pages are requested at the maximum size of 50, with partial responses and
+    If-None-Match, so pages that have not changed since the last export are
+    answered with 304.
     
-    params = {
-        "part": "snippet",
-        "channelId": target_channel_id,
-        "key": YOUTUBE_API_KEY,
-        "maxResults": min(max_results, 50)
-    }
+    Args:
+        channel_id: Channel ID to get subscriptions for. Defaults to configured channel.
+        ttl: Response cache TTL for the pages; 0 revalidates every page.
+        include_statistics: Add subscriber/video/view counts to each subscription.
     
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        subscriptions = []
-        for item in data.get("items", []):
-            snippet = item.get("snippet", {})
-            resource_id = snippet.get("resourceId", {})
-            sub_channel_id = resource_id.get("channelId", "")
-            
-            subscription_data = {
-                "channel_name": snippet.get("title", ""),
-                "channel_id": sub_channel_id,
-                "channel_url": f"https://www.youtube.com/channel/{sub_channel_id}" if sub_channel_id else "",
-                "description": snippet.get("description", ""),
-                "thumbnail": snippet.get("thumbnails", {}).get("default", {}).get("url", "")
-            }
-            subscriptions.append(subscription_data)
-        
-        return {
+    Yields:
+        One dictionary per page with total_results and its subscriptions.
+    
+    Raises:
+        ValueError: On configuration, API or connection errors
+    """
+    target_channel_id = _subscriptions_target(channel_id)
+    page_token = None
+    seen_tokens = set()
+    
+    while True:
+        data = await _fetch_subscriptions_page(target_channel_id, 50, page_token, ttl)
+        subscriptions = [_parse_subscription_item(item) for item in data.get("items", [])]
+        if include_statistics:
+            await _add_statistics(subscriptions)
+        yield {
+            "channel_id": target_channel_id,
             "total_results": data.get("pageInfo", {}).get("totalResults", 0),
             "subscriptions": subscriptions
         }
+        
+        page_token = data.get("nextPageToken")
+        if not page_token or page_token in seen_tokens:
+            break
+        seen_tokens.add(page_token)
+
+
+def _channel_statistics(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "subscriber_count": metadata.get("subscriber_count"),
+        "video_count": metadata.get("video_count"),
+        "view_count": metadata.get("view_count")
+    }
+
+
+async def _fetch_channel_statistics_batch(channel_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch snippet and statistics for up to 50 channels with one channels.list call.
     
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 403:
-            raise ValueError(
-                "Error 403: Forbidden. The subscriptions are still marked as 'Private' "
-                "in the YouTube account settings. Note: It can take 10-15 mins for "
-                "privacy setting changes to propagate."
-            )
-        raise ValueError(f"YouTube API error: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise ValueError(f"Failed to connect to YouTube API: {str(e)}")
+    Each channel is stored in the metadata cache, so later metadata lookups
+    for the same channels are answered without a request.
+    
+    Returns:
+        Metadata keyed by channel ID; channels the API did not return are missing.
+    """
+    data = await api_get("channels", {
+        "part": "snippet,statistics",
+        "id": ",".join(channel_ids),
+        "maxResults": CHANNELS_BATCH_SIZE
+    }, cache=False)  # each channel is cached in the metadata cache below
+    found = {}
+    for item in data.get("items") or []:
+        if _is_valid_channel_id(item.get("id", "")):
+            found[item["id"]] = _store_channel_metadata(_channel_metadata_from_api(item))
+    return found
+
+
+async def get_channel_statistics(channel_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get subscriber, video and view counts for many channels.
+    
+    Cached API metadata is used where available; the rest is fetched with
+    concurrent channels.list calls of 50 IDs each, so N channels cost at most
+    N/50 requests.
+    
+    Args:
+        channel_ids: YouTube channel IDs (UC...)
+    
+    Returns:
+        Statistics keyed by channel ID. Channels that could not be fetched are missing.
+    """
+    statistics = {}
+    missing = []
+    cache = get_channel_id_cache()
+    for channel_id in dict.fromkeys(channel_ids):
+        if not _is_valid_channel_id(channel_id):
+            continue
+        metadata = cache.get_metadata(channel_id)
+        # Page-derived counts are rounded ("3.9M"); only exact API counts are reused
+        if metadata and metadata.get("source") == "api":
+            statistics[channel_id] = _channel_statistics(metadata)
+        else:
+            missing.append(channel_id)
+    
+    batches = [
+        missing[i:i + CHANNELS_BATCH_SIZE]
+        for i in range(0, len(missing), CHANNELS_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(
+        *(_fetch_channel_statistics_batch(batch) for batch in batches),
+        return_exceptions=True
+    )
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Statistics lookup failed for {len(batch)} channels: {result}")
+            continue
+        for channel_id, metadata in result.items():
+            statistics[channel_id] = _channel_statistics(metadata)
+    return statistics
+
+
+async def _add_statistics(subscriptions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach a "statistics" entry (None if unavailable) to each subscription."""
+    statistics = await get_channel_statistics([item["channel_id"] for item in subscriptions])
+    for item in subscriptions:
+        item["statistics"] = statistics.get(item["channel_id"])
+    return subscriptions
 
 
 def _is_valid_channel_id(channel_id: str) -> bool:
@@ -102,18 +336,26 @@ def _is_valid_channel_id(channel_id: str) -> bool:
     return bool(CHANNEL_ID_REGEX.match(channel_id))
 
 
-def _extract_json_object(html: str, start_marker: str) -> Optional[str]:
+def _extract_json_object(
+    html: str,
+    start_marker: str,
+    start: int = 0
+) -> Optional[Tuple[Any, str]]:
     """
-    Extract a JSON object from HTML using brace counting.
+    Decode the JSON object that follows a marker in HTML.
+    
+    Uses JSONDecoder.raw_decode, which parses in C and stops at the end of
+    the object, so the rest of the page is never scanned.
     
     Args:
         html: The HTML content to search
         start_marker: The marker to find (e.g., 'ytInitialData')
+        start: Position to start searching from
     
     Returns:
-        The extracted JSON string, or None if not found
+        Tuple of (parsed object, raw JSON text), or None if not found
     """
-    marker_pos = html.find(start_marker)
+    marker_pos = html.find(start_marker, start)
     if marker_pos == -1:
         return None
     
@@ -121,53 +363,41 @@ def _extract_json_object(html: str, start_marker: str) -> Optional[str]:
     if brace_start == -1:
         return None
     
-    depth = 0
-    in_string = False
-    escape_next = False
-    
-    for i, char in enumerate(html[brace_start:], start=brace_start):
-        if escape_next:
-            escape_next = False
-            continue
-            
-        if char == "\\":
-            escape_next = True
-            continue
-            
-        if char == '"' and not escape_next:
-            in_string = not in_string
-            continue
-            
-        if in_string:
-            continue
-            
-        if char == "{":
-            depth += 1
-        elif char == "}":
-            depth -= 1
-            if depth == 0:
-                return html[brace_start:i + 1]
+    try:
+        data, end = _JSON_DECODER.raw_decode(html, brace_start)
+    except json.JSONDecodeError:
+        return None
     
-    return None
+    return data, html[brace_start:end]
 
 
-def _find_channel_ids_recursive(obj: Any, ids: List[str]) -> None:
+def _iter_channel_ids(obj: Any) -> Iterator[str]:
     """
-    Recursively traverse a JSON object and collect all channelId values.
+    Recursively traverse a JSON object and yield all valid channelId values.
     
     Args:
         obj: The object to traverse (dict, list, or primitive)
-        ids: List to collect found channel IDs
     """
     if isinstance(obj, dict):
         for key, value in obj.items():
             if key == "channelId" and isinstance(value, str):
                 if _is_valid_channel_id(value):
-                    ids.append(value)
-            _find_channel_ids_recursive(value, ids)
+                    yield value
+            else:
+                yield from _iter_channel_ids(value)
     elif isinstance(obj, list):
         for item in obj:
-            _find_channel_ids_recursive(item, ids)
+            yield from _iter_channel_ids(item)
+
+
+def _most_common_channel_id(channel_ids: Iterable[str]) -> Optional[str]:
+    """Return the most frequent channel ID, or None if there are none."""
+    counter = Counter(channel_ids)
+    if not counter:
+        return None
+    most_common = counter.most_common(1)[0][0]
+    logger.info(f"Found channel ID via fallback (most common): {most_common}")
+    return most_common
 
 
 def _get_nested_value(obj: Any, path: list) -> Optional[str]:
@@ -197,61 +427,272 @@ def _get_nested_value(obj: Any, path: list) -> Optional[str]:
     return current if isinstance(current, str) else None
 
 
+def _extract_channel_id_from_priority_paths(data: Any) -> Optional[str]:
+    """Check the JSON paths that hold the page's own channel ID."""
+    for path in PRIORITY_CHANNEL_ID_PATHS:
+        channel_id = _get_nested_value(data, path)
+        if channel_id and _is_valid_channel_id(channel_id):
+            logger.info(f"Found channel ID via priority path: {channel_id}")
+            return channel_id
+    return None
+
+
 def _extract_channel_id_from_json(html: str) -> Optional[str]:
     """
     Extract channel ID from ytInitialData JSON embedded in HTML.
     
+    Priority:
+    1. header.c4TabbedHeaderRenderer.channelId / metadata.channelMetadataRenderer.externalId,
+       matched with targeted regexes without decoding any JSON
+    2. The remaining priority paths on the decoded ytInitialData
+    3. The most common valid channelId in the JSON text
+    
+    Args:
+        html: The HTML content containing ytInitialData
+    
+    Returns:
+        The extracted channel ID, or None if not found
+    """
+    marker_pos = html.find("ytInitialData")
+    if marker_pos != -1:
+        for pattern in PRIORITY_CHANNEL_ID_PATTERNS:
+            match = pattern.search(html, marker_pos)
+            if match:
+                logger.info(f"Found channel ID via priority pattern: {match.group(1)}")
+                return match.group(1)
+    
+    decoded = _extract_json_object(html, "ytInitialData")
+    if not decoded:
+        decoded = _extract_json_object(html, "ytInitialPlayerResponse")
+    
+    if not decoded:
+        return None
+    
+    data, json_text = decoded
+    channel_id = _extract_channel_id_from_priority_paths(data)
+    if channel_id:
+        return channel_id
+    
+    # Fallback: count channelId keys straight from the JSON text
+    return _most_common_channel_id(CHANNEL_ID_KEY_PATTERN.findall(json_text))
+
+
+def _extract_channel_id_from_data(data: Any) -> Optional[str]:
+    """
+    Extract channel ID from parsed ytInitialData or an InnerTube browse response.
+    
     Priority:
     1. header.c4TabbedHeaderRenderer.channelId
     2. metadata.channelMetadataRenderer.externalId
     3. Any valid channelId found in the JSON (most common one)
     
     Args:
-        html: The HTML content containing ytInitialData
+        data: The parsed JSON object
     
     Returns:
         The extracted channel ID, or None if not found
     """
-    json_str = _extract_json_object(html, "ytInitialData")
-    if not json_str:
-        json_str = _extract_json_object(html, "ytInitialPlayerResponse")
+    channel_id = _extract_channel_id_from_priority_paths(data)
+    if channel_id:
+        return channel_id
     
-    if not json_str:
+    # Fallback: collect all channel IDs and return the most common one
+    return _most_common_channel_id(_iter_channel_ids(data))
+
+
+def _get_nested_list(obj: Any, path: list) -> List[Any]:
+    """Like _get_nested_value, but for list values (empty list if missing)."""
+    current = _get_nested_dict(obj, path[:-1])
+    value = current.get(path[-1]) if current else None
+    return value if isinstance(value, list) else []
+
+
+def _get_nested_dict(obj: Any, path: list) -> Optional[Dict[str, Any]]:
+    """Follow a path of dictionary keys, returning the dict at the end or None."""
+    current = obj
+    for key in path:
+        if not isinstance(current, dict):
+            return None
+        current = current.get(key)
+    return current if isinstance(current, dict) else None
+
+
+def _text_content(obj: Any) -> Optional[str]:
+    """Flatten YouTube text objects ({"simpleText"}, {"runs"}, {"content"}) to a string."""
+    if isinstance(obj, str):
+        return obj
+    if not isinstance(obj, dict):
         return None
-    
+    if "simpleText" in obj:
+        return obj["simpleText"]
+    if "content" in obj:
+        return obj["content"]
+    if "runs" in obj:
+        return "".join(run.get("text", "") for run in obj["runs"] if isinstance(run, dict))
+    return None
+
+
+def _parse_count(text: Optional[str]) -> Optional[int]:
+    """Parse counts such as "1.23M subscribers" or "1,234 videos" (approximate for K/M/B)."""
+    if not text:
+        return None
+    match = COUNT_PATTERN.search(text)
+    if not match:
+        return None
+    number = match.group(1).replace(",", "")
+    suffix = (match.group(2) or "").upper()
     try:
-        data = json.loads(json_str)
-    except json.JSONDecodeError:
+        return int(round(float(number) * COUNT_MULTIPLIERS.get(suffix, 1)))
+    except ValueError:
+        return None
+
+
+def _largest_image_url(images: Any) -> Optional[str]:
+    """Return the URL of the widest image in a thumbnails/sources list."""
+    if not isinstance(images, list) or not images:
+        return None
+    best = max(
+        (image for image in images if isinstance(image, dict) and image.get("url")),
+        key=lambda image: image.get("width") or 0,
+        default=None
+    )
+    return best.get("url") if best else None
+
+
+def _build_channel_metadata(
+    channel_id: str,
+    metadata_renderer: Optional[Dict[str, Any]],
+    c4_header: Optional[Dict[str, Any]],
+    header_view_model: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Combine the channel metadata renderer and page header into one record.
+    
+    Newer channel pages use pageHeaderViewModel, older ones c4TabbedHeaderRenderer;
+    whichever is present fills in the handle and counts.
+    """
+    if not metadata_renderer and not c4_header and not header_view_model:
         return None
     
-    # Priority paths - these contain the main channel ID
-    priority_paths = [
-        ["header", "c4TabbedHeaderRenderer", "channelId"],
-        ["metadata", "channelMetadataRenderer", "externalId"],
-        ["header", "pageHeaderRenderer", "content", "pageHeaderViewModel", 
-         "actions", "flexibleActionsViewModel", "actionsRows", 0, 
-         "actions", 0, "buttonViewModel", "onTap", "innertubeCommand", 
-         "browseEndpoint", "browseId"],
-    ]
+    metadata_renderer = metadata_renderer or {}
+    c4_header = c4_header or {}
+    header_view_model = header_view_model or {}
     
-    for path in priority_paths:
-        channel_id = _get_nested_value(data, path)
-        if channel_id and _is_valid_channel_id(channel_id):
-            logger.info(f"Found channel ID via priority path: {channel_id}")
-            return channel_id
+    handle = None
+    subscriber_text = _text_content(c4_header.get("subscriberCountText"))
+    video_text = _text_content(c4_header.get("videosCountText"))
     
-    # Fallback: collect all channel IDs and return the most common one
-    all_ids: List[str] = []
-    _find_channel_ids_recursive(data, all_ids)
+    handle_text = _text_content(c4_header.get("channelHandleText"))
+    if handle_text and handle_text.startswith("@"):
+        handle = handle_text
     
-    if all_ids:
-        from collections import Counter
-        counter = Counter(all_ids)
-        most_common = counter.most_common(1)[0][0]
-        logger.info(f"Found channel ID via fallback (most common): {most_common}")
-        return most_common
+    rows = _get_nested_list(header_view_model, ["metadata", "contentMetadataViewModel", "metadataRows"])
+    for row in rows:
+        for part in row.get("metadataParts") or []:
+            text = _text_content(part.get("text"))
+            if not text:
+                continue
+            lowered = text.lower()
+            if text.startswith("@"):
+                handle = handle or text
+            elif "subscriber" in lowered:
+                subscriber_text = subscriber_text or text
+            elif "video" in lowered:
+                video_text = video_text or text
     
-    return None
+    vanity_url = metadata_renderer.get("vanityChannelUrl") or ""
+    if not handle and "/@" in vanity_url:
+        handle = vanity_url[vanity_url.index("/@") + 1:]
+    
+    avatar = (
+        _largest_image_url(_get_nested_list(metadata_renderer, ["avatar", "thumbnails"]))
+        or _largest_image_url(_get_nested_list(c4_header, ["avatar", "thumbnails"]))
+        or _largest_image_url(_get_nested_list(header_view_model, [
+            "image", "decoratedAvatarViewModel", "avatar", "avatarViewModel", "image", "sources"
+        ]))
+    )
+    
+    return {
+        "channel_id": channel_id,
+        "channel_url": f"https://www.youtube.com/channel/{channel_id}",
+        "title": (
+            metadata_renderer.get("title")
+            or c4_header.get("title")
+            or _text_content(_get_nested_dict(header_view_model, ["title", "dynamicTextViewModel", "text"]))
+        ),
+        "handle": handle,
+        "description": metadata_renderer.get("description"),
+        "avatar": avatar,
+        "subscriber_count": _parse_count(subscriber_text),
+        "subscriber_count_text": subscriber_text,
+        "video_count": _parse_count(video_text),
+        "video_count_text": video_text,
+        "view_count": None,
+        "keywords": metadata_renderer.get("keywords"),
+        "source": "page"
+    }
+
+
+def _extract_channel_metadata_from_html(html: str, channel_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract channel metadata from ytInitialData embedded in HTML.
+    
+    Only the small metadata and header objects are decoded (raw_decode from
+    their keys), not the whole multi-megabyte ytInitialData blob.
+    """
+    marker_pos = html.find("ytInitialData")
+    if marker_pos == -1:
+        return None
+    
+    objects = []
+    for key in ('"channelMetadataRenderer":', '"c4TabbedHeaderRenderer":', '"pageHeaderViewModel":'):
+        decoded = _extract_json_object(html, key, marker_pos)
+        objects.append(decoded[0] if decoded else None)
+    
+    return _build_channel_metadata(channel_id, *objects)
+
+
+def _extract_channel_metadata_from_data(data: Any, channel_id: str) -> Optional[Dict[str, Any]]:
+    """Extract channel metadata from parsed ytInitialData or an InnerTube browse response."""
+    return _build_channel_metadata(
+        channel_id,
+        _get_nested_dict(data, ["metadata", "channelMetadataRenderer"]),
+        _get_nested_dict(data, ["header", "c4TabbedHeaderRenderer"]),
+        _get_nested_dict(data, ["header", "pageHeaderRenderer", "content", "pageHeaderViewModel"])
+    )
+
+
+def _channel_metadata_from_api(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Build channel metadata from a Data API channels.list item (snippet + statistics)."""
+    channel_id = item.get("id", "")
+    snippet = item.get("snippet", {})
+    statistics = item.get("statistics", {})
+    thumbnails = snippet.get("thumbnails", {})
+    avatar = next(
+        (thumbnails[size]["url"] for size in ("high", "medium", "default") if size in thumbnails),
+        None
+    )
+    subscriber_count = None
+    if not statistics.get("hiddenSubscriberCount") and "subscriberCount" in statistics:
+        subscriber_count = int(statistics["subscriberCount"])
+    video_count = int(statistics["videoCount"]) if "videoCount" in statistics else None
+    view_count = int(statistics["viewCount"]) if "viewCount" in statistics else None
+    
+    return {
+        "channel_id": channel_id,
+        "channel_url": f"https://www.youtube.com/channel/{channel_id}",
+        "title": snippet.get("title"),
+        "handle": snippet.get("customUrl"),
+        "description": snippet.get("description"),
+        "avatar": avatar,
+        "subscriber_count": subscriber_count,
+        "subscriber_count_text": None,
+        "video_count": video_count,
+        "video_count_text": None,
+        "view_count": view_count,
+        "keywords": None,
+        "source": "api"
+    }
 
 
 def _extract_channel_id_from_canonical(html: str) -> Optional[str]:
@@ -273,16 +714,21 @@ def _extract_channel_id_from_canonical(html: str) -> Optional[str]:
     return None
 
 
-def _fetch_youtube_page_sync(url: str) -> str:
+def _fetch_youtube_page_sync(url: str) -> Dict[str, Any]:
     """
     Fetch a YouTube page using Playwright via subprocess.
     This avoids asyncio conflicts with uvicorn on Windows.
     
+    The worker reuses the browser storage state saved at
+    YOUTUBE_BROWSER_STATE_PATH, so consent is only clicked through once.
+    
     Args:
         url: The YouTube URL to fetch
     
     Returns:
-        The page HTML content
+        The worker output: "html" holds the raw document containing
+        ytInitialData, "browse_data" the youtubei/v1/browse response body
+        when the page was client-rendered instead.
     """
     import subprocess
     import sys
@@ -301,7 +747,7 @@ def _fetch_youtube_page_sync(url: str) -> str:
     
     try:
         result = subprocess.run(
-            [python_exe, worker_script, url],
+            [python_exe, worker_script, url, YOUTUBE_BROWSER_STATE_PATH],
             capture_output=True,
             text=True,
             timeout=60
@@ -317,11 +763,17 @@ def _fetch_youtube_page_sync(url: str) -> str:
             raise ValueError(output.get("error", "Unknown error"))
         
         html_content = output.get("html", "")
-        title = output.get("title", "")
+        browse_data = output.get("browse_data") or ""
+        
+        if output.get("consent_refreshed"):
+            logger.info(f"Consent page shown, browser state refreshed: {YOUTUBE_BROWSER_STATE_PATH}")
         
-        logger.info(f"Page fetched successfully. Title: {title}, HTML length: {len(html_content)}")
+        logger.info(
+            f"Page fetched successfully. URL: {output.get('url', '')}, "
+            f"HTML length: {len(html_content)}, browse data length: {len(browse_data)}"
+        )
         
-        return html_content
+        return output
         
     except subprocess.TimeoutExpired:
         raise ValueError("Timeout fetching YouTube page")
@@ -330,7 +782,7 @@ def _fetch_youtube_page_sync(url: str) -> str:
         raise ValueError("Failed to parse worker output")
 
 
-async def _fetch_youtube_page_with_playwright(url: str) -> str:
+async def _fetch_youtube_page_with_playwright(url: str) -> Dict[str, Any]:
     """
     Fetch a YouTube page using Playwright in a subprocess.
     Uses asyncio.to_thread to avoid blocking.
@@ -339,58 +791,213 @@ async def _fetch_youtube_page_with_playwright(url: str) -> str:
         url: The YouTube URL to fetch
     
     Returns:
-        The page HTML content
+        The worker output (see _fetch_youtube_page_sync)
     
     Raises:
         ValueError: If page cannot be fetched
     """
-    return await asyncio.to_thread(_fetch_youtube_page_sync, url)
+    global _browser_semaphore
+    if _browser_semaphore is None:
+        _browser_semaphore = asyncio.Semaphore(YOUTUBE_BROWSER_CONCURRENCY)
+    async with _browser_semaphore:
+        return await asyncio.to_thread(_fetch_youtube_page_sync, url)
+
+
+def _record_tier(tier: str, started: float, hit: bool, error: bool = False) -> float:
+    """Record the outcome and latency of one resolver tier. Returns elapsed ms."""
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    stats = _tier_stats[tier]
+    stats["calls"] += 1
+    stats["total_ms"] += elapsed_ms
+    stats["last_ms"] = elapsed_ms
+    if hit:
+        stats["hits"] += 1
+    if error:
+        stats["errors"] += 1
+    logger.info(f"Channel ID tier '{tier}': hit={hit}, error={error}, {elapsed_ms}ms")
+    return elapsed_ms
 
 
-async def extract_channel_id(channel_url: str) -> Dict[str, Any]:
+def get_channel_id_tier_stats() -> Dict[str, Any]:
     """
-    Extract the channel ID (UCID) from a YouTube channel URL.
+    Get per-tier call counts and latency for the channel ID resolver.
     
-    Uses Playwright to fetch the page and handle consent dialogs,
-    then extracts the channel ID from ytInitialData JSON.
+    Returns:
+        Dictionary keyed by tier name with calls, hits, errors and latency (ms).
+    """
+    tiers = {}
+    for tier in RESOLVER_TIERS:
+        stats = _tier_stats[tier]
+        calls = int(stats["calls"])
+        tiers[tier] = {
+            "calls": calls,
+            "hits": int(stats["hits"]),
+            "errors": int(stats["errors"]),
+            "avg_ms": round(stats["total_ms"] / calls, 2) if calls else None,
+            "last_ms": stats["last_ms"] if calls else None,
+        }
+    return {"tiers": tiers}
+
+
+def _parse_channel_reference(channel_url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Identify what a channel URL points to.
     
     Args:
-        channel_url: YouTube channel URL (supports /channel/, /@handle, /c/, /user/ formats)
+        channel_url: Absolute YouTube channel URL
     
     Returns:
-        Dictionary containing channel_id and channel_url.
+        Tuple of (kind, value) where kind is "channel", "handle", "custom" or "user",
+        or (None, None) if the URL is not a recognised channel URL.
+    """
+    path = urlparse(channel_url).path
+    segments = [segment for segment in path.split("/") if segment]
+    if not segments:
+        return None, None
+    
+    first = segments[0]
+    if first.startswith("@") and len(first) > 1:
+        return "handle", first
+    if first in ("channel", "c", "user") and len(segments) > 1:
+        kind = {"channel": "channel", "c": "custom", "user": "user"}[first]
+        return kind, segments[1]
+    return None, None
+
+
+def _channel_result(channel_id: str, source: str, latency_ms: float) -> Dict[str, Any]:
+    """Build the channel ID response, reporting which tier answered."""
+    return {
+        "channel_id": channel_id,
+        "channel_url": f"https://www.youtube.com/channel/{channel_id}",
+        "source": source,
+        "latency_ms": latency_ms
+    }
+
+
+async def _fetch_channel_page_http(url: str) -> str:
+    """
+    Fetch a channel page with a plain HTTP GET (no browser).
     
     Raises:
-        ValueError: If channel ID cannot be extracted
+        ChannelNotFoundError: If YouTube answers 404
+        httpx.HTTPError: On any other failure
     """
-    if not channel_url:
-        raise ValueError("Channel URL is required")
+    response = await get_http_client().get(url, headers=CONSENT_COOKIE_HEADER)
+    if response.status_code == 404:
+        raise ChannelNotFoundError(f"Channel not found: {url}")
+    response.raise_for_status()
+    if "consent." in response.url.host:
+        logger.warning(f"HTTP tier redirected to consent page: {response.url}")
+        return ""
+    return response.text
+
+
+async def _resolve_via_http(channel_url: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Tier one: plain pooled HTTP GET parsed for canonical link / ytInitialData.
+    
+    Returns:
+        Tuple of (channel_id, metadata parsed from the same page); either may be None.
+    """
+    started = time.perf_counter()
+    try:
+        html_content = await _fetch_channel_page_http(channel_url)
+    except ChannelNotFoundError:
+        _record_tier("http", started, hit=False)
+        raise
+    except httpx.HTTPError as e:
+        logger.warning(f"HTTP tier failed for {channel_url}: {e}")
+        _record_tier("http", started, hit=False, error=True)
+        return None, None
     
-    channel_url = channel_url.strip()
+    channel_id = (
+        _extract_channel_id_from_canonical(html_content)
+        or _extract_channel_id_from_json(html_content)
+    )
+    _record_tier("http", started, hit=bool(channel_id))
+    if not channel_id:
+        return None, None
+    return channel_id, _extract_channel_metadata_from_html(html_content, channel_id)
+
+
+async def _lookup_channel_via_api(kind: str, value: str) -> Optional[Dict[str, Any]]:
+    """
+    Query the Data API channels endpoint by handle, legacy username or ID.
     
-    # Decode URL-encoded URLs (handles n8n encoding)
-    original_url = channel_url
-    channel_url = unquote(channel_url)
+    snippet and statistics cost no extra quota, so they are always requested.
     
-    logger.info(f"Extracting channel ID - Original: {original_url}, Decoded: {channel_url}")
+    Returns:
+        The first channels.list item, or None if there is no match.
+    """
+    params = {"part": "id,snippet,statistics"}
+    if kind == "handle":
+        params["forHandle"] = value
+    elif kind == "user":
+        params["forUsername"] = value
+    else:
+        params["id"] = value
     
-    if not channel_url.startswith(("http://", "https://")):
-        channel_url = f"https://{channel_url}"
+    data = await api_get("channels", params)
+    items = data.get("items") or []
+    if not items or not _is_valid_channel_id(items[0].get("id", "")):
+        return None
+    return items[0]
+
+
+async def _resolve_via_api(channel_url: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Tier two: Data API forHandle/forUsername lookup (requires YOUTUBE_API_KEY).
     
-    # Quick check: if URL already contains channel ID, extract directly
-    direct_match = CHANNEL_ID_URL_PATTERN.search(channel_url)
-    if direct_match:
-        channel_id = direct_match.group(1)
-        if _is_valid_channel_id(channel_id):
-            logger.info(f"Extracted channel ID directly from URL: {channel_id}")
-            return {
-                "channel_id": channel_id,
-                "channel_url": f"https://www.youtube.com/channel/{channel_id}"
-            }
+    Returns:
+        Tuple of (channel_id, metadata); both None when the tier does not apply or misses.
+    """
+    if not YOUTUBE_API_KEY:
+        return None, None
+    
+    kind, value = _parse_channel_reference(channel_url)
+    # Custom /c/ URLs have no Data API lookup
+    if kind not in ("handle", "user"):
+        return None, None
     
+    started = time.perf_counter()
+    try:
+        item = await _lookup_channel_via_api(kind, value)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"API tier failed for {channel_url}: {e}")
+        _record_tier("api", started, hit=False, error=True)
+        return None, None
+    
+    _record_tier("api", started, hit=bool(item))
+    if not item:
+        return None, None
+    return item["id"], _channel_metadata_from_api(item)
+
+
+async def _resolve_via_browser(channel_url: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Tier three: fetch the page with Playwright and extract the channel ID.
+    
+    Returns:
+        Tuple of (channel_id, metadata parsed from the same page or None)
+    
+    Raises:
+        ValueError: If the channel ID cannot be extracted
+    """
     try:
         # Fetch page using Playwright
-        html_content = await _fetch_youtube_page_with_playwright(channel_url)
+        page = await _fetch_youtube_page_with_playwright(channel_url)
+        html_content = page.get("html", "")
+        browse_data = page.get("browse_data")
+        
+        # Method 0: InnerTube browse response captured by the browser
+        if browse_data:
+            try:
+                data = json.loads(browse_data)
+            except json.JSONDecodeError:
+                data = None
+            channel_id = _extract_channel_id_from_data(data) if data else None
+            if channel_id:
+                return channel_id, _extract_channel_metadata_from_data(data, channel_id)
         
         # Check if ytInitialData is present
         if "ytInitialData" not in html_content:
@@ -402,19 +1009,13 @@ async def extract_channel_id(channel_url: str) -> Dict[str, Any]:
         
         # Method 1: Try ytInitialData JSON parsing
         channel_id = _extract_channel_id_from_json(html_content)
-        if channel_id:
-            return {
-                "channel_id": channel_id,
-                "channel_url": f"https://www.youtube.com/channel/{channel_id}"
-            }
         
         # Method 2: Try canonical link
-        channel_id = _extract_channel_id_from_canonical(html_content)
+        if not channel_id:
+            channel_id = _extract_channel_id_from_canonical(html_content)
+        
         if channel_id:
-            return {
-                "channel_id": channel_id,
-                "channel_url": f"https://www.youtube.com/channel/{channel_id}"
-            }
+            return channel_id, _extract_channel_metadata_from_html(html_content, channel_id)
         
         logger.error(f"Could not extract channel ID from: {channel_url}")
         raise ValueError(
@@ -427,3 +1028,386 @@ async def extract_channel_id(channel_url: str) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error fetching channel page: {e}")
         raise ValueError(f"Failed to fetch channel page: {str(e)}")
+
+
+def _prepare_channel_url(channel_url: str) -> str:
+    """
+    Strip, URL-decode (handles n8n encoding) and add a scheme to a channel URL (or bare @handle).
+    
+    Raises:
+        ValueError: If the URL is not on a YouTube host
+    """
+    channel_url = unquote(channel_url.strip())
+    if channel_url.startswith("@"):
+        channel_url = f"https://www.youtube.com/{channel_url}"
+    if not channel_url.startswith(("http://", "https://")):
+        channel_url = f"https://{channel_url}"
+    host = (urlparse(channel_url).hostname or "").lower()
+    if host not in YOUTUBE_HOSTS:
+        raise ValueError(f"Not a YouTube URL: {channel_url}")
+    return channel_url
+
+
+def normalize_channel_url(channel_url: str) -> Optional[str]:
+    """
+    Build a stable key for a channel URL, e.g. "handle:@fireship".
+    
+    Handles, custom names and usernames are case-insensitive on YouTube,
+    so they are lowercased; channel IDs are kept as-is. Video URLs map to
+    "video:<video_id>" since a video's owner never changes.
+    
+    Args:
+        channel_url: YouTube channel or video URL in any supported format
+    
+    Returns:
+        The normalized key, or None if the URL is not a recognised channel URL.
+    
+    Raises:
+        ValueError: If the URL is not on a YouTube host
+    """
+    channel_url = _prepare_channel_url(channel_url)
+    kind, value = _parse_channel_reference(channel_url)
+    if kind is None:
+        video_id = _video_id_from_url(channel_url)
+        return f"video:{video_id}" if video_id else None
+    if kind != "channel":
+        value = value.lower()
+    return f"{kind}:{value}"
+
+
+def _video_id_from_url(url: str) -> Optional[str]:
+    """Return the video ID for watch/youtu.be/shorts/live/embed URLs, None for channel URLs."""
+    if _parse_channel_reference(url)[0] is not None:
+        return None
+    try:
+        return extract_video_id(url)
+    except ValueError:
+        return None
+
+
+def _extract_channel_id_from_watch_page(html: str) -> Optional[str]:
+    """Find the owning channel ID in a watch page."""
+    for pattern in WATCH_PAGE_CHANNEL_ID_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            return match.group(1)
+    return None
+
+
+async def _lookup_video_channel_via_api(video_id: str) -> Optional[str]:
+    """Query the Data API videos endpoint for a video's channel ID."""
+    data = await api_get(
+        "videos",
+        {"part": "snippet", "id": video_id, "fields": "items(snippet(channelId))"}
+    )
+    items = data.get("items") or []
+    channel_id = items[0].get("snippet", {}).get("channelId", "") if items else ""
+    return channel_id if _is_valid_channel_id(channel_id) else None
+
+
+async def _lookup_video_author_via_oembed(video_id: str) -> Optional[str]:
+    """
+    Query oEmbed for a video's author URL (usually an @handle URL).
+    
+    Raises:
+        ChannelNotFoundError: If oEmbed reports the video does not exist
+    """
+    response = await get_http_client().get(
+        YOUTUBE_OEMBED_URL,
+        params={"url": f"https://www.youtube.com/watch?v={video_id}", "format": "json"}
+    )
+    if response.status_code in (400, 404):
+        raise ChannelNotFoundError(f"Video not found: {video_id}")
+    response.raise_for_status()
+    return response.json().get("author_url")
+
+
+async def _resolve_video_channel(video_id: str) -> Tuple[str, str]:
+    """
+    Resolve the channel that owns a video without launching a browser.
+    
+    Tries a single watch page GET, then the Data API videos endpoint (when
+    YOUTUBE_API_KEY is set), then oEmbed, whose author URL is resolved like
+    any other channel URL.
+    
+    Returns:
+        Tuple of (channel_id, source tier)
+    
+    Raises:
+        ChannelNotFoundError: If the video does not exist
+        ValueError: If the owning channel cannot be determined
+    """
+    watch_url = f"https://www.youtube.com/watch?v={video_id}"
+    
+    started = time.perf_counter()
+    try:
+        html_content = await _fetch_channel_page_http(watch_url)
+        channel_id = _extract_channel_id_from_watch_page(html_content)
+        _record_tier("http", started, hit=bool(channel_id))
+        if channel_id:
+            return channel_id, "http"
+    except httpx.HTTPError as e:
+        logger.warning(f"HTTP tier failed for video {video_id}: {e}")
+        _record_tier("http", started, hit=False, error=True)
+    
+    if YOUTUBE_API_KEY:
+        started = time.perf_counter()
+        try:
+            channel_id = await _lookup_video_channel_via_api(video_id)
+            _record_tier("api", started, hit=bool(channel_id))
+            if channel_id:
+                return channel_id, "api"
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"API tier failed for video {video_id}: {e}")
+            _record_tier("api", started, hit=False, error=True)
+    
+    started = time.perf_counter()
+    try:
+        author_url = await _lookup_video_author_via_oembed(video_id)
+    except ChannelNotFoundError:
+        _record_tier("oembed", started, hit=False)
+        raise
+    except (httpx.HTTPError, ValueError) as e:
+        _record_tier("oembed", started, hit=False, error=True)
+        raise ValueError(f"Could not find the channel for video {video_id}: {str(e)}")
+    
+    if not author_url:
+        _record_tier("oembed", started, hit=False)
+        raise ValueError(f"Could not find the channel for video {video_id}")
+    
+    result = await extract_channel_id(author_url)
+    _record_tier("oembed", started, hit=True)
+    return result["channel_id"], "oembed"
+
+
+async def _resolve_uncached(channel_url: str) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    """
+    Run the network tiers in order.
+    
+    Returns:
+        Tuple of (channel_id, source tier, metadata from the same fetch or None)
+    """
+    video_id = _video_id_from_url(channel_url)
+    if video_id:
+        channel_id, source = await _resolve_video_channel(video_id)
+        return channel_id, source, None
+    
+    for tier, resolver in (("http", _resolve_via_http), ("api", _resolve_via_api)):
+        channel_id, metadata = await resolver(channel_url)
+        if channel_id:
+            return channel_id, tier, metadata
+    
+    started = time.perf_counter()
+    try:
+        channel_id, metadata = await _resolve_via_browser(channel_url)
+    except ValueError:
+        _record_tier("browser", started, hit=False, error=True)
+        raise
+    _record_tier("browser", started, hit=True)
+    return channel_id, "browser", metadata
+
+
+def _store_channel_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Stamp metadata with its fetch time and store it in the cache."""
+    metadata = {**metadata, "fetched_at": datetime.utcnow().isoformat() + "Z"}
+    get_channel_id_cache().set_metadata(metadata["channel_id"], metadata)
+    return metadata
+
+
+async def _fetch_channel_metadata(channel_id: str) -> Dict[str, Any]:
+    """
+    Fetch metadata for a known channel ID: HTTP page, then Data API, then browser.
+    
+    Raises:
+        ValueError: If no tier returns metadata
+    """
+    channel_url = f"https://www.youtube.com/channel/{channel_id}"
+    
+    _, metadata = await _resolve_via_http(channel_url)
+    
+    if not metadata and YOUTUBE_API_KEY:
+        try:
+            item = await _lookup_channel_via_api("channel", channel_id)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"API metadata lookup failed for {channel_id}: {e}")
+            item = None
+        if item:
+            metadata = _channel_metadata_from_api(item)
+    
+    if not metadata:
+        _, metadata = await _resolve_via_browser(channel_url)
+    
+    if not metadata:
+        raise ValueError(f"Could not read channel metadata for {channel_id}")
+    return _store_channel_metadata(metadata)
+
+
+async def get_channel_metadata(channel_id: str) -> Dict[str, Any]:
+    """
+    Get channel metadata (title, handle, avatar, counts, description) by channel ID.
+    
+    Served from the cache while younger than YOUTUBE_CHANNEL_METADATA_TTL,
+    otherwise fetched once and cached.
+    
+    Args:
+        channel_id: YouTube channel ID (UC...)
+    
+    Returns:
+        Dictionary of channel metadata.
+    
+    Raises:
+        ValueError: If the metadata cannot be fetched
+    """
+    metadata = get_channel_id_cache().get_metadata(channel_id)
+    if metadata:
+        return metadata
+    return await _fetch_channel_metadata(channel_id)
+
+
+async def extract_channel_id(
+    channel_url: str,
+    include_metadata: bool = False
+) -> Dict[str, Any]:
+    """
+    Extract the channel ID (UCID) from a YouTube channel URL.
+    
+    Video URLs (watch?v=, youtu.be, /shorts/, /live/) resolve to the channel
+    that owns the video, without a browser (see _resolve_video_channel).
+    
+    Resolution is tiered, cheapest first:
+    1. url: the ID is already in a /channel/UC... URL
+    2. cache: persistent handle/URL -> ID cache (includes short-lived "not found" entries)
+    3. http: plain pooled HTTP GET with consent cookies
+    4. api: Data API forHandle/forUsername lookup (when YOUTUBE_API_KEY is set)
+    5. browser: Playwright fetch, handling consent dialogs
+    
+    Metadata found on a page fetched for the ID is cached as a side effect,
+    so a later include_metadata call does not fetch the page again.
+    
+    Args:
+        channel_url: YouTube channel URL (supports /channel/, /@handle, /c/, /user/ formats)
+            or video URL
+        include_metadata: Also return channel metadata (see get_channel_metadata)
+    
+    Returns:
+        Dictionary containing channel_id, channel_url, the answering tier
+        ("source") and its latency in milliseconds, plus "metadata" if requested.
+    
+    Raises:
+        ChannelNotFoundError: If YouTube reports the channel does not exist
+        ValueError: If channel ID cannot be extracted
+    """
+    if not channel_url:
+        raise ValueError("Channel URL is required")
+    
+    original_url = channel_url
+    channel_url = _prepare_channel_url(channel_url)
+    
+    logger.info(f"Extracting channel ID - Original: {original_url}, Decoded: {channel_url}")
+    
+    # Quick check: if URL already contains channel ID, extract directly
+    started = time.perf_counter()
+    result = None
+    direct_match = CHANNEL_ID_URL_PATTERN.search(channel_url)
+    if direct_match:
+        channel_id = direct_match.group(1)
+        if _is_valid_channel_id(channel_id):
+            logger.info(f"Extracted channel ID directly from URL: {channel_id}")
+            result = _channel_result(channel_id, "url", _record_tier("url", started, hit=True))
+    
+    cache = get_channel_id_cache()
+    cache_key = normalize_channel_url(channel_url)
+    if result is None and cache_key:
+        found, channel_id = cache.get(cache_key)
+        if found:
+            latency_ms = _record_tier("cache", started, hit=True)
+            if channel_id is None:
+                raise ChannelNotFoundError(f"Channel not found: {channel_url}")
+            result = _channel_result(channel_id, "cache", latency_ms)
+        else:
+            _record_tier("cache", started, hit=False)
+    
+    metadata = None
+    if result is None:
+        started = time.perf_counter()
+        try:
+            channel_id, source, metadata = await _resolve_uncached(channel_url)
+        except ChannelNotFoundError:
+            if cache_key:
+                cache.set_missing(cache_key)
+            raise
+        
+        if cache_key:
+            cache.set(cache_key, channel_id)
+        if metadata:
+            metadata = _store_channel_metadata(metadata)
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        result = _channel_result(channel_id, source, latency_ms)
+    
+    if cache_key and cache_key.startswith("video:"):
+        result["video_id"] = cache_key[len("video:"):]
+    
+    if include_metadata:
+        result["metadata"] = metadata or await get_channel_metadata(result["channel_id"])
+    return result
+
+
+async def extract_channel_ids(
+    channel_urls: List[str],
+    concurrency: int = YOUTUBE_BATCH_CONCURRENCY,
+    include_metadata: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Resolve many channel URLs concurrently, yielding results as they complete.
+    
+    URLs are deduplicated after normalization, so "@Handle" and
+    "https://www.youtube.com/@handle/videos" are resolved once. Each lookup
+    goes through extract_channel_id (cache and fast tiers before the browser).
+    
+    Args:
+        channel_urls: YouTube channel URLs in any supported format
+        concurrency: Maximum number of lookups running at once
+        include_metadata: Also return channel metadata for each channel
+    
+    Yields:
+        One dictionary per unique channel with the input URLs that mapped to it
+        and either the resolved channel ID or an error.
+    """
+    groups: Dict[str, List[str]] = {}
+    for channel_url in channel_urls:
+        if not channel_url or not channel_url.strip():
+            continue
+        try:
+            prepared = _prepare_channel_url(channel_url)
+        except ValueError as e:
+            yield {"inputs": [channel_url], "status": "error", "error": str(e)}
+            continue
+        direct_match = CHANNEL_ID_URL_PATTERN.search(prepared)
+        if direct_match:
+            key = f"channel:{direct_match.group(1)}"
+        else:
+            key = normalize_channel_url(prepared) or prepared
+        groups.setdefault(key, []).append(channel_url)
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def resolve(inputs: List[str]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                result = await extract_channel_id(inputs[0], include_metadata=include_metadata)
+                return {"inputs": inputs, "status": "ok", **result}
+            except ChannelNotFoundError as e:
+                return {"inputs": inputs, "status": "not_found", "error": str(e)}
+            except ValueError as e:
+                return {"inputs": inputs, "status": "error", "error": str(e)}
+            except Exception as e:
+                logger.error(f"Unexpected error resolving {inputs[0]}: {e}")
+                return {"inputs": inputs, "status": "error", "error": f"Failed to resolve channel: {str(e)}"}
+    
+    tasks = [asyncio.create_task(resolve(inputs)) for inputs in groups.values()]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,286 @@
+"""
+Shared YouTube cookies for yt-dlp.
+
+The cookie source is resolved once: YOUTUBE_COOKIES_PATH if it exists,
+otherwise the first browser (Firefox, Chrome, Edge) whose cookie store can
+be read, otherwise none. The cookies are loaded into one in-memory jar that
+every YoutubeDL instance uses, instead of each request re-reading (and, for
+a cookie file, rewriting) the source.
+
+A background task periodically:
+- writes cookies YouTube refreshed back to the cookie file, if they changed
+- reloads the file if it was replaced on disk
+- checks that the login cookies are present and unexpired, and that
+  YouTube still accepts them: an authenticated request to the account page
+  catches a session that was revoked or rotated, whose cookies look valid
+  but are treated as signed out. A warning is logged when either fails.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+import httpx
+import yt_dlp
+from yt_dlp.cookies import YoutubeDLCookieJar, extract_cookies_from_browser
+
+from app.config import (
+    HTTP_TIMEOUT,
+    YOUTUBE_COOKIES_PATH,
+    YOUTUBE_COOKIES_SYNC_INTERVAL,
+    YOUTUBE_COOKIES_CHECK_INTERVAL,
+)
+from app.core.http_client import DEFAULT_HEADERS
+
+logger = logging.getLogger(__name__)
+
+BROWSERS = ("firefox", "chrome", "edge")
+
+# Cookies YouTube sets for a signed-in session
+AUTH_COOKIES = ("SAPISID", "__Secure-3PAPISID", "__Secure-1PSID", "__Secure-3PSID", "LOGIN_INFO")
+
+# Signed in, the account page renders; signed out, it redirects to the Google sign-in page
+ACCOUNT_URL = "https://www.youtube.com/account"
+
+# Set in the page config of pages rendered for a signed-in session
+LOGGED_IN_MARKER = '"LOGGED_IN":true'
+
+
+def _fingerprint(jar: YoutubeDLCookieJar) -> frozenset:
+    with jar._cookies_lock:
+        return frozenset((cookie.domain, cookie.path, cookie.name, cookie.value, cookie.expires) for cookie in jar)
+
+
+class CookieManager:
+    """Resolves the cookie source once and shares its cookie jar."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resolved = False
+        self._jar: Optional[YoutubeDLCookieJar] = None
+        self._source: Optional[str] = None
+        self._file_mtime: Optional[float] = None
+        self._saved: frozenset = frozenset()
+        self._status: Dict[str, Any] = {
+            "authenticated": False,
+            "expires_at": None,
+            "checked_at": None,
+            "session_valid": None,
+            "probed_at": None
+        }
+        self._task: Optional[asyncio.Task] = None
+    
+    def resolve(self) -> None:
+        """Load the cookie source (once; later calls return immediately)."""
+        with self._lock:
+            if self._resolved:
+                return
+            if YOUTUBE_COOKIES_PATH and os.path.exists(YOUTUBE_COOKIES_PATH):
+                self._load_file()
+                self._source = f"file: {YOUTUBE_COOKIES_PATH}"
+            else:
+                for browser in BROWSERS:
+                    try:
+                        jar = extract_cookies_from_browser(browser)
+                    except Exception:
+                        continue
+                    if len(jar):
+                        self._jar = jar
+                        self._source = f"browser: {browser}"
+                        break
+            self._resolved = True
+        
+        if self._source:
+            logger.info(f"Using cookies from {self._source} ({len(self._jar)} cookies)")
+        else:
+            logger.warning(
+                "No cookies available - may fail with restricted videos or from server IPs. "
+                "Set YOUTUBE_COOKIES_PATH or use Firefox logged into YouTube."
+            )
+        self.check()
+    
+    def attach(self, ydl: yt_dlp.YoutubeDL) -> None:
+        """Make a YoutubeDL instance use the shared jar (call before it makes any request)."""
+        self.resolve()
+        if self._jar is not None:
+            # YoutubeDL.cookiejar is a cached_property: pre-seeding it skips loading the source
+            ydl.__dict__["cookiejar"] = self._jar
+    
+    def jar(self) -> Optional[YoutubeDLCookieJar]:
+        """Return the shared cookie jar, or None if no cookies are available."""
+        self.resolve()
+        return self._jar
+    
+    def check(self, probe: bool = False) -> Dict[str, Any]:
+        """
+        Check whether the login cookies are present and unexpired.
+        
+        Args:
+            probe: Also ask YouTube whether the session still works (one
+                request; without it the last probe's result is kept)
+        """
+        now = time.time()
+        expiries = []
+        if self._jar is not None:
+            with self._jar._cookies_lock:
+                expiries = [
+                    cookie.expires for cookie in self._jar
+                    if cookie.name in AUTH_COOKIES and "youtube.com" in cookie.domain
+                    and (not cookie.expires or cookie.expires > now)
+                ]
+        expires_at = min((expiry for expiry in expiries if expiry), default=None)
+        session_valid = self._status["session_valid"]
+        probed_at = self._status["probed_at"]
+        if not expiries:
+            session_valid = None
+        elif probe:
+            session_valid = self._probe_session()
+            probed_at = now
+        
+        self._status = {
+            # A failed probe (None) does not count against the cookies; a signed-out answer does
+            "authenticated": bool(expiries) and session_valid is not False,
+            "expires_at": expires_at,
+            "checked_at": now,
+            "session_valid": session_valid,
+            "probed_at": probed_at
+        }
+        if self._jar is not None and not expiries:
+            logger.warning(f"Cookies from {self._source} have no valid YouTube login; refresh them")
+        elif session_valid is False:
+            logger.warning(f"YouTube rejects the session of the cookies from {self._source}; refresh them")
+        return dict(self._status)
+    
+    def _probe_session(self) -> Optional[bool]:
+        """
+        Request the account page with the shared jar.
+        
+        Returns:
+            True if YouTube answers signed in, False if it answers signed out,
+            None if the probe failed (network or unexpected response)
+        """
+        try:
+            # The jar is used as is, so cookies YouTube refreshes in the answer are kept
+            with httpx.Client(headers=DEFAULT_HEADERS, cookies=self._jar, timeout=HTTP_TIMEOUT) as client:
+                response = client.get(ACCOUNT_URL)
+        except httpx.HTTPError as e:
+            logger.warning(f"Cookie session probe failed: {e}")
+            return None
+        if response.is_redirect:
+            return False
+        if response.status_code != 200:
+            logger.warning(f"Cookie session probe got HTTP {response.status_code}")
+            return None
+        return LOGGED_IN_MARKER in response.text
+    
+    def sync(self) -> None:
+        """Reload a replaced cookie file, or write changed cookies back to it."""
+        if self._jar is None or not self._source or not self._source.startswith("file"):
+            return
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(YOUTUBE_COOKIES_PATH)
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime != self._file_mtime:
+                logger.info(f"Cookie file changed on disk, reloading {YOUTUBE_COOKIES_PATH}")
+                self._load_file()
+                return
+            if _fingerprint(self._jar) != self._saved:
+                self._save_file()
+    
+    def status(self) -> Dict[str, Any]:
+        self.resolve()
+        return {
+            "source": self._source,
+            "cookie_count": len(self._jar) if self._jar is not None else 0,
+            **self._status
+        }
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await asyncio.to_thread(self.sync)
+    
+    async def _run(self) -> None:
+        # Browser stores may need decryption: keep it off the event loop
+        await asyncio.to_thread(self.resolve)
+        await asyncio.to_thread(self.check, True)
+        last_check = time.time()
+        while True:
+            await asyncio.sleep(YOUTUBE_COOKIES_SYNC_INTERVAL)
+            try:
+                await asyncio.to_thread(self.sync)
+                # Probe again early after a failed probe or a reloaded cookie file
+                if (
+                    time.time() - last_check >= YOUTUBE_COOKIES_CHECK_INTERVAL
+                    or self._status["session_valid"] is None
+                ):
+                    await asyncio.to_thread(self.check, True)
+                    last_check = time.time()
+            except Exception as e:
+                logger.warning(f"Cookie sync failed: {e}")
+    
+    def _load_file(self) -> None:
+        """Load the cookie file into a fresh jar (caller holds the lock)."""
+        jar = YoutubeDLCookieJar(YOUTUBE_COOKIES_PATH)
+        jar.load()
+        if self._jar is None:
+            self._jar = jar
+        else:
+            # Keep the jar object: running YoutubeDL instances hold a reference to it
+            self._jar.clear()
+            for cookie in jar:
+                self._jar.set_cookie(cookie)
+        self._file_mtime = os.path.getmtime(YOUTUBE_COOKIES_PATH)
+        self._saved = _fingerprint(self._jar)
+        # New cookies: the last probe no longer applies
+        self._status["session_valid"] = None
+    
+    def _save_file(self) -> None:
+        """Write the jar to the cookie file atomically (caller holds the lock)."""
+        temp_path = f"{YOUTUBE_COOKIES_PATH}.tmp"
+        self._jar.save(temp_path)
+        try:
+            os.replace(temp_path, YOUTUBE_COOKIES_PATH)
+        except OSError:
+            # A bind-mounted file (Docker) cannot be replaced, only rewritten
+            os.remove(temp_path)
+            self._jar.save(YOUTUBE_COOKIES_PATH)
+        self._file_mtime = os.path.getmtime(YOUTUBE_COOKIES_PATH)
+        self._saved = _fingerprint(self._jar)
+        logger.info(f"Saved refreshed cookies to {YOUTUBE_COOKIES_PATH}")
+
+
+_manager: Optional[CookieManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_cookie_manager() -> CookieManager:
+    """Return the process-wide cookie manager."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = CookieManager()
+    return _manager
+
+
+def start_cookie_manager() -> None:
+    get_cookie_manager().start()
+
+
+async def stop_cookie_manager() -> None:
+    if _manager is not None:
+        await _manager.stop()
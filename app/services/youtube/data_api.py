@@ -0,0 +1,397 @@
+"""
+YouTube Data API v3 access shared by the YouTube clients.
+
+Responses are cached in SQLite, keyed by endpoint and parameters:
+
+- Within its TTL a response is answered from the cache without a request.
+- Past the TTL but within the stale window the cached response is returned
+  immediately and refreshed in the background (stale-while-revalidate).
+- Refreshes are conditional GETs (If-None-Match with the stored ETag); a 304
+  answer renews the stored body.
+
+Stored responses past their TTL and stale window are pruned hourly. Callers
+that keep their own per-item cache (batched videos/channels lookups) pass
+cache=False, so their batch bodies are not stored twice.
+
+Concurrent identical requests share one upstream call. Every upstream call is
+recorded in a quota ledger (units per endpoint per day, Pacific time, which
+is when the Data API quota resets).
+"""
+import json
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, Optional, NamedTuple, List, Callable
+
+from app.config import (
+    YOUTUBE_API_KEY,
+    YOUTUBE_API_CACHE_PATH,
+    YOUTUBE_API_CACHE_TTL,
+    YOUTUBE_API_CACHE_TTLS,
+    YOUTUBE_API_STALE_TTL,
+    YOUTUBE_API_DAILY_QUOTA,
+)
+from app.core.http_client import get_http_client
+from app.core.storage import open_database
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+    except ZoneInfoNotFoundError:
+        QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+except ImportError:
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+
+# Quota units per call; every list endpoint we use costs 1
+QUOTA_COSTS = {"search": 100}
+DEFAULT_QUOTA_COST = 1
+
+# Seconds between deletions of stored responses too old to be served
+PRUNE_INTERVAL = 3600
+
+# Channel and video details change slowly; subscription lists change more often
+DEFAULT_CACHE_TTLS = {
+    "channels": 3600,
+    "videos": 3600,
+}
+
+
+def _parse_cache_ttls(value: str) -> Dict[str, int]:
+    """Parse "endpoint=seconds,..." overrides, ignoring malformed pairs."""
+    ttls = {}
+    for pair in value.split(","):
+        endpoint, _, seconds = pair.partition("=")
+        try:
+            ttls[endpoint.strip()] = int(seconds)
+        except ValueError:
+            continue
+    return ttls
+
+
+CACHE_TTLS = {**DEFAULT_CACHE_TTLS, **_parse_cache_ttls(YOUTUBE_API_CACHE_TTLS)}
+
+
+class StoredResponse(NamedTuple):
+    etag: Optional[str]
+    body: str
+    fetched_at: float
+
+
+class ResponseStore:
+    """SQLite store of the last body (and ETag) returned for each API request."""
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = open_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS api_responses ("
+            "key TEXT PRIMARY KEY, "
+            "endpoint TEXT NOT NULL, "
+            "etag TEXT, "
+            "body TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS api_responses_fetched ON api_responses (endpoint, fetched_at)"
+        )
+        self._pruned_at = 0.0
+    
+    def get(self, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, body, fetched_at FROM api_responses WHERE key = ?", (key,)
+            ).fetchone()
+        return StoredResponse(*row) if row else None
+    
+    def set(self, key: str, endpoint: str, etag: Optional[str], body: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO api_responses (key, endpoint, etag, body, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, endpoint, etag, body, time.time())
+            )
+    
+    def touch(self, key: str) -> None:
+        """Mark a stored response as fresh again (after a 304)."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE api_responses SET fetched_at = ? WHERE key = ?", (time.time(), key)
+            )
+    
+    def prune(self, max_age: Callable[[str], float]) -> None:
+        """
+        Delete responses older than max_age(endpoint) seconds.
+        
+        Runs at most once per PRUNE_INTERVAL; later calls return immediately.
+        """
+        now = time.time()
+        with self._lock:
+            if now - self._pruned_at < PRUNE_INTERVAL:
+                return
+            self._pruned_at = now
+            endpoints = [row[0] for row in self._db.execute("SELECT DISTINCT endpoint FROM api_responses")]
+            deleted = 0
+            for endpoint in endpoints:
+                deleted += self._db.execute(
+                    "DELETE FROM api_responses WHERE endpoint = ? AND fetched_at < ?",
+                    (endpoint, now - max_age(endpoint))
+                ).rowcount
+        if deleted:
+            logger.info(f"Pruned {deleted} expired Data API responses")
+
+
+class QuotaLedger:
+    """
+    SQLite ledger of quota units spent per endpoint per quota day.
+    
+    A 304 revalidation is charged the endpoint's full cost. That is an upper
+    bound: the Data API lists one cost per method call and documents no
+    discount for 304 answers, so the actual charge may be lower. Such calls
+    are also counted in not_modified, so their units can be told apart.
+    """
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = open_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS api_quota ("
+            "day TEXT NOT NULL, "
+            "endpoint TEXT NOT NULL, "
+            "units INTEGER NOT NULL DEFAULT 0, "
+            "calls INTEGER NOT NULL DEFAULT 0, "
+            "not_modified INTEGER NOT NULL DEFAULT 0, "
+            "cache_hits INTEGER NOT NULL DEFAULT 0, "
+            "units_saved INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (day, endpoint))"
+        )
+    
+    def record(
+        self,
+        endpoint: str,
+        units: int = 0,
+        calls: int = 0,
+        not_modified: int = 0,
+        cache_hits: int = 0,
+        units_saved: int = 0
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO api_quota (day, endpoint, units, calls, not_modified, cache_hits, units_saved) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, endpoint) DO UPDATE SET "
+                "units = units + excluded.units, "
+                "calls = calls + excluded.calls, "
+                "not_modified = not_modified + excluded.not_modified, "
+                "cache_hits = cache_hits + excluded.cache_hits, "
+                "units_saved = units_saved + excluded.units_saved",
+                (quota_day(), endpoint, units, calls, not_modified, cache_hits, units_saved)
+            )
+    
+    def usage(self, days: int) -> List[Dict[str, Any]]:
+        """Return per-endpoint rows for the last `days` quota days, newest first."""
+        since = (datetime.now(QUOTA_TIMEZONE) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT day, endpoint, units, calls, not_modified, cache_hits, units_saved "
+                "FROM api_quota WHERE day >= ? ORDER BY day DESC, endpoint",
+                (since,)
+            ).fetchall()
+        return [
+            {
+                "day": row[0],
+                "endpoint": row[1],
+                "units": row[2],
+                "calls": row[3],
+                "not_modified": row[4],
+                "cache_hits": row[5],
+                "units_saved": row[6],
+            }
+            for row in rows
+        ]
+
+
+_response_store: Optional[ResponseStore] = None
+_quota_ledger: Optional[QuotaLedger] = None
+
+# Upstream calls in progress, shared by identical concurrent requests
+_inflight: Dict[str, "asyncio.Task[StoredResponse]"] = {}
+
+
+def _get_response_store() -> ResponseStore:
+    global _response_store
+    if _response_store is None:
+        _response_store = ResponseStore(YOUTUBE_API_CACHE_PATH)
+    return _response_store
+
+
+def _get_quota_ledger() -> QuotaLedger:
+    global _quota_ledger
+    if _quota_ledger is None:
+        _quota_ledger = QuotaLedger(YOUTUBE_API_CACHE_PATH)
+    return _quota_ledger
+
+
+def quota_day() -> str:
+    """Current quota day; the Data API quota resets at midnight Pacific time."""
+    return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+def quota_cost(endpoint: str) -> int:
+    return QUOTA_COSTS.get(endpoint, DEFAULT_QUOTA_COST)
+
+
+def cache_ttl(endpoint: str) -> int:
+    return CACHE_TTLS.get(endpoint, YOUTUBE_API_CACHE_TTL)
+
+
+def request_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """Build a stable key for an API request (the API key itself is excluded)."""
+    items = sorted((k, str(v)) for k, v in params.items() if k != "key" and v is not None)
+    return f"{endpoint}?{json.dumps(items, separators=(',', ':'))}"
+
+
+def _retention(endpoint: str) -> float:
+    """Seconds a stored response can still be served (TTL plus stale window)."""
+    return cache_ttl(endpoint) + YOUTUBE_API_STALE_TTL
+
+
+async def _fetch(endpoint: str, params: Dict[str, Any], key: str, cache: bool = True) -> StoredResponse:
+    """Make the upstream call, revalidating the stored response if there is one."""
+    store = _get_response_store()
+    stored = store.get(key) if cache else None
+    
+    query = {k: v for k, v in params.items() if v is not None}
+    query["key"] = YOUTUBE_API_KEY
+    headers = {"If-None-Match": stored.etag} if stored and stored.etag else None
+    
+    response = await get_http_client().get(
+        f"{YOUTUBE_API_BASE_URL}/{endpoint}", params=query, headers=headers
+    )
+    
+    if response.status_code == 304 and stored:
+        # Charged in full: an upper bound (see QuotaLedger)
+        _get_quota_ledger().record(endpoint, units=quota_cost(endpoint), calls=1, not_modified=1)
+        logger.info(f"Data API {endpoint}: 304 Not Modified, using stored response")
+        store.touch(key)
+        return stored._replace(fetched_at=time.time())
+    
+    _get_quota_ledger().record(endpoint, units=quota_cost(endpoint), calls=1)
+    response.raise_for_status()
+    
+    etag = response.headers.get("ETag") or response.json().get("etag")
+    if cache:
+        store.set(key, endpoint, etag, response.text)
+        store.prune(_retention)
+    return StoredResponse(etag, response.text, time.time())
+
+
+def _on_fetch_done(key: str, task: "asyncio.Task[StoredResponse]") -> None:
+    _inflight.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Data API request {key} failed: {task.exception()}")
+
+
+def _shared_fetch(
+    endpoint: str,
+    params: Dict[str, Any],
+    key: str,
+    cache: bool = True
+) -> "asyncio.Task[StoredResponse]":
+    """Start an upstream call, or join the one already running for the same key."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch(endpoint, params, key, cache))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _on_fetch_done(key, t))
+    return task
+
+
+async def api_get(
+    endpoint: str,
+    params: Dict[str, Any],
+    ttl: Optional[int] = None,
+    stale_ttl: Optional[int] = None,
+    cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Call a Data API endpoint and return the decoded JSON.
+    
+    Args:
+        endpoint: Endpoint name, e.g. "subscriptions"
+        params: Query parameters (the API key is added automatically)
+        ttl: Seconds a cached response is served without a request.
+            Defaults to the configured TTL for the endpoint; 0 always
+            revalidates (still conditionally).
+        stale_ttl: Seconds past the TTL during which the cached response is
+            served while it is refreshed in the background. Defaults to
+            YOUTUBE_API_STALE_TTL; 0 disables stale answers.
+        cache: False neither reads nor stores the response, for callers
+            that cache the items themselves
+    
+    Returns:
+        The decoded JSON response.
+    
+    Raises:
+        ValueError: If YOUTUBE_API_KEY is not configured
+        httpx.HTTPError: On network errors or non-2xx/304 responses
+    """
+    if not YOUTUBE_API_KEY:
+        raise ValueError("YOUTUBE_API_KEY is not configured")
+    
+    ttl = cache_ttl(endpoint) if ttl is None else ttl
+    stale_ttl = YOUTUBE_API_STALE_TTL if stale_ttl is None else stale_ttl
+    
+    key = request_key(endpoint, params)
+    if not cache:
+        key = f"nocache:{key}"
+    stored = _get_response_store().get(key) if cache and ttl > 0 else None
+    
+    if stored:
+        age = time.time() - stored.fetched_at
+        if age < ttl:
+            _get_quota_ledger().record(endpoint, cache_hits=1, units_saved=quota_cost(endpoint))
+            return json.loads(stored.body)
+        if age < ttl + stale_ttl:
+            _get_quota_ledger().record(endpoint, cache_hits=1)
+            _shared_fetch(endpoint, params, key)
+            return json.loads(stored.body)
+    
+    # shield: a cancelled caller must not cancel a call other callers share
+    response = await asyncio.shield(_shared_fetch(endpoint, params, key, cache))
+    return json.loads(response.body)
+
+
+def get_quota_usage(days: int = 7) -> Dict[str, Any]:
+    """
+    Summarize Data API quota spent per endpoint per day.
+    
+    Args:
+        days: Number of quota days to include, today first
+    
+    Returns:
+        Dictionary with the daily limit, today's totals and a per-day breakdown.
+    """
+    by_day: Dict[str, Dict[str, Any]] = {}
+    for row in _get_quota_ledger().usage(days):
+        day = by_day.setdefault(row["day"], {"day": row["day"], "units": 0, "units_saved": 0, "endpoints": {}})
+        day["units"] += row["units"]
+        day["units_saved"] += row["units_saved"]
+        endpoint = row.pop("endpoint")
+        day["endpoints"][endpoint] = {k: v for k, v in row.items() if k != "day"}
+    
+    today = quota_day()
+    spent = by_day.get(today, {}).get("units", 0)
+    return {
+        "quota_day": today,
+        "daily_limit": YOUTUBE_API_DAILY_QUOTA,
+        "units_used_today": spent,
+        "units_remaining_today": max(YOUTUBE_API_DAILY_QUOTA - spent, 0),
+        "days": list(by_day.values())
+    }
@@ -1,22 +1,111 @@
 """
 Standalone Playwright worker script.
 Called via subprocess to avoid asyncio conflicts with uvicorn on Windows.
+
+The browser storage state (cookies + localStorage) is persisted between runs
+so the consent wall is only clicked through once; it is refreshed whenever
+YouTube shows the consent page again.
+
+Only the data needed to find the channel ID is loaded: images, media, fonts
+and third-party requests are aborted, and the ytInitialData-bearing document
+(or the page's own youtubei/v1/browse response) is returned as soon as it
+arrives instead of serializing the rendered DOM.
 """
 import sys
+import os
 import json
+import uuid
+from urllib.parse import urlparse
+
+
+CONSENT_SELECTORS = [
+    'button:has-text("Accept all")',
+    'button:has-text("Accept")',
+    'button:has-text("I agree")',
+    'button[aria-label="Accept all"]',
+]
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Consent redirects go through google.com, everything else is youtube.com
+FIRST_PARTY_DOMAINS = ("youtube.com", "google.com")
+
+BROWSE_ENDPOINT = "youtubei/v1/browse"
+
+BROWSE_WAIT_TIMEOUT_MS = 5000
+
+
+def _is_first_party(url: str) -> bool:
+    """Check whether a request URL belongs to YouTube or its consent flow."""
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == domain or host.endswith(f".{domain}") for domain in FIRST_PARTY_DOMAINS)
+
+
+def _route_request(route) -> None:
+    """Abort heavy and third-party requests; only the page and its scripts are needed."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or not _is_first_party(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _response_text(response):
+    """Read a response body, returning None if it is no longer available."""
+    try:
+        return response.text()
+    except Exception:
+        return None
+
+
+def _load_storage_state(state_path: str):
+    """Return the saved storage state path if it exists and is readable JSON."""
+    if not state_path or not os.path.exists(state_path):
+        return None
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            json.load(f)
+        return state_path
+    except (OSError, ValueError):
+        return None
+
+
+def _save_storage_state(context, state_path: str) -> None:
+    """Write the context storage state atomically so concurrent workers never read a partial file."""
+    if not state_path:
+        return
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{state_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        context.storage_state(path=tmp_path)
+        os.replace(tmp_path, state_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _accept_consent(page) -> bool:
+    """Click the consent button if one is visible. Returns True if clicked."""
+    for selector in CONSENT_SELECTORS:
+        try:
+            button = page.locator(selector).first
+            if button.is_visible(timeout=1000):
+                button.click()
+                page.wait_for_timeout(2000)
+                return True
+        except Exception:
+            continue
+    return False
 
 
-def fetch_youtube_page(url: str) -> dict:
+def fetch_youtube_page(url: str, state_path: str = "") -> dict:
     """Fetch YouTube page and extract channel ID."""
     from playwright.sync_api import sync_playwright
-    
-    CONSENT_SELECTORS = [
-        'button:has-text("Accept all")',
-        'button:has-text("Accept")',
-        'button:has-text("I agree")',
-        'button[aria-label="Accept all"]',
-    ]
-    
+
+    storage_state = _load_storage_state(state_path)
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         context = browser.new_context(
@@ -25,40 +114,79 @@ def fetch_youtube_page(url: str) -> dict:
                 "AppleWebKit/537.36 (KHTML, like Gecko) "
                 "Chrome/131.0.0.0 Safari/537.36"
             ),
-            locale="en-US"
+            locale="en-US",
+            storage_state=storage_state
         )
+        context.route("**/*", _route_request)
         page = context.new_page()
-        
+
+        documents = []
+        browse_responses = []
+
+        def on_response(response):
+            if BROWSE_ENDPOINT in response.url:
+                browse_responses.append(response)
+            elif response.request.is_navigation_request() and response.frame == page.main_frame:
+                documents.append(response)
+
+        page.on("response", on_response)
+
         try:
             page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(2000)
-            
-            # Click consent button if present
-            for selector in CONSENT_SELECTORS:
-                try:
-                    button = page.locator(selector).first
-                    if button.is_visible(timeout=1000):
-                        button.click()
-                        page.wait_for_timeout(2000)
-                        break
-                except:
-                    continue
-            
-            # If still on consent page, navigate again
-            if "consent" in page.url.lower():
-                page.goto(url, wait_until="domcontentloaded", timeout=30000)
+
+            consent_shown = "consent" in page.url.lower()
+
+            # Without a saved state the consent dialog may also be rendered
+            # in-page, so look for it; with a saved state only the redirect
+            # to consent.youtube.com indicates that the state went stale.
+            if consent_shown or storage_state is None:
                 page.wait_for_timeout(2000)
-            
-            html = page.content()
-            title = page.title()
-            
+                clicked = _accept_consent(page)
+                consent_shown = consent_shown or clicked
+
+                # If still on consent page, navigate again
+                if "consent" in page.url.lower():
+                    page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                    page.wait_for_timeout(2000)
+
+            html = None
+            for document in reversed(documents):
+                text = _response_text(document)
+                if text and "ytInitialData" in text:
+                    html = text
+                    break
+
+            # Client-rendered pages fetch ytInitialData through InnerTube instead
+            browse_data = None
+            if html is None:
+                if not browse_responses:
+                    try:
+                        page.wait_for_event(
+                            "response",
+                            predicate=lambda r: BROWSE_ENDPOINT in r.url,
+                            timeout=BROWSE_WAIT_TIMEOUT_MS
+                        )
+                    except Exception:
+                        pass
+                for response in browse_responses:
+                    browse_data = _response_text(response)
+                    if browse_data:
+                        break
+
+            if html is None and browse_data is None:
+                html = page.content()
+
+            if consent_shown or storage_state is None:
+                _save_storage_state(context, state_path)
+
             return {
                 "success": True,
-                "html": html,
-                "title": title,
-                "url": page.url
+                "html": html or "",
+                "browse_data": browse_data,
+                "url": page.url,
+                "consent_refreshed": consent_shown
             }
-            
+
         except Exception as e:
             return {
                 "success": False,
@@ -72,7 +200,8 @@ if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({"success": False, "error": "URL required"}))
         sys.exit(1)
-    
+
     url = sys.argv[1]
-    result = fetch_youtube_page(url)
+    state_path = sys.argv[2] if len(sys.argv) > 2 else ""
+    result = fetch_youtube_page(url, state_path)
     print(json.dumps(result))
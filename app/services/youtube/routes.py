@@ -1,11 +1,71 @@
+import json
+from enum import Enum
 from fastapi import APIRouter, HTTPException, Query, Request
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List
 
 from app.core.rate_limiter import limiter, YOUTUBE_RATE_LIMIT
-from app.services.youtube.client import get_public_subscriptions, extract_channel_id
+from app.services.youtube.client import (
+    get_public_subscriptions,
+    iter_subscription_pages,
+    extract_channel_id,
+    extract_channel_ids,
+    get_channel_id_tier_stats,
+    ChannelNotFoundError,
+)
+from app.services.youtube.data_api import get_quota_usage
+from app.services.youtube.subscription_snapshots import get_subscription_changes
+from app.services.youtube.uploads import iter_uploads
+from app.services.youtube.video_client import get_videos
 
 router = APIRouter()
 
+MAX_BATCH_URLS = 1000
+MAX_BATCH_VIDEOS = 1000
+
+
+class ChannelInclude(str, Enum):
+    METADATA = "metadata"
+
+
+class VideoBatchRequest(BaseModel):
+    videos: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_VIDEOS,
+        description="YouTube video URLs or 11-character video IDs"
+    )
+
+
+class SubscriptionEnrich(str, Enum):
+    STATISTICS = "statistics"
+
+
+class ChannelIdBatchRequest(BaseModel):
+    urls: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_URLS,
+        description="YouTube channel URLs (any supported format)"
+    )
+    include: Optional[ChannelInclude] = Field(
+        default=None,
+        description="Set to 'metadata' to also return title, handle, avatar, counts and description"
+    )
+
+
+async def _stream_subscription_pages(first_page, pages):
+    """Yield one NDJSON line per subscription; a failing later page ends with an error line."""
+    for subscription in first_page["subscriptions"]:
+        yield json.dumps(subscription) + "\n"
+    try:
+        async for page in pages:
+            for subscription in page["subscriptions"]:
+                yield json.dumps(subscription) + "\n"
+    except ValueError as e:
+        yield json.dumps({"status": "error", "error": str(e)}) + "\n"
+
 
 @router.get("/subscriptions")
 @limiter.limit(YOUTUBE_RATE_LIMIT)
@@ -20,6 +80,19 @@ async def get_subscriptions(
         ge=1,
         le=50,
         description="Maximum number of results per page (1-50)."
+    ),
+    page_token: Optional[str] = Query(
+        default=None,
+        description="Page to fetch (next_page_token from a previous response)."
+    ),
+    all_pages: bool = Query(
+        default=False,
+        alias="all",
+        description="Follow every page server-side and stream all subscriptions as NDJSON."
+    ),
+    enrich: Optional[SubscriptionEnrich] = Query(
+        default=None,
+        description="Set to 'statistics' to add subscriber, video and view counts of each subscribed channel."
     )
 ):
     """
@@ -27,12 +100,34 @@ async def get_subscriptions(
     
     Returns a list of subscribed channels with their names and URLs.
     
+    With all=true every page is fetched server-side and subscriptions are
+    streamed as newline-delimited JSON, one subscription per line, as pages
+    arrive. Unchanged pages are revalidated with their ETag.
+    
+    With enrich=statistics each subscription gains a "statistics" object,
+    fetched with one batched channels.list call per 50 channels.
+    
     Rate limit: 5 requests per minute.
     """
+    include_statistics = enrich == SubscriptionEnrich.STATISTICS
     try:
-        result = get_public_subscriptions(
+        if all_pages:
+            pages = iter_subscription_pages(
+                channel_id=channel_id,
+                include_statistics=include_statistics
+            )
+            # Fetch the first page before streaming so errors still map to HTTP status codes
+            first_page = await pages.__anext__()
+            return StreamingResponse(
+                _stream_subscription_pages(first_page, pages),
+                media_type="application/x-ndjson"
+            )
+        
+        result = await get_public_subscriptions(
             channel_id=channel_id,
-            max_results=max_results
+            max_results=max_results,
+            page_token=page_token,
+            include_statistics=include_statistics
         )
         return result
     except ValueError as e:
@@ -47,6 +142,101 @@ async def get_subscriptions(
         )
 
 
+@router.get("/subscriptions/changes")
+@limiter.limit(YOUTUBE_RATE_LIMIT)
+async def get_subscriptions_changes(
+    request: Request,
+    channel_id: Optional[str] = Query(
+        default=None,
+        description="Channel ID to track. Defaults to configured channel."
+    ),
+    since: Optional[str] = Query(
+        default=None,
+        description="Token from a previous call. Omit to start tracking (no changes reported)."
+    )
+):
+    """
+    Get the subscriptions added or removed since a snapshot token.
+    
+    The channel's subscriptions are refreshed with conditional requests and
+    compared with the stored snapshot; a new snapshot is recorded only when
+    something changed. Pass the returned token as `since` on the next call.
+    
+    Rate limit: 5 requests per minute.
+    """
+    try:
+        return await get_subscription_changes(channel_id=channel_id, since=since)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching subscription changes: {str(e)}"
+        )
+
+
+async def _stream_uploads(first_video, videos):
+    """Yield one NDJSON line per video; a failing later page ends with an error line."""
+    yield json.dumps(first_video) + "\n"
+    try:
+        async for video in videos:
+            yield json.dumps(video) + "\n"
+    except ValueError as e:
+        yield json.dumps({"status": "error", "error": str(e)}) + "\n"
+
+
+@router.get("/uploads")
+@limiter.limit(YOUTUBE_RATE_LIMIT)
+async def get_uploads(
+    request: Request,
+    channel_id: str = Query(
+        ...,
+        description="YouTube channel ID (24-character ID starting with 'UC')"
+    ),
+    limit: Optional[int] = Query(
+        default=None,
+        ge=1,
+        description="Maximum number of videos to return (all if omitted)"
+    )
+):
+    """
+    Get a channel's full upload history, newest first, beyond the 15 videos of the RSS feed.
+    
+    Videos are streamed as newline-delimited JSON, one video per line. The
+    history is walked through the channel's uploads playlist once and kept
+    locally; later calls only fetch the uploads newer than the newest stored
+    video (usually one revalidated page).
+    
+    Requires YOUTUBE_API_KEY.
+    
+    Rate limit: 5 requests per minute.
+    """
+    try:
+        videos = iter_uploads(channel_id, limit=limit)
+        # Fetch the first page before streaming so errors still map to HTTP status codes
+        try:
+            first_video = await videos.__anext__()
+        except StopAsyncIteration:
+            return StreamingResponse(iter(()), media_type="application/x-ndjson")
+        return StreamingResponse(
+            _stream_uploads(first_video, videos),
+            media_type="application/x-ndjson"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching uploads: {str(e)}"
+        )
+
+
 @router.get("/channel-id")
 @limiter.limit(YOUTUBE_RATE_LIMIT)
 async def get_channel_id(
@@ -54,6 +244,10 @@ async def get_channel_id(
     url: str = Query(
         ...,
         description="YouTube channel URL (supports /channel/, /@handle, /c/, /user/ formats)"
+    ),
+    include: Optional[ChannelInclude] = Query(
+        default=None,
+        description="Set to 'metadata' to also return title, handle, avatar, counts and description"
     )
 ):
     """
@@ -69,11 +263,29 @@ async def get_channel_id(
     - https://www.youtube.com/c/channelname
     - https://www.youtube.com/user/username
     
+    Video URLs (watch?v=, youtu.be, /shorts/, /live/) resolve to the owning
+    channel without a browser.
+    
+    The response reports which resolver tier answered ("source": url, http,
+    api or browser) and how long it took.
+    
+    With include=metadata the response also carries the channel's title,
+    handle, avatar, subscriber/video counts and description, parsed from the
+    same page fetch and cached.
+    
     Rate limit: 5 requests per minute.
     """
     try:
-        result = await extract_channel_id(url)
+        result = await extract_channel_id(
+            url,
+            include_metadata=include == ChannelInclude.METADATA
+        )
         return result
+    except ChannelNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=400,
@@ -84,3 +296,84 @@ async def get_channel_id(
             status_code=500,
             detail=f"Error extracting channel ID: {str(e)}"
         )
+
+
+@router.post("/channel-ids")
+@limiter.limit(YOUTUBE_RATE_LIMIT)
+async def get_channel_ids(
+    request: Request,
+    body: ChannelIdBatchRequest
+):
+    """
+    Resolve many channel URLs in one call.
+    
+    URLs are deduplicated after normalization and resolved concurrently
+    (cache and browser-free tiers first). Results are streamed as
+    newline-delimited JSON, one line per unique channel, in completion order.
+    
+    Rate limit: 5 requests per minute.
+    """
+    async def stream():
+        async for result in extract_channel_ids(
+            body.urls,
+            include_metadata=body.include == ChannelInclude.METADATA
+        ):
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/videos")
+@limiter.limit(YOUTUBE_RATE_LIMIT)
+async def get_videos_details(
+    request: Request,
+    body: VideoBatchRequest
+):
+    """
+    Get duration, view/like/comment counts and live status for many videos.
+    
+    Inputs are normalized to video IDs and deduplicated; details are fetched
+    with concurrent videos.list calls of 50 IDs each and cached.
+    
+    Requires YOUTUBE_API_KEY.
+    
+    Rate limit: 5 requests per minute.
+    """
+    try:
+        return await get_videos(body.videos)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching video details: {str(e)}"
+        )
+
+
+@router.get("/channel-id/stats")
+async def get_channel_id_stats():
+    """
+    Get per-tier call counts and latency for the channel ID resolver.
+    """
+    return get_channel_id_tier_stats()
+
+
+@router.get("/quota")
+async def get_quota(
+    days: int = Query(
+        default=7,
+        ge=1,
+        le=90,
+        description="Number of quota days to report, today first."
+    )
+):
+    """
+    Get YouTube Data API quota spent per endpoint per day.
+    
+    Days follow the API's quota reset (midnight Pacific time). Cached answers
+    are counted as cache_hits; units_saved is the quota they avoided.
+    """
+    return get_quota_usage(days)
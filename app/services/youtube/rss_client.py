@@ -1,10 +1,33 @@
 """
 YouTube RSS Feed client for fetching latest videos from a channel.
+
+Parsed feeds are kept in memory with the feed's ETag/Last-Modified, so hot
+channels are answered from the cache and refreshed with conditional GETs
+(a 304 at most) while the cached copy is served.
+
+Cached feeds are parsed incrementally: a pull parser reads entries only as
+far as readers need them (max_videos, or down to a `since` marker), and
+keeps what it has read for later readers. The common "latest video" and
+"what's new since X" reads never parse the rest of the feed.
 """
-import requests
+import re
+import httpx
+import time
+import asyncio
+import threading
 import xml.etree.ElementTree as ET
 import logging
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, NamedTuple, Tuple, Iterable, Iterator
+
+from app.config import (
+    YOUTUBE_FEED_CONCURRENCY,
+    YOUTUBE_FEED_CACHE_TTL,
+    YOUTUBE_FEED_STALE_TTL,
+    YOUTUBE_FEED_CACHE_SIZE,
+)
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -17,21 +40,56 @@ NAMESPACES = {
     "media": "http://search.yahoo.com/mrss/"
 }
 
+ATOM = f"{{{NAMESPACES['atom']}}}"
+ATOM_ENTRY = f"{ATOM}entry"
 
-def get_channel_feed(channel_id: str, max_videos: int = 1) -> Dict[str, Any]:
-    """
-    Fetch the RSS feed for a YouTube channel and return latest video(s).
+# Bytes handed to the pull parser at a time
+FEED_CHUNK_SIZE = 16384
+
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+class FeedNotFoundError(ValueError):
+    """Raised when YouTube has no feed for a channel ID."""
+
+
+class CachedFeed(NamedTuple):
+    feed: "ParsedFeed"
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class FeedCache:
+    """In-memory LRU of parsed feeds with the validators needed to revalidate them."""
     
-    Args:
-        channel_id: YouTube channel ID (UC...)
-        max_videos: Maximum number of videos to return (default: 1)
+    def __init__(self, size: int):
+        self._entries: "OrderedDict[str, CachedFeed]" = OrderedDict()
+        self._size = size
+        self._lock = threading.Lock()
     
-    Returns:
-        Dictionary containing channel info and latest videos.
+    def get(self, channel_id: str) -> Optional[CachedFeed]:
+        with self._lock:
+            entry = self._entries.get(channel_id)
+            if entry is not None:
+                self._entries.move_to_end(channel_id)
+            return entry
     
-    Raises:
-        ValueError: If channel ID is invalid or feed cannot be fetched
-    """
+    def set(self, channel_id: str, entry: CachedFeed) -> None:
+        with self._lock:
+            self._entries[channel_id] = entry
+            self._entries.move_to_end(channel_id)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+
+_feed_cache = FeedCache(YOUTUBE_FEED_CACHE_SIZE)
+
+# Revalidations in progress, shared by concurrent requests for the same channel
+_inflight: Dict[str, "asyncio.Task[Tuple[CachedFeed, str]]"] = {}
+
+
+def validate_channel_id(channel_id: str) -> str:
     if not channel_id:
         raise ValueError("Channel ID is required")
     
@@ -41,51 +99,410 @@ def get_channel_feed(channel_id: str, max_videos: int = 1) -> Dict[str, Any]:
         raise ValueError(
             "Invalid channel ID format. Must start with 'UC' and be 24 characters."
         )
+    return channel_id
+
+
+def parse_since(since: Optional[str]) -> Tuple[Optional[datetime], Optional[str]]:
+    """
+    Interpret a `since` marker as an ISO 8601 timestamp or a video ID.
+    
+    Returns:
+        Tuple of (timestamp, video ID); at most one is set.
+    
+    Raises:
+        ValueError: If the marker is neither
+    """
+    if not since:
+        return None, None
+    since = since.strip()
+    try:
+        timestamp = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    except ValueError:
+        if VIDEO_ID_PATTERN.match(since):
+            return None, since
+        raise ValueError(f"Invalid since: {since}. Use an ISO 8601 timestamp or a video ID.")
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp, None
+
+
+def _take_videos(
+    videos: Iterable[Dict[str, Any]],
+    max_videos: Optional[int] = None,
+    since: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Take videos from a newest-first sequence until max_videos or the `since` marker.
+    
+    The sequence is consumed lazily, so a parsed-on-demand feed is not read
+    past the stopping point.
+    
+    Stops at the first video published at or before the `since` timestamp,
+    or at the `since` video itself (which is not included).
+    """
+    since_time, since_video_id = parse_since(since)
+    taken = []
+    if max_videos is not None and max_videos <= 0:
+        return taken
+    for video in videos:
+        if since_video_id is not None and video["video_id"] == since_video_id:
+            break
+        if since_time is not None and published_sort_key(video) <= since_time:
+            break
+        taken.append(video)
+        if max_videos is not None and len(taken) >= max_videos:
+            break
+    return taken
+
+
+def _iter_feed_elements(content: bytes) -> Iterator[ET.Element]:
+    """
+    Yield the feed's top-level elements (title, author, entries...) as each one is complete.
+    
+    The document is fed to a pull parser in chunks, so a caller that stops
+    early leaves the rest of the feed unparsed. Yielded elements are
+    detached afterwards to keep memory flat.
+    
+    Raises:
+        ValueError: If the XML is malformed
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    depth = 0
+    try:
+        for offset in range(0, len(content), FEED_CHUNK_SIZE):
+            parser.feed(content[offset:offset + FEED_CHUNK_SIZE])
+            for event, element in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        root = element
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth == 1:
+                    yield element
+                    root.remove(element)
+        parser.close()
+    except ET.ParseError as e:
+        logger.error(f"Failed to parse RSS XML: {e}")
+        raise ValueError("Failed to parse RSS feed")
+
+
+class ParsedFeed:
+    """
+    A fetched feed whose entries are parsed on demand.
+    
+    The channel info and the first entry are parsed up front (YouTube lists
+    the channel info before the entries), so a malformed feed fails the
+    fetch. Further entries are parsed when a reader first needs them and
+    kept. A feed that turns out malformed further down ends at the last
+    entry read before the error.
+    """
+    
+    def __init__(self, channel_id: str, content: bytes = b"", videos: Optional[List[Dict[str, Any]]] = None):
+        self.channel_id = channel_id
+        self.channel: Dict[str, Any] = {
+            "channel_title": None,
+            "channel_url": None,
+            "channel_author": None,
+            "channel_published": None
+        }
+        self._videos: List[Dict[str, Any]] = list(videos or [])
+        self._elements: Optional[Iterator[ET.Element]] = _iter_feed_elements(content) if content else None
+        self._lock = threading.Lock()
+        with self._lock:
+            self._parse_next(strict=True)
+    
+    @property
+    def parsed_count(self) -> int:
+        """Number of entries parsed so far."""
+        return len(self._videos)
+    
+    def info(self) -> Dict[str, Any]:
+        """Channel ID, title, URL, author and published time."""
+        return {
+            "channel_id": self.channel_id,
+            **self.channel,
+            "channel_url": self.channel["channel_url"] or f"https://www.youtube.com/channel/{self.channel_id}"
+        }
+    
+    def videos(self, max_videos: Optional[int] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest-first videos up to max_videos or the `since` marker (see _take_videos); all by default."""
+        with self._lock:
+            return _take_videos(self._iter_videos(), max_videos, since)
+    
+    def with_videos(self, videos: List[Dict[str, Any]]) -> "ParsedFeed":
+        """A fully parsed copy of this feed with other videos."""
+        feed = ParsedFeed(self.channel_id, videos=videos)
+        feed.channel = dict(self.channel)
+        return feed
+    
+    def _iter_videos(self) -> Iterator[Dict[str, Any]]:
+        index = 0
+        while index < len(self._videos) or self._parse_next():
+            yield self._videos[index]
+            index += 1
+    
+    def _parse_next(self, strict: bool = False) -> bool:
+        """Parse up to the next entry (caller holds the lock); False once the feed is exhausted."""
+        if self._elements is None:
+            return False
+        try:
+            for element in self._elements:
+                if element.tag != ATOM_ENTRY:
+                    _read_channel_element(self.channel, element)
+                    continue
+                video = _parse_video_entry(element)
+                if video:
+                    self._videos.append(video)
+                    return True
+        except ValueError:
+            self._elements = None
+            if strict:
+                raise
+            logger.warning(f"RSS feed for {self.channel_id} is cut short after {len(self._videos)} entries")
+            return False
+        self._elements = None
+        return False
+
+
+def _read_channel_element(channel: Dict[str, Any], element: ET.Element) -> None:
+    """Fill channel info from a top-level feed element; the first occurrence wins."""
+    tag = element.tag[len(ATOM):] if element.tag.startswith(ATOM) else None
+    if tag == "title" and channel["channel_title"] is None:
+        channel["channel_title"] = element.text
+    elif tag == "author" and channel["channel_author"] is None:
+        channel["channel_author"] = _get_text(element, "atom:name")
+    elif tag == "link" and element.get("rel") == "alternate" and channel["channel_url"] is None:
+        channel["channel_url"] = element.get("href")
+    elif tag == "published" and channel["channel_published"] is None:
+        channel["channel_published"] = element.text
+
+
+async def _revalidate_feed(channel_id: str) -> Tuple[CachedFeed, str]:
+    """
+    Fetch a feed, conditionally if it is cached, and update the cache.
+    
+    Returns:
+        Tuple of (cache entry, cache status: "revalidated" for a 304, "miss" otherwise).
+    
+    Raises:
+        ValueError: If the channel does not exist or the feed cannot be fetched
+    """
+    cached = _feed_cache.get(channel_id)
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
     
     url = f"{YOUTUBE_RSS_URL}?channel_id={channel_id}"
     
     logger.info(f"Fetching RSS feed for channel: {channel_id}")
     
     try:
-        response = requests.get(url, timeout=10)
+        response = await get_http_client().get(url, headers=headers or None)
+        if response.status_code == 304 and cached:
+            entry = cached._replace(fetched_at=time.time())
+            _feed_cache.set(channel_id, entry)
+            return entry, "revalidated"
         response.raise_for_status()
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
-            raise ValueError(f"Channel not found: {channel_id}")
+            raise FeedNotFoundError(f"Channel not found: {channel_id}")
         raise ValueError(f"Failed to fetch RSS feed: {e.response.status_code}")
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise ValueError(f"Failed to connect to YouTube RSS: {str(e)}")
     
+    entry = CachedFeed(
+        feed=ParsedFeed(channel_id, response.content),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        fetched_at=time.time()
+    )
+    _feed_cache.set(channel_id, entry)
+    return entry, "miss"
+
+
+def _on_revalidate_done(channel_id: str, task: "asyncio.Task[Tuple[CachedFeed, str]]") -> None:
+    _inflight.pop(channel_id, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Feed refresh failed for {channel_id}: {task.exception()}")
+
+
+def _shared_revalidate(channel_id: str) -> "asyncio.Task[Tuple[CachedFeed, str]]":
+    """Start a revalidation, or join the one already running for the channel."""
+    task = _inflight.get(channel_id)
+    if task is None:
+        task = asyncio.create_task(_revalidate_feed(channel_id))
+        _inflight[channel_id] = task
+        task.add_done_callback(lambda t: _on_revalidate_done(channel_id, t))
+    return task
+
+
+def _freshness(entry: CachedFeed, status: str) -> Dict[str, Any]:
+    """Describe where a feed answer came from and how old it is."""
+    return {
+        "status": status,
+        "fetched_at": datetime.fromtimestamp(entry.fetched_at, timezone.utc).isoformat().replace("+00:00", "Z"),
+        "age_seconds": round(time.time() - entry.fetched_at, 1),
+        "etag": entry.etag,
+        "last_modified": entry.last_modified
+    }
+
+
+async def get_channel_feed(
+    channel_id: str,
+    max_videos: int = 1,
+    max_age: Optional[float] = None,
+    since: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Fetch the RSS feed for a YouTube channel and return latest video(s).
+    
+    Parsed feeds are cached. Within YOUTUBE_FEED_CACHE_TTL the cached feed is
+    returned as is; for YOUTUBE_FEED_STALE_TTL after that it is returned
+    while a conditional GET (ETag/Last-Modified) refreshes it in the
+    background. Older feeds are revalidated before answering. If the refresh
+    fails with a network or server error, the cached feed is served instead.
+    
+    Args:
+        channel_id: YouTube channel ID (UC...)
+        max_videos: Maximum number of videos to return (default: 1)
+        max_age: Revalidate (instead of serving stale) a cached feed older
+            than this many seconds; 0 always revalidates
+        since: Only return videos newer than this ISO 8601 timestamp, or
+            above this video ID in the feed
+    
+    Returns:
+        Dictionary containing channel info, latest videos and a "cache"
+        object (status: hit, stale, revalidated or miss; fetched_at; age).
+    
+    Raises:
+        ValueError: If channel ID or since is invalid or feed cannot be fetched
+    """
+    channel_id = validate_channel_id(channel_id)
+    parse_since(since)
+    
+    entry = _feed_cache.get(channel_id)
+    age = time.time() - entry.fetched_at if entry else None
+    fresh_ttl = YOUTUBE_FEED_CACHE_TTL if max_age is None else min(max_age, YOUTUBE_FEED_CACHE_TTL)
+    
+    if entry and age < fresh_ttl:
+        status = "hit"
+    elif entry and max_age is None and age < YOUTUBE_FEED_CACHE_TTL + YOUTUBE_FEED_STALE_TTL:
+        status = "stale"
+        _shared_revalidate(channel_id)
+    else:
+        try:
+            # shield: a cancelled caller must not cancel a refresh other callers share
+            entry, status = await asyncio.shield(_shared_revalidate(channel_id))
+        except ValueError as e:
+            if not entry or isinstance(e, FeedNotFoundError):
+                raise
+            logger.warning(f"Serving cached feed for {channel_id} after refresh error: {e}")
+            status = "stale"
+    
+    videos = [dict(video) for video in entry.feed.videos(max_videos, since)]
+    
+    return {
+        **entry.feed.info(),
+        "since": since,
+        "video_count": len(videos),
+        "videos": videos,
+        "latest_video": videos[0] if videos else None,
+        "cache": _freshness(entry, status)
+    }
+
+
+def apply_pushed_videos(channel_id: str, videos: List[Dict[str, Any]]) -> None:
+    """
+    Merge videos pushed by the WebSub hub into a cached feed.
+    
+    New videos are added and updated ones replaced, so readers see a push
+    without waiting for the next revalidation. Channels that are not cached
+    are left alone; their next read fetches the feed.
+    """
+    entry = _feed_cache.get(channel_id)
+    if entry is None:
+        return
+    
+    cached = entry.feed.videos()
+    pushed = {video["video_id"]: video for video in videos}
+    merged = list(pushed.values()) + [
+        video for video in cached if video["video_id"] not in pushed
+    ]
+    merged.sort(key=published_sort_key, reverse=True)
+    limit = max(len(cached), 1)
+    _feed_cache.set(channel_id, entry._replace(feed=entry.feed.with_videos(merged[:limit])))
+
+
+def published_sort_key(video: Dict[str, Any]) -> datetime:
+    """Sort key for a video's published time; unparsable times sort last."""
     try:
-        root = ET.fromstring(response.content)
-    except ET.ParseError as e:
-        logger.error(f"Failed to parse RSS XML: {e}")
-        raise ValueError("Failed to parse RSS feed")
+        published = datetime.fromisoformat(video["published"])
+    except (TypeError, ValueError):
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published
+
+
+async def get_channel_feeds(
+    channel_ids: List[str],
+    max_videos: int = 15,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Fetch many channel feeds concurrently and merge them into one timeline.
     
-    # Extract channel info
-    channel_title = _get_text(root, "atom:title")
-    channel_author = _get_text(root, "atom:author/atom:name")
-    channel_url = _get_attr(root, "atom:link[@rel='alternate']", "href")
-    channel_published = _get_text(root, "atom:published")
+    At most YOUTUBE_FEED_CONCURRENCY feeds are fetched at once. A channel
+    whose feed fails is reported in "errors" and does not affect the others.
     
-    # Extract videos (entries)
-    entries = root.findall("atom:entry", NAMESPACES)
+    Args:
+        channel_ids: YouTube channel IDs (UC...); duplicates are ignored
+        max_videos: Maximum number of videos taken from each feed
+        limit: Maximum number of videos in the merged timeline (all if None)
+    
+    Returns:
+        Dictionary with the merged videos (newest first, each tagged with its
+        channel) and per-channel errors.
+    """
+    channel_ids = list(dict.fromkeys(channel_id.strip() for channel_id in channel_ids))
+    semaphore = asyncio.Semaphore(YOUTUBE_FEED_CONCURRENCY)
+    
+    async def fetch(channel_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await get_channel_feed(channel_id, max_videos=max_videos)
+    
+    results = await asyncio.gather(
+        *(fetch(channel_id) for channel_id in channel_ids),
+        return_exceptions=True
+    )
     
     videos = []
-    for entry in entries[:max_videos]:
-        video = _parse_video_entry(entry)
-        if video:
-            videos.append(video)
+    errors = []
+    for channel_id, result in zip(channel_ids, results):
+        if isinstance(result, Exception):
+            errors.append({"channel_id": channel_id, "error": str(result)})
+            continue
+        for video in result["videos"]:
+            videos.append({
+                **video,
+                "channel_id": result["channel_id"],
+                "channel_title": result["channel_title"]
+            })
+    
+    videos.sort(key=published_sort_key, reverse=True)
+    if limit is not None:
+        videos = videos[:limit]
     
     return {
-        "channel_id": channel_id,
-        "channel_title": channel_title,
-        "channel_url": channel_url or f"https://www.youtube.com/channel/{channel_id}",
-        "channel_author": channel_author,
-        "channel_published": channel_published,
+        "channel_count": len(channel_ids),
+        "failed_count": len(errors),
         "video_count": len(videos),
         "videos": videos,
-        "latest_video": videos[0] if videos else None
+        "errors": errors
     }
 
 
@@ -147,7 +564,7 @@ def _parse_video_entry(entry: ET.Element) -> Optional[Dict[str, Any]]:
             "thumbnail": thumbnail_url,
             "views": int(views) if views else None
         }
-        
+    
     except Exception as e:
         logger.error(f"Failed to parse video entry: {e}")
         return None
@@ -1,14 +1,69 @@
 """
 YouTube RSS Feed routes for monitoring channels.
 """
+import time
+from datetime import datetime, timezone
+from enum import Enum
 from fastapi import APIRouter, HTTPException, Query, Request
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 
 from app.core.rate_limiter import limiter, YOUTUBE_RATE_LIMIT
-from app.services.youtube.rss_client import get_channel_feed
+from app.services.youtube.client import iter_subscription_pages
+from app.services.youtube.rss_client import get_channel_feed, get_channel_feeds, validate_channel_id
+from app.services.youtube.video_client import get_video_details
+from app.services.youtube.watcher import get_watcher
 
 router = APIRouter()
 
+MAX_FEED_CHANNELS = 1000
+
+
+def _watcher_freshness(state: dict) -> dict:
+    """Describe an answer served from the watcher's latest-video index."""
+    return {
+        "status": "watcher",
+        "fetched_at": datetime.fromtimestamp(state["last_polled_at"], timezone.utc).isoformat().replace("+00:00", "Z"),
+        "age_seconds": round(time.time() - state["last_polled_at"], 1),
+        "next_poll_at": datetime.fromtimestamp(state["next_poll_at"], timezone.utc).isoformat().replace("+00:00", "Z")
+    }
+
+
+class FeedEnrich(str, Enum):
+    DETAILS = "details"
+
+
+class FeedsRequest(BaseModel):
+    channel_ids: Optional[List[str]] = Field(
+        default=None,
+        max_length=MAX_FEED_CHANNELS,
+        description="YouTube channel IDs (UC...) to aggregate"
+    )
+    subscriptions_of: Optional[str] = Field(
+        default=None,
+        description="Aggregate the channels this channel subscribes to (requires YOUTUBE_API_KEY)"
+    )
+    max_videos: int = Field(
+        default=15,
+        ge=1,
+        le=15,
+        description="Maximum number of videos taken from each channel feed"
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of videos in the merged timeline"
+    )
+
+
+class WatchRequest(BaseModel):
+    channel_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_FEED_CHANNELS,
+        description="YouTube channel IDs (UC...) to watch"
+    )
+
 
 @router.get("/latest-video")
 @limiter.limit(YOUTUBE_RATE_LIMIT)
@@ -27,10 +82,23 @@ async def get_latest_video(
     
     No API key required - uses public RSS feed.
     
+    Channels registered with the watcher are answered from its in-memory
+    latest-video index without fetching the feed.
+    
     Rate limit: 5 requests per minute.
     """
     try:
-        result = get_channel_feed(channel_id, max_videos=1)
+        state = get_watcher().latest(channel_id.strip())
+        if state:
+            return {
+                "channel_id": state["channel_id"],
+                "channel_title": state["channel_title"],
+                "channel_url": f"https://www.youtube.com/channel/{state['channel_id']}",
+                "latest_video": state["latest_video"],
+                "cache": _watcher_freshness(state)
+            }
+        
+        result = await get_channel_feed(channel_id, max_videos=1)
         
         if not result.get("latest_video"):
             raise HTTPException(
@@ -43,7 +111,8 @@ async def get_latest_video(
             "channel_id": result["channel_id"],
             "channel_title": result["channel_title"],
             "channel_url": result["channel_url"],
-            "latest_video": result["latest_video"]
+            "latest_video": result["latest_video"],
+            "cache": result["cache"]
         }
         
     except ValueError as e:
@@ -71,6 +140,14 @@ async def get_channel_videos(
         ge=1,
         le=15,
         description="Maximum number of videos to return (1-15, RSS feeds typically have 15)"
+    ),
+    since: Optional[str] = Query(
+        default=None,
+        description="Only return videos newer than this ISO 8601 timestamp or video ID (e.g. the last one you saw)"
+    ),
+    enrich: Optional[FeedEnrich] = Query(
+        default=None,
+        description="Set to 'details' to add duration, like count and live status (requires YOUTUBE_API_KEY)."
     )
 ):
     """
@@ -82,10 +159,22 @@ async def get_channel_videos(
     No API key required - uses public RSS feed.
     YouTube RSS feeds typically contain the 15 most recent videos.
     
+    With since, only videos newer than the given timestamp or video ID are
+    returned, so "what's new" checks get an empty list when nothing changed.
+    
+    With enrich=details each video gains a "details" object (duration, view,
+    like and comment counts, live status) from one batched videos.list call.
+    
     Rate limit: 5 requests per minute.
     """
     try:
-        result = get_channel_feed(channel_id, max_videos=max_videos)
+        result = await get_channel_feed(channel_id, max_videos=max_videos, since=since)
+        
+        if enrich == FeedEnrich.DETAILS and result["videos"]:
+            details = await get_video_details([video["video_id"] for video in result["videos"]])
+            for video in result["videos"]:
+                video["details"] = details.get(video["video_id"])
+        
         return result
         
     except ValueError as e:
@@ -100,4 +189,88 @@ async def get_channel_videos(
         )
 
 
+@router.post("/feeds")
+@limiter.limit(YOUTUBE_RATE_LIMIT)
+async def get_multiple_channel_videos(
+    request: Request,
+    body: FeedsRequest
+):
+    """
+    Get one merged, newest-first timeline from many channels' RSS feeds.
+    
+    Pass channel_ids, or subscriptions_of to use the channels a channel
+    subscribes to. Feeds are fetched concurrently with a bounded pool; a
+    channel whose feed fails is listed in "errors" without failing the call.
+    
+    Rate limit: 5 requests per minute.
+    """
+    try:
+        channel_ids = list(body.channel_ids or [])
+        if body.subscriptions_of:
+            async for page in iter_subscription_pages(channel_id=body.subscriptions_of):
+                channel_ids.extend(
+                    item["channel_id"] for item in page["subscriptions"] if item["channel_id"]
+                )
+        
+        if not channel_ids:
+            raise ValueError("Provide channel_ids or subscriptions_of")
+        
+        return await get_channel_feeds(channel_ids, max_videos=body.max_videos, limit=body.limit)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching channel feeds: {str(e)}"
+        )
+
+
+@router.post("/watcher/channels")
+async def watch_channels(body: WatchRequest):
+    """
+    Register channels with the background watcher.
+    
+    Watched channels are polled on an adaptive schedule; new uploads are
+    posted to the configured webhook and /latest-video answers them from
+    memory. Registering an already watched channel is a no-op.
+    """
+    try:
+        channel_ids = [validate_channel_id(channel_id) for channel_id in body.channel_ids]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    channels = [get_watcher().add(channel_id) for channel_id in channel_ids]
+    return {"count": len(channels), "channels": channels}
 
+
+@router.get("/watcher/channels")
+async def list_watched_channels():
+    """
+    List watched channels with their latest video and polling schedule.
+    
+    "running" is false if the poll loop is not running; /latest-video then
+    answers from the feed instead of the index.
+    """
+    watcher = get_watcher()
+    channels = watcher.list()
+    return {"running": watcher.running, "count": len(channels), "channels": channels}
+
+
+@router.delete("/watcher/channels/{channel_id}")
+async def unwatch_channel(channel_id: str):
+    """
+    Stop watching a channel.
+    """
+    if not get_watcher().remove(channel_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Channel is not watched: {channel_id}"
+        )
+    return {"channel_id": channel_id, "removed": True}
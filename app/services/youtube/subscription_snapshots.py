@@ -0,0 +1,264 @@
+"""
+Subscription snapshots for change tracking.
+
+Each refresh of a tracked channel's subscriptions is compared with the
+current membership; only the differences are written, as a new snapshot with
+its added/removed rows. A snapshot ID is the token callers pass back as
+`since`, and the changes after it are the net of the rows recorded since.
+"""
+import json
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+from app.config import YOUTUBE_SUBSCRIPTION_SNAPSHOT_PATH
+from app.core.storage import open_database
+from app.services.youtube.client import iter_subscription_pages
+
+logger = logging.getLogger(__name__)
+
+ADDED = "added"
+REMOVED = "removed"
+
+
+class SubscriptionSnapshotStore:
+    """SQLite store of current subscriptions and the changes between snapshots."""
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = open_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS subscription_snapshots ("
+            "snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "channel_id TEXT NOT NULL, "
+            "total INTEGER NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS subscription_members ("
+            "channel_id TEXT NOT NULL, "
+            "subscribed_id TEXT NOT NULL, "
+            "data TEXT NOT NULL, "
+            "PRIMARY KEY (channel_id, subscribed_id))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS subscription_changes ("
+            "snapshot_id INTEGER NOT NULL, "
+            "channel_id TEXT NOT NULL, "
+            "subscribed_id TEXT NOT NULL, "
+            "change TEXT NOT NULL, "
+            "data TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS subscription_changes_channel "
+            "ON subscription_changes (channel_id, snapshot_id)"
+        )
+    
+    def latest_snapshot(self, channel_id: str) -> Optional[Tuple[int, int, float]]:
+        """Return (snapshot_id, total, created_at) of the newest snapshot, or None."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT snapshot_id, total, created_at FROM subscription_snapshots "
+                "WHERE channel_id = ? ORDER BY snapshot_id DESC LIMIT 1",
+                (channel_id,)
+            ).fetchone()
+    
+    def has_snapshot(self, channel_id: str, snapshot_id: int) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM subscription_snapshots WHERE channel_id = ? AND snapshot_id = ?",
+                (channel_id, snapshot_id)
+            ).fetchone()
+        return row is not None
+    
+    def members(self, channel_id: str) -> Dict[str, Dict[str, Any]]:
+        """Return the current subscriptions of a channel, keyed by subscribed channel ID."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT subscribed_id, data FROM subscription_members WHERE channel_id = ?",
+                (channel_id,)
+            ).fetchall()
+        return {row[0]: json.loads(row[1]) for row in rows}
+    
+    def save_snapshot(
+        self,
+        channel_id: str,
+        added: List[Dict[str, Any]],
+        removed: List[Dict[str, Any]],
+        total: int
+    ) -> int:
+        """Record a new snapshot with its changes and update the membership. Returns its ID."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                snapshot_id = self._db.execute(
+                    "INSERT INTO subscription_snapshots (channel_id, total, created_at) VALUES (?, ?, ?)",
+                    (channel_id, total, now)
+                ).lastrowid
+                changes = [(ADDED, item) for item in added] + [(REMOVED, item) for item in removed]
+                self._db.executemany(
+                    "INSERT INTO subscription_changes (snapshot_id, channel_id, subscribed_id, change, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (snapshot_id, channel_id, item["channel_id"], change, json.dumps(item))
+                        for change, item in changes
+                    ]
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO subscription_members (channel_id, subscribed_id, data) "
+                    "VALUES (?, ?, ?)",
+                    [(channel_id, item["channel_id"], json.dumps(item)) for item in added]
+                )
+                self._db.executemany(
+                    "DELETE FROM subscription_members WHERE channel_id = ? AND subscribed_id = ?",
+                    [(channel_id, item["channel_id"]) for item in removed]
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return snapshot_id
+    
+    def changes_since(
+        self,
+        channel_id: str,
+        snapshot_id: int
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Net changes recorded after a snapshot.
+        
+        A channel added and later removed again (or the reverse) cancels out.
+        
+        Returns:
+            Tuple of (added, removed) subscription lists.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT subscribed_id, change, data FROM subscription_changes "
+                "WHERE channel_id = ? AND snapshot_id > ? ORDER BY snapshot_id",
+                (channel_id, snapshot_id)
+            ).fetchall()
+        
+        first_change: Dict[str, str] = {}
+        last_change: Dict[str, Tuple[str, str]] = {}
+        for subscribed_id, change, data in rows:
+            first_change.setdefault(subscribed_id, change)
+            last_change[subscribed_id] = (change, data)
+        
+        added, removed = [], []
+        for subscribed_id, (change, data) in last_change.items():
+            if first_change[subscribed_id] != change:
+                continue
+            (added if change == ADDED else removed).append(json.loads(data))
+        return added, removed
+
+
+_store: Optional[SubscriptionSnapshotStore] = None
+_store_lock = threading.Lock()
+
+# One refresh per channel at a time, so concurrent callers do not record the same change twice
+_refresh_locks: Dict[str, asyncio.Lock] = {}
+
+
+def get_snapshot_store() -> SubscriptionSnapshotStore:
+    """Return the process-wide snapshot store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SubscriptionSnapshotStore(YOUTUBE_SUBSCRIPTION_SNAPSHOT_PATH)
+    return _store
+
+
+def _parse_token(token: str) -> int:
+    try:
+        return int(token)
+    except ValueError:
+        raise ValueError(f"Invalid snapshot token: {token}")
+
+
+async def refresh_snapshot(channel_id: Optional[str] = None) -> Tuple[str, int, bool]:
+    """
+    Fetch a channel's subscriptions and record a snapshot if anything changed.
+    
+    Every page is revalidated with a conditional request, so unchanged pages
+    come back as 304 without a body.
+    
+    Args:
+        channel_id: Channel ID to track. Defaults to configured channel.
+    
+    Returns:
+        Tuple of (channel_id, latest snapshot ID, whether a new snapshot was recorded).
+    
+    Raises:
+        ValueError: On configuration, API or connection errors
+    """
+    current: Dict[str, Dict[str, Any]] = {}
+    target_channel_id = channel_id
+    total = 0
+    async for page in iter_subscription_pages(channel_id=channel_id, ttl=0):
+        target_channel_id = page["channel_id"]
+        total = page["total_results"]
+        for subscription in page["subscriptions"]:
+            if subscription["channel_id"]:
+                current[subscription["channel_id"]] = subscription
+    
+    store = get_snapshot_store()
+    lock = _refresh_locks.setdefault(target_channel_id, asyncio.Lock())
+    async with lock:
+        latest = store.latest_snapshot(target_channel_id)
+        previous = store.members(target_channel_id)
+        added = [item for key, item in current.items() if key not in previous]
+        removed = [item for key, item in previous.items() if key not in current]
+        
+        if latest and not added and not removed:
+            return target_channel_id, latest[0], False
+        
+        snapshot_id = store.save_snapshot(target_channel_id, added, removed, total)
+        logger.info(
+            f"Subscription snapshot {snapshot_id} for {target_channel_id}: "
+            f"+{len(added)} -{len(removed)}"
+        )
+        return target_channel_id, snapshot_id, True
+
+
+async def get_subscription_changes(
+    channel_id: Optional[str] = None,
+    since: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Refresh a channel's snapshot and return the subscriptions added or removed since a token.
+    
+    Args:
+        channel_id: Channel ID to track. Defaults to configured channel.
+        since: Token from a previous call. Without it the current list becomes
+            the baseline and no changes are reported.
+    
+    Returns:
+        Dictionary with the new token, added and removed subscriptions.
+    
+    Raises:
+        ValueError: On configuration/API errors or a token that does not
+            belong to the channel
+    """
+    since_id = _parse_token(since) if since else None
+    target_channel_id, snapshot_id, _ = await refresh_snapshot(channel_id)
+    
+    store = get_snapshot_store()
+    if since_id is not None and not store.has_snapshot(target_channel_id, since_id):
+        raise ValueError(f"Unknown snapshot token for channel {target_channel_id}: {since}")
+    
+    added, removed = store.changes_since(target_channel_id, since_id) if since_id is not None else ([], [])
+    latest = store.latest_snapshot(target_channel_id)
+    
+    return {
+        "channel_id": target_channel_id,
+        "since": since,
+        "token": str(snapshot_id),
+        "total_results": latest[1] if latest else 0,
+        "added": added,
+        "removed": removed
+    }
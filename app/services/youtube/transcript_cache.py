@@ -0,0 +1,184 @@
+"""
+Persistent cache of video transcripts keyed by (video ID, requested language).
+
+Captions of a published video almost never change, so transcripts are kept
+until the cache outgrows YOUTUBE_TRANSCRIPT_CACHE_MAX_MB, when the least
+recently read ones are evicted. They are stored as zlib-compressed JSON in
+SQLite, behind a bounded in-memory LRU. Videos without captions are cached
+for a short TTL so repeated requests do not rerun yt-dlp.
+"""
+import json
+import time
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Dict, Any
+
+from app.config import (
+    YOUTUBE_TRANSCRIPT_CACHE_PATH,
+    YOUTUBE_TRANSCRIPT_CACHE_MEMORY_SIZE,
+    YOUTUBE_TRANSCRIPT_CACHE_MAX_MB,
+    YOUTUBE_TRANSCRIPT_NEGATIVE_TTL,
+)
+from app.core.storage import open_database
+
+logger = logging.getLogger(__name__)
+
+# expires_at value for entries that never expire
+NEVER_EXPIRES = 0.0
+
+# Memory hits are written to accessed_at in batches of this size (and before every eviction)
+TOUCH_BATCH_SIZE = 100
+
+
+class TranscriptCache:
+    """Two-tier (memory LRU + compressed SQLite) cache of transcripts."""
+    
+    def __init__(self, path: str, memory_size: int, max_bytes: int, negative_ttl: int):
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[Optional[Dict[str, Any]], float]]" = OrderedDict()
+        self._memory_size = memory_size
+        self._max_bytes = max_bytes
+        self._negative_ttl = negative_ttl
+        # Read times of memory hits not yet written to SQLite
+        self._touched: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._db = open_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            "video_id TEXT NOT NULL, "
+            "language TEXT NOT NULL, "
+            "data BLOB, "
+            "size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, "
+            "PRIMARY KEY (video_id, language))"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS transcripts_accessed ON transcripts (accessed_at)"
+        )
+    
+    def get(self, video_id: str, language: Optional[str]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Look up a transcript.
+        
+        Returns:
+            Tuple of (found, transcript). transcript is None for a cached
+            "no captions" answer.
+        """
+        key = (video_id, language or "")
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._db.execute(
+                    "SELECT data, expires_at FROM transcripts WHERE video_id = ? AND language = ?",
+                    key
+                ).fetchone()
+                if row is None:
+                    return False, None
+                data, expires_at = row
+                entry = (json.loads(zlib.decompress(data)) if data is not None else None, expires_at)
+                self._db.execute(
+                    "UPDATE transcripts SET accessed_at = ? WHERE video_id = ? AND language = ?",
+                    (now, *key)
+                )
+            else:
+                self._touched[key] = now
+                if len(self._touched) >= TOUCH_BATCH_SIZE:
+                    self._flush_touched()
+            
+            transcript, expires_at = entry
+            if expires_at != NEVER_EXPIRES and expires_at <= now:
+                self._memory.pop(key, None)
+                self._touched.pop(key, None)
+                self._db.execute("DELETE FROM transcripts WHERE video_id = ? AND language = ?", key)
+                return False, None
+            
+            self._remember(key, entry)
+            return True, dict(transcript) if transcript is not None else None
+    
+    def set(self, video_id: str, language: Optional[str], transcript: Dict[str, Any]) -> None:
+        """Store a transcript until it is evicted for space."""
+        data = zlib.compress(json.dumps(transcript).encode(), 6)
+        self._store((video_id, language or ""), transcript, data, NEVER_EXPIRES)
+    
+    def set_missing(self, video_id: str, language: Optional[str]) -> None:
+        """Store a "no captions" answer for the negative TTL."""
+        self._store((video_id, language or ""), None, None, time.time() + self._negative_ttl)
+    
+    def _store(
+        self,
+        key: Tuple[str, str],
+        transcript: Optional[Dict[str, Any]],
+        data: Optional[bytes],
+        expires_at: float
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO transcripts (video_id, language, data, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, data, len(data) if data else 0, expires_at, time.time())
+            )
+            self._touched.pop(key, None)
+            self._remember(key, (transcript, expires_at))
+            if data:
+                self._evict()
+    
+    def _flush_touched(self) -> None:
+        """Write the read times of memory hits to SQLite (caller holds the lock)."""
+        if not self._touched:
+            return
+        self._db.executemany(
+            "UPDATE transcripts SET accessed_at = ? WHERE video_id = ? AND language = ?",
+            [(accessed_at, *key) for key, accessed_at in self._touched.items()]
+        )
+        self._touched.clear()
+    
+    def _evict(self) -> None:
+        """Delete the least recently read transcripts above the size limit (caller holds the lock)."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        
+        self._flush_touched()
+        evicted = 0
+        rows = self._db.execute(
+            "SELECT video_id, language, size FROM transcripts ORDER BY accessed_at"
+        ).fetchall()
+        for video_id, language, size in rows:
+            if total <= self._max_bytes:
+                break
+            self._db.execute("DELETE FROM transcripts WHERE video_id = ? AND language = ?", (video_id, language))
+            self._memory.pop((video_id, language), None)
+            self._touched.pop((video_id, language), None)
+            total -= size
+            evicted += 1
+        logger.info(f"Transcript cache over {self._max_bytes} bytes: evicted {evicted} entries")
+    
+    def _remember(self, key: Tuple[str, str], entry: Tuple[Optional[Dict[str, Any]], float]) -> None:
+        """Insert/refresh an entry in the memory LRU (caller holds the lock)."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+
+
+_cache: Optional[TranscriptCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """Return the process-wide transcript cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranscriptCache(
+                    YOUTUBE_TRANSCRIPT_CACHE_PATH,
+                    YOUTUBE_TRANSCRIPT_CACHE_MEMORY_SIZE,
+                    YOUTUBE_TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024,
+                    YOUTUBE_TRANSCRIPT_NEGATIVE_TTL
+                )
+                logger.info(f"Transcript cache opened: {YOUTUBE_TRANSCRIPT_CACHE_PATH}")
+    return _cache
@@ -1,26 +1,60 @@
 """
 YouTube transcript extraction using yt-dlp.
+
+By default (YOUTUBE_TRANSCRIPT_LEAN) yt-dlp only reads the video's caption
+track list; the best track is picked in memory and its json3 payload is
+downloaded straight into the parser, without resolving media formats or
+writing subtitle files. If that is not possible the transcript is extracted
+the original way, through yt-dlp's subtitle download into a temp directory.
+
+Extracted transcripts (and "no captions" answers) are cached per video and
+language, so repeated requests are answered without running yt-dlp.
 """
 import logging
 import re
 import json
 import tempfile
 import os
-from typing import Dict, Any, Optional, List
+import threading
+from typing import Dict, Any, Optional, List, Tuple
 
+import httpx
 import yt_dlp
 
-from app.config import YOUTUBE_COOKIES_PATH
+from app.config import HTTP_TIMEOUT, YOUTUBE_TRANSCRIPT_LEAN, YOUTUBE_TRANSCRIPT_WORKERS
+from app.core.http_client import DEFAULT_HEADERS
+from app.services.youtube.cookies import get_cookie_manager
+from app.services.youtube.transcript_cache import get_transcript_cache
 
 logger = logging.getLogger(__name__)
 
 VIDEO_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{11}$")
 VIDEO_URL_PATTERNS = [
     re.compile(r"(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})"),
+    re.compile(r"youtube\.com/watch\?(?:[^#]*&)?v=([a-zA-Z0-9_-]{11})"),
     re.compile(r"youtube\.com/embed/([a-zA-Z0-9_-]{11})"),
     re.compile(r"youtube\.com/v/([a-zA-Z0-9_-]{11})"),
+    re.compile(r"youtube\.com/(?:shorts|live)/([a-zA-Z0-9_-]{11})"),
 ]
 
+NO_TRANSCRIPT_MESSAGE = (
+    "No transcript available for this video. "
+    "The video may not have captions enabled."
+)
+
+
+# Make requests look more like a real browser (helps with server IPs)
+YDL_OPTIONS = {
+    "quiet": True,
+    "no_warnings": True,
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "referer": "https://www.youtube.com/",
+}
+
+
+class NoTranscriptError(ValueError):
+    """Raised when a video has no captions in any accepted language."""
+
 
 def extract_video_id(url_or_id: str) -> str:
     """
@@ -65,77 +99,234 @@ def get_video_transcript(
                   If not specified, tries to get English or auto-generated.
     
     Returns:
-        Dictionary containing video info and transcript.
+        Dictionary containing video info, transcript and a "cache" object
+        (status: hit or miss).
     
     Raises:
+        NoTranscriptError: If the video has no captions (cached for
+            YOUTUBE_TRANSCRIPT_NEGATIVE_TTL)
         ValueError: If transcript cannot be extracted
     """
     video_id = extract_video_id(url_or_id)
+    cache = get_transcript_cache()
+    
+    cached = get_cached_transcript(video_id, language)
+    if cached is not None:
+        return cached
+    
+    try:
+        transcript = _extract_transcript(video_id, language)
+    except NoTranscriptError:
+        cache.set_missing(video_id, language)
+        raise
+    cache.set(video_id, language, transcript)
+    return {**transcript, "cache": {"status": "miss"}}
+
+
+def get_cached_transcript(url_or_id: str, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Return a cached transcript without running yt-dlp, or None if it is not cached.
+    
+    Raises:
+        NoTranscriptError: If the video is cached as having no captions
+        ValueError: If the video URL or ID is invalid
+    """
+    found, cached = get_transcript_cache().get(extract_video_id(url_or_id), language)
+    if not found:
+        return None
+    if cached is None:
+        raise NoTranscriptError(NO_TRANSCRIPT_MESSAGE)
+    return {**cached, "cache": {"status": "hit"}}
+
+
+def _extract_transcript(video_id: str, language: Optional[str]) -> Dict[str, Any]:
+    """
+    Extract a video's transcript, the lean way if enabled.
+    
+    Raises:
+        NoTranscriptError: If the video has no captions
+        ValueError: If transcript cannot be extracted
+    """
+    if YOUTUBE_TRANSCRIPT_LEAN:
+        transcript = _extract_transcript_lean(video_id, language)
+        if transcript is not None:
+            return transcript
+    return _extract_transcript_files(video_id, language)
+
+
+def _subtitle_languages(language: Optional[str]) -> List[str]:
+    """Return the caption languages to accept, most preferred first."""
+    if language:
+        return [language, f"{language}-orig", "en", "en-orig"]
+    return ["en", "en-orig", "en-US"]
+
+
+def _extract_transcript_lean(video_id: str, language: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Read a video's caption tracks with yt-dlp and download the best json3 track directly.
+    
+    Returns:
+        The transcript, or None if the chosen track has no json3 version,
+        could not be downloaded or came back empty (the subtitle file
+        download is used instead)
+    
+    Raises:
+        NoTranscriptError: If the video lists no caption track
+        ValueError: If the video info cannot be extracted
+    """
     video_url = f"https://www.youtube.com/watch?v={video_id}"
     
     logger.info(f"Extracting transcript for video: {video_id}")
     
+    ydl_opts = {
+        **YDL_OPTIONS,
+        "skip_download": True,
+        # Caption tracks come from the player response; the DASH/HLS manifests are not needed
+        "extractor_args": {"youtube": {"skip": ["dash", "hls"]}},
+    }
+    
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            get_cookie_manager().attach(ydl)
+            # process=False returns the extractor result without resolving formats or subtitles
+            info = ydl.extract_info(video_url, download=False, process=False)
+    except yt_dlp.utils.DownloadError as e:
+        raise _download_error(e)
+    except Exception as e:
+        logger.error(f"Error extracting transcript: {e}")
+        raise ValueError(f"Failed to extract transcript: {str(e)}")
+    
+    track = _pick_caption_track(info, language)
+    if track is None:
+        raise NoTranscriptError(NO_TRANSCRIPT_MESSAGE)
+    subtitle_language, track_url = track
+    if track_url is None:
+        logger.info(f"No json3 captions for {video_id} ({subtitle_language}), using subtitle file download")
+        return None
+    
+    try:
+        response = _get_caption_client().get(track_url)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning(f"Caption download failed for {video_id}, using subtitle file download: {e}")
+        return None
+    
+    transcript_segments = _parse_json3(response.text)
+    transcript_text = _join_segments(transcript_segments)
+    if not transcript_text:
+        # The track is listed, so an empty or unparsable body is a download problem, not "no captions"
+        logger.warning(f"Empty caption download for {video_id} ({subtitle_language}), using subtitle file download")
+        return None
+    
+    return {
+        "video_id": video_id,
+        "video_url": video_url,
+        "title": info.get("title", ""),
+        "duration": info.get("duration", 0),
+        "channel": info.get("uploader", ""),
+        "channel_id": info.get("channel_id", ""),
+        "language": subtitle_language,
+        "transcript": transcript_text,
+        "segments": transcript_segments
+    }
+
+
+def _pick_caption_track(info: Dict[str, Any], language: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Pick the caption track to use, preferring uploaded subtitles over automatic captions.
+    
+    Returns:
+        Tuple of (language, json3 URL or None if the track has no json3
+        version), or None if no accepted language has captions
+    """
+    for lang in _subtitle_languages(language):
+        for source in ("subtitles", "automatic_captions"):
+            formats = (info.get(source) or {}).get(lang)
+            if formats:
+                url = next((f.get("url") for f in formats if f.get("ext") == "json3"), None)
+                return lang, url
+    return None
+
+
+_caption_client: Optional[httpx.Client] = None
+_caption_client_lock = threading.Lock()
+
+
+def _get_caption_client() -> httpx.Client:
+    """
+    Return the pooled client for caption downloads.
+    
+    Extraction runs on worker threads, so this is a synchronous client; it
+    shares the cookie jar with yt-dlp.
+    """
+    global _caption_client
+    if _caption_client is None:
+        with _caption_client_lock:
+            if _caption_client is None:
+                _caption_client = httpx.Client(
+                    headers={**DEFAULT_HEADERS, "Referer": "https://www.youtube.com/"},
+                    cookies=get_cookie_manager().jar(),
+                    timeout=httpx.Timeout(HTTP_TIMEOUT, connect=min(HTTP_TIMEOUT, 5.0)),
+                    limits=httpx.Limits(
+                        max_connections=YOUTUBE_TRANSCRIPT_WORKERS,
+                        max_keepalive_connections=YOUTUBE_TRANSCRIPT_WORKERS
+                    ),
+                    follow_redirects=True
+                )
+    return _caption_client
+
+
+def close_caption_client() -> None:
+    """Close the caption download client and its pooled connections."""
+    global _caption_client
+    if _caption_client is not None:
+        _caption_client.close()
+        _caption_client = None
+
+
+def _download_error(e: yt_dlp.utils.DownloadError) -> ValueError:
+    """Convert a yt-dlp download error to a ValueError with a readable message."""
+    error_msg = str(e)
+    if "Private video" in error_msg:
+        return ValueError("This video is private and cannot be accessed.")
+    elif "Video unavailable" in error_msg:
+        return ValueError("This video is unavailable.")
+    elif "Sign in" in error_msg:
+        return ValueError("This video requires authentication to access.")
+    logger.error(f"yt-dlp error: {e}")
+    return ValueError(f"Failed to extract video info: {error_msg}")
+
+
+def _extract_transcript_files(video_id: str, language: Optional[str]) -> Dict[str, Any]:
+    """
+    Run yt-dlp to download a video's subtitle files and parse them.
+    
+    Raises:
+        NoTranscriptError: If the video has no captions
+        ValueError: If transcript cannot be extracted
+    """
+    video_url = f"https://www.youtube.com/watch?v={video_id}"
+    
+    logger.info(f"Extracting transcript for video from subtitle files: {video_id}")
+    
     # Create temp directory for subtitle files
     with tempfile.TemporaryDirectory() as temp_dir:
         subtitle_file = os.path.join(temp_dir, "subtitle")
         
         ydl_opts = {
+            **YDL_OPTIONS,
             "skip_download": True,
             "writesubtitles": True,
             "writeautomaticsub": True,
             "subtitlesformat": "json3",
             "outtmpl": subtitle_file,
-            "quiet": True,
-            "no_warnings": True,
-            # Make requests look more like a real browser (helps with server IPs)
-            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "referer": "https://www.youtube.com/",
+            "subtitleslangs": _subtitle_languages(language),
         }
         
-        # Cookie strategy (helps with server IPs + restricted videos):
-        # 1. Use cookie file if provided (production)
-        # 2. Try auto-extract from Firefox (dev - works on Windows)
-        # 3. Try auto-extract from Chrome/Edge (dev - may fail on Windows DPAPI)
-        # 4. Continue without cookies (may fail for restricted content)
-        
-        cookie_source = None
-        
-        if YOUTUBE_COOKIES_PATH and os.path.exists(YOUTUBE_COOKIES_PATH):
-            # Production: use cookie file
-            ydl_opts["cookiefile"] = YOUTUBE_COOKIES_PATH
-            cookie_source = f"file: {YOUTUBE_COOKIES_PATH}"
-        else:
-            # Development: try auto-extract from browser
-            # Firefox works best on Windows (no DPAPI issues)
-            for browser in ["firefox", "chrome", "edge"]:
-                try:
-                    # Test if we can use this browser's cookies
-                    test_opts = {"cookiesfrombrowser": (browser,), "quiet": True}
-                    with yt_dlp.YoutubeDL(test_opts) as test_ydl:
-                        # Quick validation - just check if cookies are accessible
-                        test_ydl.cookiejar
-                        ydl_opts["cookiesfrombrowser"] = (browser,)
-                        cookie_source = f"browser: {browser}"
-                        break
-                except Exception:
-                    continue
-        
-        if cookie_source:
-            logger.info(f"Using cookies from {cookie_source}")
-        else:
-            logger.warning(
-                "No cookies available - may fail with restricted videos or from server IPs. "
-                "Set YOUTUBE_COOKIES_PATH or use Firefox logged into YouTube."
-            )
-        
-        # Set language preferences
-        if language:
-            ydl_opts["subtitleslangs"] = [language, f"{language}-orig", "en", "en-orig"]
-        else:
-            ydl_opts["subtitleslangs"] = ["en", "en-orig", "en-US", "a].*"]
-        
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                # Cookies come from the shared jar, resolved once at startup
+                get_cookie_manager().attach(ydl)
                 info = ydl.extract_info(video_url, download=True)
                 
                 video_title = info.get("title", "")
@@ -174,10 +365,7 @@ def get_video_transcript(
                             break
                 
                 if not transcript_text:
-                    raise ValueError(
-                        "No transcript available for this video. "
-                        "The video may not have captions enabled."
-                    )
+                    raise NoTranscriptError(NO_TRANSCRIPT_MESSAGE)
                 
                 return {
                     "video_id": video_id,
@@ -190,18 +378,11 @@ def get_video_transcript(
                     "transcript": transcript_text,
                     "segments": transcript_segments
                 }
-                
+        
         except yt_dlp.utils.DownloadError as e:
-            error_msg = str(e)
-            if "Private video" in error_msg:
-                raise ValueError("This video is private and cannot be accessed.")
-            elif "Video unavailable" in error_msg:
-                raise ValueError("This video is unavailable.")
-            elif "Sign in" in error_msg:
-                raise ValueError("This video requires authentication to access.")
-            else:
-                logger.error(f"yt-dlp error: {e}")
-                raise ValueError(f"Failed to extract video info: {error_msg}")
+            raise _download_error(e)
+        except NoTranscriptError:
+            raise
         except Exception as e:
             logger.error(f"Error extracting transcript: {e}")
             raise ValueError(f"Failed to extract transcript: {str(e)}")
@@ -231,18 +412,20 @@ def _parse_subtitle_file(filepath: str, ext: str) -> tuple[List[Dict], str]:
         elif ext == "srt":
             segments = _parse_srt(content)
         
-        # Build full text from segments
-        full_text = " ".join(seg["text"] for seg in segments if seg.get("text"))
-        # Clean up multiple spaces
-        full_text = re.sub(r"\s+", " ", full_text).strip()
-        
-        return segments, full_text
-        
+        return segments, _join_segments(segments)
+    
     except Exception as e:
         logger.error(f"Error parsing subtitle file: {e}")
         return [], ""
 
 
+def _join_segments(segments: List[Dict]) -> str:
+    """Build the full transcript text from segments."""
+    full_text = " ".join(seg["text"] for seg in segments if seg.get("text"))
+    # Clean up multiple spaces
+    return re.sub(r"\s+", " ", full_text).strip()
+
+
 def _parse_json3(content: str) -> List[Dict]:
     """Parse JSON3 subtitle format."""
     segments = []
@@ -269,7 +452,7 @@ def _parse_json3(content: str) -> List[Dict]:
                     "duration": duration_ms / 1000.0,
                     "text": "".join(text_parts).strip()
                 })
-        
+    
     except json.JSONDecodeError:
         pass
     
@@ -0,0 +1,267 @@
+"""
+Bounded worker pool for transcript extraction.
+
+yt-dlp is blocking and an extraction takes seconds, so it runs on a
+dedicated thread pool instead of the event loop. Threads (not processes)
+keep the shared cookie jar and transcript cache in one place.
+
+- At most YOUTUBE_TRANSCRIPT_WORKERS extractions run at once and at most
+  YOUTUBE_TRANSCRIPT_QUEUE_LIMIT wait for a worker; further jobs are
+  rejected with TranscriptPoolFullError instead of piling up.
+- A job waits at most YOUTUBE_TRANSCRIPT_TIMEOUT seconds (queue time
+  included) before TranscriptTimeoutError.
+- Cancelling the awaiting task (e.g. the client disconnected) drops a job
+  that has not started. A running extraction cannot be interrupted; it
+  finishes in the background and its result still fills the cache.
+
+Cached transcripts are answered before queueing.
+
+extract_transcripts runs a batch of videos through the pool, yielding each
+result as it completes.
+"""
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, AsyncIterator
+
+from app.config import (
+    YOUTUBE_TRANSCRIPT_WORKERS,
+    YOUTUBE_TRANSCRIPT_QUEUE_LIMIT,
+    YOUTUBE_TRANSCRIPT_TIMEOUT,
+)
+from app.services.youtube.transcript_client import (
+    get_video_transcript,
+    get_cached_transcript,
+    close_caption_client,
+    extract_video_id,
+    NoTranscriptError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptPoolFullError(Exception):
+    """Raised when every worker is busy and the queue is full."""
+
+
+class TranscriptTimeoutError(Exception):
+    """Raised when a job does not finish within the timeout."""
+
+
+class TranscriptPool:
+    """Runs transcript extractions on a bounded thread pool and counts them."""
+    
+    def __init__(self, workers: int, queue_limit: int, timeout: float):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transcript")
+        self._workers = workers
+        self._queue_limit = queue_limit
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._counts = {
+            "cache_hits": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "cancelled": 0
+        }
+        self._busy_seconds = 0.0
+    
+    async def run(self, url_or_id: str, language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a transcript from the cache, or extract it on the pool.
+        
+        Raises:
+            TranscriptPoolFullError: If the queue is full
+            TranscriptTimeoutError: If the job does not finish in time
+            ValueError: On invalid input or extraction errors
+        """
+        cached = self.cached(url_or_id, language)
+        if cached is not None:
+            return cached
+        
+        with self._lock:
+            if self._pending >= self._workers + self._queue_limit:
+                self._counts["rejected"] += 1
+                raise TranscriptPoolFullError(
+                    f"Transcript queue is full ({self._pending} jobs); retry later"
+                )
+            self._pending += 1
+        
+        future = self._executor.submit(self._work, url_or_id, language)
+        future.add_done_callback(self._on_done)
+        try:
+            # Cancelling the wrapped future also cancels a job that has not started
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            self._count("timed_out")
+            raise TranscriptTimeoutError(f"Transcript extraction did not finish within {self._timeout}s")
+        except asyncio.CancelledError:
+            self._count("cancelled")
+            raise
+    
+    def cached(self, url_or_id: str, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached transcript (counted as a cache hit), or None if it is not cached.
+        
+        Raises:
+            NoTranscriptError: If the video is cached as having no captions
+            ValueError: If the video URL or ID is invalid
+        """
+        cached = get_cached_transcript(url_or_id, language)
+        if cached is not None:
+            self._count("cache_hits")
+        return cached
+    
+    def _work(self, url_or_id: str, language: Optional[str]) -> Dict[str, Any]:
+        with self._lock:
+            self._active += 1
+        started = time.monotonic()
+        try:
+            result = get_video_transcript(url_or_id, language=language)
+        except Exception:
+            self._count("failed")
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._busy_seconds += time.monotonic() - started
+        self._count("completed")
+        return result
+    
+    def _on_done(self, future) -> None:
+        with self._lock:
+            self._pending -= 1
+    
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+    
+    @property
+    def workers(self) -> int:
+        return self._workers
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self._counts["completed"] + self._counts["failed"]
+            return {
+                "workers": self._workers,
+                "queue_limit": self._queue_limit,
+                "timeout_seconds": self._timeout,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                **self._counts,
+                "avg_extraction_ms": round(self._busy_seconds / finished * 1000, 1) if finished else None
+            }
+    
+    def shutdown(self) -> None:
+        """Drop queued jobs and wait for the running ones to finish."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: Optional[TranscriptPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_transcript_pool() -> TranscriptPool:
+    """Return the process-wide transcript pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = TranscriptPool(
+                    YOUTUBE_TRANSCRIPT_WORKERS,
+                    YOUTUBE_TRANSCRIPT_QUEUE_LIMIT,
+                    YOUTUBE_TRANSCRIPT_TIMEOUT
+                )
+    return _pool
+
+
+async def stop_transcript_pool() -> None:
+    global _pool
+    if _pool is not None:
+        # Running jobs still use the caption client: wait for them before closing it
+        await asyncio.to_thread(_pool.shutdown)
+        _pool = None
+    close_caption_client()
+
+
+async def extract_transcripts(
+    urls_or_ids: List[str],
+    language: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Get the transcripts of many videos, yielding results as they complete.
+    
+    Inputs are normalized with extract_video_id and deduplicated. Cached
+    transcripts are yielded first; the rest are extracted on the pool, at
+    most one job per worker at a time so a batch does not fill the queue.
+    
+    Args:
+        urls_or_ids: YouTube video URLs or IDs
+        language: Preferred language code for every video
+    
+    Yields:
+        One dictionary per unique video with the inputs that mapped to it, a
+        status (ok, no_transcript, busy, timeout or error) and either the
+        transcript fields or an error. Inputs that are not video URLs/IDs
+        get one "invalid" line each.
+    """
+    groups: Dict[str, List[str]] = {}
+    for value in urls_or_ids:
+        try:
+            video_id = extract_video_id(value)
+        except ValueError as e:
+            yield {"inputs": [value], "status": "invalid", "error": str(e)}
+            continue
+        groups.setdefault(video_id, []).append(value)
+    
+    pool = get_transcript_pool()
+    misses: Dict[str, List[str]] = {}
+    for video_id, inputs in groups.items():
+        try:
+            cached = pool.cached(video_id, language)
+        except NoTranscriptError as e:
+            yield {"inputs": inputs, "video_id": video_id, "status": "no_transcript", "error": str(e)}
+            continue
+        if cached is None:
+            misses[video_id] = inputs
+        else:
+            yield {"inputs": inputs, "status": "ok", **cached}
+    
+    semaphore = asyncio.Semaphore(pool.workers)
+    
+    async def extract(video_id: str, inputs: List[str]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                transcript = await pool.run(video_id, language)
+                return {"inputs": inputs, "status": "ok", **transcript}
+            except NoTranscriptError as e:
+                return {"inputs": inputs, "video_id": video_id, "status": "no_transcript", "error": str(e)}
+            except TranscriptPoolFullError as e:
+                return {"inputs": inputs, "video_id": video_id, "status": "busy", "error": str(e)}
+            except TranscriptTimeoutError as e:
+                return {"inputs": inputs, "video_id": video_id, "status": "timeout", "error": str(e)}
+            except ValueError as e:
+                return {"inputs": inputs, "video_id": video_id, "status": "error", "error": str(e)}
+            except Exception as e:
+                logger.error(f"Unexpected error extracting transcript for {video_id}: {e}")
+                return {
+                    "inputs": inputs,
+                    "video_id": video_id,
+                    "status": "error",
+                    "error": f"Failed to extract transcript: {str(e)}"
+                }
+    
+    tasks = [asyncio.create_task(extract(video_id, inputs)) for video_id, inputs in misses.items()]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # Cancelling drops jobs still waiting for a worker (e.g. the client disconnected)
+        for task in tasks:
+            task.cancel()
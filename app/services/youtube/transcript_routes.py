@@ -1,14 +1,57 @@
 """
 YouTube transcript routes.
 """
+import json
+import asyncio
 from fastapi import APIRouter, HTTPException, Query, Request
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List
 
 from app.core.rate_limiter import limiter, YOUTUBE_RATE_LIMIT
-from app.services.youtube.transcript_client import get_video_transcript
+from app.services.youtube.cookies import get_cookie_manager
+from app.services.youtube.transcript_pool import (
+    get_transcript_pool,
+    extract_transcripts,
+    TranscriptPoolFullError,
+    TranscriptTimeoutError,
+)
 
 router = APIRouter()
 
+# How often a waiting request checks whether its client is still connected
+DISCONNECT_POLL_INTERVAL = 1.0
+
+MAX_BATCH_TRANSCRIPTS = 100
+
+
+class TranscriptBatchRequest(BaseModel):
+    videos: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_TRANSCRIPTS,
+        description="YouTube video URLs or 11-character video IDs"
+    )
+    language: Optional[str] = Field(
+        default=None,
+        description="Preferred language code (e.g., 'en', 'es') for every video. Defaults to English."
+    )
+
+
+async def _run_while_connected(request: Request, job):
+    """Await a job, cancelling it if the client disconnects first."""
+    task = asyncio.ensure_future(job)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+        if done:
+            return task.result()
+        if await request.is_disconnected():
+            task.cancel()
+            raise HTTPException(
+                status_code=499,
+                detail="Client disconnected"
+            )
+
 
 @router.get("/transcript")
 @limiter.limit(YOUTUBE_RATE_LIMIT)
@@ -29,12 +72,30 @@ async def get_transcript(
     Returns the full transcript text and timestamped segments.
     Uses auto-generated captions if manual captions are not available.
     
+    Transcripts are cached per video and language; repeated requests are
+    answered from the cache ("cache": {"status": "hit"}) without yt-dlp.
+    
+    Extraction runs on a bounded worker pool: a full queue answers 503 and
+    a job that takes too long answers 504.
+    
     Rate limit: 5 requests per minute.
     """
     try:
-        result = get_video_transcript(video, language=language)
-        return result
-        
+        return await _run_while_connected(request, get_transcript_pool().run(video, language))
+    
+    except TranscriptPoolFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": "10"}
+        )
+    except TranscriptTimeoutError as e:
+        raise HTTPException(
+            status_code=504,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=400,
@@ -47,4 +108,46 @@ async def get_transcript(
         )
 
 
+@router.post("/transcripts")
+@limiter.limit(YOUTUBE_RATE_LIMIT)
+async def get_transcripts(
+    request: Request,
+    body: TranscriptBatchRequest
+):
+    """
+    Get the transcripts of many videos in one call.
+    
+    Inputs are normalized to video IDs and deduplicated. Cached transcripts
+    are returned first; the rest are extracted concurrently on the worker
+    pool. Results are streamed as newline-delimited JSON, one line per
+    unique video, in completion order, each with a status (ok,
+    no_transcript, busy, timeout, error or invalid) and the transcript or
+    the error.
+    
+    Rate limit: 5 requests per minute.
+    """
+    async def stream():
+        async for result in extract_transcripts(body.videos, body.language):
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
+
+@router.get("/transcript/stats")
+async def get_transcript_stats():
+    """
+    Get the transcript worker pool's active and queued jobs and outcome counts.
+    """
+    return get_transcript_pool().stats()
+
+
+@router.get("/transcript/cookies")
+async def get_transcript_cookies():
+    """
+    Get the cookie source used for transcript extraction and whether it holds a valid login.
+    
+    session_valid is the result of the last authenticated request to
+    YouTube (None if not probed yet or the probe failed).
+    """
+    # The first call may resolve the source (browser stores need decryption)
+    return await asyncio.to_thread(get_cookie_manager().status)
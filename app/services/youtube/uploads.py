@@ -0,0 +1,319 @@
+"""
+Full upload history of a channel via its uploads playlist.
+
+The RSS feed only holds a channel's 15 newest videos. The uploads playlist
+("UU" + the channel ID without "UC") lists all of them, newest first, 50 per
+playlistItems page. Each channel's history is copied to SQLite:
+
+- The first call walks every page, saving and streaming each one as it
+  arrives; an interrupted walk resumes from the saved page token.
+- Later calls only read pages from the top until they reach a video that is
+  already stored (usually just the first page, revalidated with its ETag),
+  then answer the rest from the local copy.
+"""
+import json
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Set, Tuple, AsyncIterator
+
+import httpx
+
+from app.config import YOUTUBE_API_KEY, YOUTUBE_UPLOADS_DB_PATH
+from app.core.storage import open_database
+from app.services.youtube.data_api import api_get
+from app.services.youtube.rss_client import validate_channel_id
+
+logger = logging.getLogger(__name__)
+
+PLAYLIST_ITEMS_FIELDS = (
+    "nextPageToken,pageInfo/totalResults,"
+    "items(snippet(title,description,thumbnails/high/url),contentDetails(videoId,videoPublishedAt))"
+)
+
+
+class UploadHistoryStore:
+    """SQLite copy of channel upload histories and how far each one has been synced."""
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = open_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS channel_uploads ("
+            "channel_id TEXT NOT NULL, "
+            "video_id TEXT NOT NULL, "
+            "published TEXT NOT NULL, "
+            "data TEXT NOT NULL, "
+            "PRIMARY KEY (channel_id, video_id))"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS channel_uploads_published "
+            "ON channel_uploads (channel_id, published)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS upload_history ("
+            "channel_id TEXT PRIMARY KEY, "
+            "complete INTEGER NOT NULL, "
+            "backfill_token TEXT, "
+            "total INTEGER NOT NULL, "
+            "synced_at REAL NOT NULL)"
+        )
+    
+    def state(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """Return the sync state of a channel (complete, backfill_token, total, synced_at), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT complete, backfill_token, total, synced_at FROM upload_history WHERE channel_id = ?",
+                (channel_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"complete": bool(row[0]), "backfill_token": row[1], "total": row[2], "synced_at": row[3]}
+    
+    def known_ids(self, channel_id: str) -> Set[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT video_id FROM channel_uploads WHERE channel_id = ?", (channel_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+    
+    def videos(self, channel_id: str) -> List[Dict[str, Any]]:
+        """Return the stored uploads of a channel, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM channel_uploads WHERE channel_id = ? ORDER BY published DESC",
+                (channel_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def save(
+        self,
+        channel_id: str,
+        videos: List[Dict[str, Any]],
+        total: int,
+        complete: Optional[bool] = None,
+        backfill_token: Optional[str] = None
+    ) -> None:
+        """
+        Store videos and update the sync state in one transaction.
+        
+        complete=None keeps the current backfill state (a sync of new uploads).
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO channel_uploads (channel_id, video_id, published, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(channel_id, video["video_id"], video["published"], json.dumps(video)) for video in videos]
+                )
+                if complete is None:
+                    self._db.execute(
+                        "UPDATE upload_history SET total = ?, synced_at = ? WHERE channel_id = ?",
+                        (total, now, channel_id)
+                    )
+                else:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO upload_history "
+                        "(channel_id, complete, backfill_token, total, synced_at) VALUES (?, ?, ?, ?, ?)",
+                        (channel_id, int(complete), backfill_token, total, now)
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+
+_store: Optional[UploadHistoryStore] = None
+_store_lock = threading.Lock()
+
+# One sync per channel at a time, so concurrent callers do not fetch the same pages twice
+_sync_locks: Dict[str, asyncio.Lock] = {}
+
+
+def get_upload_store() -> UploadHistoryStore:
+    """Return the process-wide upload history store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = UploadHistoryStore(YOUTUBE_UPLOADS_DB_PATH)
+    return _store
+
+
+def uploads_playlist_id(channel_id: str) -> str:
+    """Return the ID of a channel's uploads playlist (UC... -> UU...)."""
+    return "UU" + channel_id[2:]
+
+
+def _parse_playlist_item(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert a playlistItems item to the response format; None for private or deleted videos."""
+    snippet = item.get("snippet", {})
+    content = item.get("contentDetails", {})
+    video_id = content.get("videoId")
+    published = content.get("videoPublishedAt")
+    if not video_id or not published:
+        return None
+    
+    return {
+        "video_id": video_id,
+        "title": snippet.get("title"),
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "published": published,
+        "description": snippet.get("description"),
+        "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url")
+    }
+
+
+async def _fetch_uploads_page(
+    channel_id: str,
+    page_token: Optional[str] = None,
+    ttl: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Fetch one page of a channel's uploads playlist.
+    
+    Raises:
+        ValueError: On API or connection errors
+    """
+    params = {
+        "part": "snippet,contentDetails",
+        "playlistId": uploads_playlist_id(channel_id),
+        "maxResults": 50,
+        "pageToken": page_token,
+        "fields": PLAYLIST_ITEMS_FIELDS
+    }
+    
+    try:
+        return await api_get("playlistItems", params, ttl=ttl, stale_ttl=0 if ttl == 0 else None)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            raise ValueError(f"Uploads playlist not found for channel: {channel_id}")
+        raise ValueError(f"YouTube API error: {e.response.status_code} - {e.response.text}")
+    except httpx.HTTPError as e:
+        raise ValueError(f"Failed to connect to YouTube API: {str(e)}")
+
+
+def _page_videos(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    videos = (_parse_playlist_item(item) for item in data.get("items") or [])
+    return [video for video in videos if video]
+
+
+async def _sync_new_uploads(channel_id: str, store: UploadHistoryStore) -> List[Dict[str, Any]]:
+    """
+    Fetch the uploads above the newest stored one and store them.
+    
+    Pages are read from the top until a stored video shows up. Every page is
+    revalidated: below the first one, page tokens repeat those cached during
+    the backfill, and a cached page would show stored videos too early and
+    hide newer uploads. New videos are saved only once the walk has
+    reached stored ones, so an interrupted sync never leaves a gap.
+    """
+    known = store.known_ids(channel_id)
+    new = []
+    page_token = None
+    total = 0
+    while True:
+        data = await _fetch_uploads_page(channel_id, page_token, ttl=0)
+        total = data.get("pageInfo", {}).get("totalResults", 0)
+        reached_known = False
+        for video in _page_videos(data):
+            if video["video_id"] in known:
+                reached_known = True
+                break
+            new.append(video)
+        page_token = data.get("nextPageToken")
+        if reached_known or not page_token:
+            break
+    
+    store.save(channel_id, new, total)
+    if new:
+        logger.info(f"Upload history for {channel_id}: {len(new)} new videos")
+    return new
+
+
+async def _backfill_page(
+    channel_id: str,
+    store: UploadHistoryStore,
+    page_token: Optional[str]
+) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+    """
+    Fetch and save the uploads playlist page at page_token (None: the top).
+    
+    If another caller moved the backfill on (or completed it) since
+    page_token was read, nothing is fetched: the stored videos are returned
+    with the saved page token, and the caller skips those already yielded.
+    
+    Returns:
+        Tuple of (videos, next page token, whether the history is complete)
+    """
+    state = store.state(channel_id)
+    if state and (state["complete"] or state["backfill_token"] != page_token):
+        return store.videos(channel_id), state["backfill_token"], state["complete"]
+    
+    data = await _fetch_uploads_page(channel_id, page_token)
+    videos = _page_videos(data)
+    page_token = data.get("nextPageToken")
+    store.save(
+        channel_id,
+        videos,
+        data.get("pageInfo", {}).get("totalResults", 0),
+        complete=not page_token,
+        backfill_token=page_token
+    )
+    if not page_token:
+        logger.info(f"Upload history for {channel_id} is complete")
+    return videos, page_token, not page_token
+
+
+async def iter_uploads(channel_id: str, limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield a channel's uploads, newest first.
+    
+    New uploads are fetched first, then the local copy is read, then a
+    history that has not been fully copied yet is fetched page by page.
+    
+    Args:
+        channel_id: YouTube channel ID (UC...)
+        limit: Stop after this many videos (all if None)
+    
+    Yields:
+        One dictionary per video (video_id, title, url, published,
+        description, thumbnail). Private and deleted videos are skipped.
+    
+    Raises:
+        ValueError: On an invalid channel ID, configuration, API or connection errors
+    """
+    channel_id = validate_channel_id(channel_id)
+    if not YOUTUBE_API_KEY:
+        raise ValueError("YOUTUBE_API_KEY is not configured")
+    
+    store = get_upload_store()
+    # The lock covers fetching and saving only, never a yield: a slow reader must not hold up the channel
+    lock = _sync_locks.setdefault(channel_id, asyncio.Lock())
+    yielded: Set[str] = set()
+    
+    async with lock:
+        state = store.state(channel_id)
+        new = await _sync_new_uploads(channel_id, store) if state else []
+        stored = store.videos(channel_id) if state else []
+    
+    pages = [new, stored]
+    complete = bool(state and state["complete"])
+    page_token = state["backfill_token"] if state else None
+    while True:
+        for videos in pages:
+            for video in videos:
+                if video["video_id"] in yielded:
+                    continue
+                yielded.add(video["video_id"])
+                yield video
+                if limit is not None and len(yielded) >= limit:
+                    return
+        if complete:
+            return
+        async with lock:
+            videos, page_token, complete = await _backfill_page(channel_id, store, page_token)
+        pages = [videos]
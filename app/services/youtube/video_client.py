@@ -0,0 +1,251 @@
+"""
+YouTube video details (duration, counts, live status) via the Data API.
+
+Videos are looked up with videos.list, 50 IDs per call, with the calls for a
+request running concurrently. Details are kept in an in-memory LRU for
+YOUTUBE_VIDEO_CACHE_TTL seconds, so a video asked for again (alone or in a
+different batch) costs no request.
+"""
+import re
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+import httpx
+
+from app.config import YOUTUBE_API_KEY, YOUTUBE_VIDEO_CACHE_TTL, YOUTUBE_VIDEO_CACHE_SIZE
+from app.services.youtube.data_api import api_get
+from app.services.youtube.transcript_client import extract_video_id
+
+logger = logging.getLogger(__name__)
+
+# videos.list accepts up to 50 IDs per call
+VIDEOS_BATCH_SIZE = 50
+
+VIDEO_PARTS = "snippet,contentDetails,statistics,liveStreamingDetails"
+
+DURATION_PATTERN = re.compile(
+    r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+
+
+class VideoDetailsCache:
+    """In-memory LRU of video details with a fixed TTL."""
+    
+    def __init__(self, size: int, ttl: int):
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._size = size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+    
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                return None
+            details, fetched_at = entry
+            if fetched_at + self._ttl <= time.time():
+                del self._entries[video_id]
+                return None
+            self._entries.move_to_end(video_id)
+            return dict(details)
+    
+    def set(self, video_id: str, details: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[video_id] = (details, time.time())
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+
+_cache = VideoDetailsCache(YOUTUBE_VIDEO_CACHE_SIZE, YOUTUBE_VIDEO_CACHE_TTL)
+
+
+def _parse_duration(duration: Optional[str]) -> Optional[int]:
+    """Convert an ISO 8601 duration ("PT1H2M3S") to seconds."""
+    if not duration:
+        return None
+    match = DURATION_PATTERN.match(duration)
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(part) if part else 0 for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def _int_or_none(value: Optional[str]) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+def _live_status(snippet: Dict[str, Any], live: Dict[str, Any]) -> str:
+    """Return "live", "upcoming", "was_live" or "none"."""
+    broadcast = snippet.get("liveBroadcastContent", "none")
+    if broadcast in ("live", "upcoming"):
+        return broadcast
+    if live.get("actualEndTime"):
+        return "was_live"
+    return "none"
+
+
+def _parse_video_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a videos.list item to the response format."""
+    video_id = item.get("id", "")
+    snippet = item.get("snippet", {})
+    content = item.get("contentDetails", {})
+    statistics = item.get("statistics", {})
+    live = item.get("liveStreamingDetails", {})
+    thumbnails = snippet.get("thumbnails", {})
+    thumbnail = next(
+        (thumbnails[size]["url"] for size in ("maxres", "high", "medium", "default") if size in thumbnails),
+        None
+    )
+    
+    return {
+        "video_id": video_id,
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "title": snippet.get("title"),
+        "channel_id": snippet.get("channelId"),
+        "channel_title": snippet.get("channelTitle"),
+        "published": snippet.get("publishedAt"),
+        "thumbnail": thumbnail,
+        "duration": content.get("duration"),
+        "duration_seconds": _parse_duration(content.get("duration")),
+        "definition": content.get("definition"),
+        "has_captions": content.get("caption") == "true",
+        "view_count": _int_or_none(statistics.get("viewCount")),
+        "like_count": _int_or_none(statistics.get("likeCount")),
+        "comment_count": _int_or_none(statistics.get("commentCount")),
+        "live_status": _live_status(snippet, live),
+        "scheduled_start": live.get("scheduledStartTime"),
+        "actual_start": live.get("actualStartTime"),
+        "actual_end": live.get("actualEndTime"),
+        "concurrent_viewers": _int_or_none(live.get("concurrentViewers"))
+    }
+
+
+async def _fetch_videos_batch(video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch up to 50 videos with one videos.list call and cache each of them."""
+    data = await api_get(
+        "videos",
+        {"part": VIDEO_PARTS, "id": ",".join(video_ids), "maxResults": VIDEOS_BATCH_SIZE},
+        # Videos are cached one by one below; the batch body is not worth storing
+        cache=False
+    )
+    found = {}
+    for item in data.get("items") or []:
+        details = _parse_video_item(item)
+        _cache.set(details["video_id"], details)
+        found[details["video_id"]] = details
+    return found
+
+
+async def _lookup_videos(video_ids: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Look up videos from the cache, then with concurrent batched calls.
+    
+    Returns:
+        Tuple of (details keyed by video ID, IDs whose batch failed).
+    
+    Raises:
+        ValueError: If YOUTUBE_API_KEY is not configured or every batch failed
+    """
+    if not YOUTUBE_API_KEY:
+        raise ValueError("YOUTUBE_API_KEY is not configured")
+    
+    details = {}
+    missing = []
+    for video_id in dict.fromkeys(video_ids):
+        cached = _cache.get(video_id)
+        if cached:
+            details[video_id] = cached
+        else:
+            missing.append(video_id)
+    
+    batches = [
+        missing[i:i + VIDEOS_BATCH_SIZE]
+        for i in range(0, len(missing), VIDEOS_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(
+        *(_fetch_videos_batch(batch) for batch in batches),
+        return_exceptions=True
+    )
+    
+    errors = []
+    failed = []
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Video details lookup failed for {len(batch)} videos: {result}")
+            errors.append(result)
+            failed.extend(batch)
+            continue
+        details.update(result)
+    
+    if errors and not details:
+        error = errors[0]
+        if isinstance(error, httpx.HTTPStatusError):
+            raise ValueError(f"YouTube API error: {error.response.status_code} - {error.response.text}")
+        raise ValueError(f"Failed to fetch video details: {str(error)}")
+    return details, failed
+
+
+async def get_video_details(video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get details for many videos, keyed by video ID.
+    
+    Cached videos are answered from memory; the rest are fetched with
+    concurrent videos.list calls of 50 IDs each.
+    
+    Args:
+        video_ids: 11-character video IDs
+    
+    Returns:
+        Details keyed by video ID. Videos that do not exist (or are private),
+        or whose batch failed, are missing.
+    
+    Raises:
+        ValueError: If YOUTUBE_API_KEY is not configured or no video could be fetched
+    """
+    details, _ = await _lookup_videos(video_ids)
+    return details
+
+
+async def get_videos(urls_or_ids: List[str]) -> Dict[str, Any]:
+    """
+    Look up details for a list of video URLs or IDs.
+    
+    Inputs are normalized with extract_video_id and deduplicated; the
+    response keeps the order of first appearance.
+    
+    Args:
+        urls_or_ids: YouTube video URLs (watch, youtu.be, shorts, live, embed) or IDs
+    
+    Returns:
+        Dictionary with the found videos, IDs not found, IDs whose lookup
+        failed and inputs that are not video URLs/IDs.
+    
+    Raises:
+        ValueError: If YOUTUBE_API_KEY is not configured or the API cannot be reached
+    """
+    video_ids = []
+    invalid = []
+    for value in urls_or_ids:
+        try:
+            video_ids.append(extract_video_id(value))
+        except ValueError:
+            invalid.append(value)
+    video_ids = list(dict.fromkeys(video_ids))
+    
+    details, failed = await _lookup_videos(video_ids) if video_ids else ({}, [])
+    
+    return {
+        "count": len(details),
+        "videos": [details[video_id] for video_id in video_ids if video_id in details],
+        "not_found": [
+            video_id for video_id in video_ids
+            if video_id not in details and video_id not in failed
+        ],
+        "failed": failed,
+        "invalid": invalid
+    }
@@ -0,0 +1,331 @@
+"""
+Background watcher for registered YouTube channels.
+
+Registered channels are polled through their RSS feed by a background task
+started with the application. Each channel is polled on its own schedule:
+the interval follows the channel's upload frequency (the median gap between
+the uploads in its feed), clamped to YOUTUBE_WATCHER_MIN/MAX_INTERVAL, backs
+off on errors, and is jittered so channels do not fall into lockstep.
+
+The latest video of every watched channel is kept in an in-memory index,
+persisted to SQLite, so /latest-video answers watched channels without a
+request. New uploads are posted to YOUTUBE_WATCHER_WEBHOOK_URL.
+"""
+import hmac
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from statistics import median
+from typing import Dict, Any, Optional, List, Callable
+
+import httpx
+
+from app.config import (
+    YOUTUBE_WATCHER_DB_PATH,
+    YOUTUBE_WATCHER_MIN_INTERVAL,
+    YOUTUBE_WATCHER_MAX_INTERVAL,
+    YOUTUBE_WATCHER_WEBHOOK_URL,
+    YOUTUBE_WATCHER_WEBHOOK_SECRET,
+    YOUTUBE_FEED_CONCURRENCY,
+)
+from app.core.http_client import get_http_client
+from app.core.storage import open_database
+from app.services.youtube.rss_client import get_channel_feed, published_sort_key, validate_channel_id
+
+logger = logging.getLogger(__name__)
+
+# Polls per typical gap between uploads
+POLLS_PER_UPLOAD = 24
+
+# Scheduled times are spread by up to this fraction of the interval
+JITTER = 0.1
+
+# Upper bound on how long the loop sleeps, so new channels are picked up
+MAX_SLEEP = 60
+
+WEBHOOK_ATTEMPTS = 3
+
+
+class WatcherStore:
+    """SQLite persistence of watched channels and their latest video."""
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = open_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS watched_channels ("
+            "channel_id TEXT PRIMARY KEY, "
+            "state TEXT NOT NULL)"
+        )
+    
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute("SELECT channel_id, state FROM watched_channels").fetchall()
+        return {row[0]: json.loads(row[1]) for row in rows}
+    
+    def save(self, channel_id: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watched_channels (channel_id, state) VALUES (?, ?)",
+                (channel_id, json.dumps(state))
+            )
+    
+    def delete(self, channel_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM watched_channels WHERE channel_id = ?", (channel_id,))
+
+
+def _jittered(interval: float) -> float:
+    return interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+def _upload_interval(videos: List[Dict[str, Any]]) -> float:
+    """Poll interval derived from the median gap between the feed's uploads."""
+    published = sorted(published_sort_key(video).timestamp() for video in videos if video.get("published"))
+    gaps = [later - earlier for earlier, later in zip(published, published[1:]) if later > earlier]
+    if not gaps:
+        return YOUTUBE_WATCHER_MAX_INTERVAL
+    interval = median(gaps) / POLLS_PER_UPLOAD
+    return max(YOUTUBE_WATCHER_MIN_INTERVAL, min(YOUTUBE_WATCHER_MAX_INTERVAL, interval))
+
+
+def _new_videos(videos: List[Dict[str, Any]], previous: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Videos above the previously latest one in a newest-first feed, oldest first."""
+    if previous is None:
+        return []
+    new = []
+    for video in videos:
+        if video["video_id"] == previous["video_id"]:
+            break
+        new.append(video)
+    else:
+        # Previous latest is no longer in the feed (deleted); fall back to publish times
+        cutoff = published_sort_key(previous)
+        new = [video for video in videos if published_sort_key(video) > cutoff]
+    return list(reversed(new))
+
+
+def _on_watcher_stopped(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Channel watcher stopped: {task.exception()}")
+
+
+class ChannelWatcher:
+    """Polls watched channels and keeps the latest-video index."""
+    
+    def __init__(self, store: WatcherStore):
+        self._store = store
+        self._channels: Dict[str, Dict[str, Any]] = store.load()
+        self._semaphore = asyncio.Semaphore(YOUTUBE_FEED_CONCURRENCY)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._background: set = set()
+        # Set by the WebSub manager: whether a channel's uploads are pushed
+        self.is_pushed: Callable[[str], bool] = lambda channel_id: False
+        
+        # Spread channels that became due while the service was down
+        now = time.time()
+        for state in self._channels.values():
+            if state["next_poll_at"] < now:
+                state["next_poll_at"] = now + random.uniform(0, MAX_SLEEP)
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self._task.add_done_callback(_on_watcher_stopped)
+            logger.info(f"Channel watcher started ({len(self._channels)} channels)")
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the poll loop is running (False if it was never started or has died)."""
+        return self._task is not None and not self._task.done()
+    
+    def add(self, channel_id: str) -> Dict[str, Any]:
+        """Register a channel; it is polled for the first time within a few seconds."""
+        channel_id = validate_channel_id(channel_id)
+        state = self._channels.get(channel_id)
+        if state is None:
+            state = {
+                "channel_id": channel_id,
+                "channel_title": None,
+                "latest_video": None,
+                "interval": YOUTUBE_WATCHER_MIN_INTERVAL,
+                "next_poll_at": time.time() + random.uniform(0, 5),
+                "last_polled_at": None,
+                "last_upload_detected_at": None,
+                "consecutive_errors": 0,
+                "last_error": None,
+                "added_at": time.time()
+            }
+            self._channels[channel_id] = state
+            self._store.save(channel_id, state)
+            self._wakeup.set()
+        return dict(state)
+    
+    def remove(self, channel_id: str) -> bool:
+        if self._channels.pop(channel_id, None) is None:
+            return False
+        self._store.delete(channel_id)
+        return True
+    
+    def get(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        state = self._channels.get(channel_id)
+        return dict(state) if state else None
+    
+    def latest(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """Indexed state of a watched channel, if the watcher is running and has polled it."""
+        state = self._channels.get(channel_id)
+        if not self.running or state is None or state["latest_video"] is None:
+            return None
+        return dict(state)
+    
+    def list(self) -> List[Dict[str, Any]]:
+        return [dict(state) for state in self._channels.values()]
+    
+    def record_videos(
+        self,
+        channel_id: str,
+        videos: List[Dict[str, Any]],
+        channel_title: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Update a watched channel's latest video from newest-first videos.
+        
+        Returns:
+            The videos that are new uploads (a webhook is sent for each).
+        """
+        state = self._channels.get(channel_id)
+        if state is None or not videos:
+            return []
+        
+        previous = state["latest_video"]
+        new = _new_videos(videos, previous)
+        if previous is None or new:
+            state["latest_video"] = videos[0]
+        if channel_title:
+            state["channel_title"] = channel_title
+        if new:
+            state["last_upload_detected_at"] = time.time()
+            for video in new:
+                self._send_webhook(state, video)
+        self._store.save(channel_id, state)
+        return new
+    
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            due = [cid for cid, state in self._channels.items() if state["next_poll_at"] <= now]
+            if due:
+                # _poll handles its own errors; return_exceptions keeps one bug from ending the loop
+                results = await asyncio.gather(
+                    *(self._poll(channel_id) for channel_id in due),
+                    return_exceptions=True
+                )
+                for channel_id, result in zip(due, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Watcher poll crashed for {channel_id}: {result}")
+            
+            upcoming = [state["next_poll_at"] for state in self._channels.values()]
+            delay = min(upcoming) - time.time() if upcoming else MAX_SLEEP
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.1, min(delay, MAX_SLEEP)))
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _poll(self, channel_id: str) -> None:
+        async with self._semaphore:
+            state = self._channels.get(channel_id)
+            if state is None:
+                return
+            try:
+                # max_age=0: always revalidate; an unchanged feed costs a 304
+                feed = await get_channel_feed(channel_id, max_videos=15, max_age=0)
+                # With a WebSub push subscription polling is only a safety net
+                interval = (
+                    YOUTUBE_WATCHER_MAX_INTERVAL if self.is_pushed(channel_id)
+                    else _upload_interval(feed["videos"])
+                )
+                self.record_videos(channel_id, feed["videos"], feed["channel_title"])
+            except Exception as e:
+                # Feed, index and store errors alike: back off and keep the other channels polling
+                state["consecutive_errors"] += 1
+                state["last_error"] = str(e)
+                state["interval"] = min(state["interval"] * 2, YOUTUBE_WATCHER_MAX_INTERVAL)
+                logger.warning(f"Watcher poll failed for {channel_id}: {e}")
+            else:
+                state["consecutive_errors"] = 0
+                state["last_error"] = None
+                state["interval"] = interval
+            
+            state["last_polled_at"] = time.time()
+            state["next_poll_at"] = state["last_polled_at"] + _jittered(state["interval"])
+            if channel_id in self._channels:
+                try:
+                    self._store.save(channel_id, state)
+                except Exception as e:
+                    logger.warning(f"Watcher could not save state for {channel_id}: {e}")
+    
+    def _send_webhook(self, state: Dict[str, Any], video: Dict[str, Any]) -> None:
+        if not YOUTUBE_WATCHER_WEBHOOK_URL:
+            return
+        payload = {
+            "event": "new_video",
+            "channel_id": state["channel_id"],
+            "channel_title": state["channel_title"],
+            "video": video
+        }
+        task = asyncio.create_task(_post_webhook(payload))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+async def _post_webhook(payload: Dict[str, Any]) -> None:
+    """POST a new-upload event, signed with YOUTUBE_WATCHER_WEBHOOK_SECRET if set."""
+    body = json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json"}
+    if YOUTUBE_WATCHER_WEBHOOK_SECRET:
+        signature = hmac.new(YOUTUBE_WATCHER_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        headers["X-Webhook-Signature"] = f"sha256={signature}"
+    
+    for attempt in range(WEBHOOK_ATTEMPTS):
+        try:
+            response = await get_http_client().post(YOUTUBE_WATCHER_WEBHOOK_URL, content=body, headers=headers)
+            response.raise_for_status()
+            return
+        except httpx.HTTPError as e:
+            logger.warning(f"Webhook delivery failed (attempt {attempt + 1}): {e}")
+            await asyncio.sleep(2 ** attempt)
+
+
+_watcher: Optional[ChannelWatcher] = None
+
+
+def get_watcher() -> ChannelWatcher:
+    """Return the process-wide watcher, loading watched channels on first use."""
+    global _watcher
+    if _watcher is None:
+        _watcher = ChannelWatcher(WatcherStore(YOUTUBE_WATCHER_DB_PATH))
+    return _watcher
+
+
+def start_watcher() -> None:
+    get_watcher().start()
+
+
+async def stop_watcher() -> None:
+    if _watcher is not None:
+        await _watcher.stop()
@@ -0,0 +1,407 @@
+"""
+WebSub (PubSubHubbub) push subscriptions for channel feeds.
+
+YouTube publishes every channel feed through a WebSub hub. Subscribing to a
+channel's topic makes the hub POST new and updated entries to our callback
+(/hooks/youtube/websub/{channel_id}/{token}) instead of us polling the feed:
+
+1. subscribe() POSTs hub.mode=subscribe with the callback, a per-subscription
+   secret and the requested lease. The callback carries a random
+   per-subscription token, since the callback needs no API key and the topic
+   is predictable; requests with a wrong token are refused.
+2. The hub verifies intent with a GET carrying hub.challenge, which is echoed
+   back only for subscriptions we actually requested. The granted lease is
+   capped at the one we asked for. A hub that refuses a subscription sends
+   hub.mode=denied instead; the subscription is marked "denied" and is not
+   requested again until subscribe() is called for it.
+3. Notifications are signed with X-Hub-Signature (HMAC of the body with the
+   secret); unsigned or mismatching bodies are ignored. Entries are parsed
+   with the RSS client's _parse_video_entry and handed to the watcher and
+   the feed cache.
+
+A background task renews subscriptions before their lease expires and
+retries ones the hub never verified.
+"""
+import hmac
+import time
+import secrets
+import asyncio
+import hashlib
+import logging
+import threading
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, Optional, List
+
+import httpx
+
+from app.config import (
+    YOUTUBE_WEBSUB_HUB_URL,
+    YOUTUBE_WEBSUB_CALLBACK_URL,
+    YOUTUBE_WEBSUB_LEASE_SECONDS,
+    YOUTUBE_WEBSUB_DB_PATH,
+)
+from app.core.http_client import get_http_client
+from app.core.storage import open_database
+from app.services.youtube.rss_client import (
+    NAMESPACES,
+    apply_pushed_videos,
+    validate_channel_id,
+    _get_text,
+    _parse_video_entry,
+)
+from app.services.youtube.watcher import get_watcher
+
+logger = logging.getLogger(__name__)
+
+TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
+
+# Renew when less than this fraction of the lease is left
+RENEW_AT_FRACTION = 0.2
+
+# Re-request subscriptions the hub has not verified after this many seconds
+PENDING_RETRY_AFTER = 3600
+
+RENEW_CHECK_INTERVAL = 300
+
+SIGNATURE_ALGORITHMS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+PENDING = "pending"
+SUBSCRIBED = "subscribed"
+UNSUBSCRIBING = "unsubscribing"
+DENIED = "denied"
+
+
+class WebSubStore:
+    """SQLite store of hub subscriptions."""
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = open_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS websub_subscriptions ("
+            "channel_id TEXT PRIMARY KEY, "
+            "topic TEXT NOT NULL, "
+            "secret TEXT NOT NULL, "
+            "state TEXT NOT NULL, "
+            "lease_seconds INTEGER, "
+            "requested_at REAL NOT NULL, "
+            "verified_at REAL, "
+            "expires_at REAL, "
+            "token TEXT)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(websub_subscriptions)")}
+        if "token" not in columns:
+            # Subscriptions stored before callback tokens get one on their next renewal
+            self._db.execute("ALTER TABLE websub_subscriptions ADD COLUMN token TEXT")
+    
+    def get(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT channel_id, topic, secret, state, lease_seconds, requested_at, verified_at, expires_at, token "
+                "FROM websub_subscriptions WHERE channel_id = ?",
+                (channel_id,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+    
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT channel_id, topic, secret, state, lease_seconds, requested_at, verified_at, expires_at, token "
+                "FROM websub_subscriptions"
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+    
+    def save(self, subscription: Dict[str, Any]) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO websub_subscriptions "
+                "(channel_id, topic, secret, state, lease_seconds, requested_at, verified_at, expires_at, token) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    subscription["channel_id"], subscription["topic"], subscription["secret"],
+                    subscription["state"], subscription["lease_seconds"], subscription["requested_at"],
+                    subscription["verified_at"], subscription["expires_at"], subscription["token"]
+                )
+            )
+    
+    def delete(self, channel_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM websub_subscriptions WHERE channel_id = ?", (channel_id,))
+    
+    @staticmethod
+    def _to_dict(row) -> Dict[str, Any]:
+        keys = (
+            "channel_id", "topic", "secret", "state", "lease_seconds",
+            "requested_at", "verified_at", "expires_at", "token"
+        )
+        return dict(zip(keys, row))
+
+
+class WebSubManager:
+    """Subscribes to channel topics, answers hub verification and ingests pushes."""
+    
+    def __init__(self, store: WebSubStore):
+        self._store = store
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._renew_loop())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def is_active(self, channel_id: str) -> bool:
+        """Whether a verified, unexpired subscription pushes this channel."""
+        subscription = self._store.get(channel_id)
+        return bool(
+            subscription
+            and subscription["state"] == SUBSCRIBED
+            and (subscription["expires_at"] or 0) > time.time()
+        )
+    
+    def list(self) -> List[Dict[str, Any]]:
+        return [_public(subscription) for subscription in self._store.all()]
+    
+    async def subscribe(self, channel_id: str) -> Dict[str, Any]:
+        """
+        Ask the hub to push a channel's feed to our callback.
+        
+        The subscription stays "pending" until the hub verifies it.
+        
+        Raises:
+            ValueError: If the callback URL is not configured or the hub refuses
+        """
+        channel_id = validate_channel_id(channel_id)
+        existing = self._store.get(channel_id)
+        subscription = {
+            "channel_id": channel_id,
+            "topic": TOPIC_URL.format(channel_id=channel_id),
+            # Keep the secret on renewal so in-flight notifications still verify
+            "secret": existing["secret"] if existing else secrets.token_hex(20),
+            "state": existing["state"] if existing and existing["state"] == SUBSCRIBED else PENDING,
+            "lease_seconds": existing["lease_seconds"] if existing else None,
+            "requested_at": time.time(),
+            "verified_at": existing["verified_at"] if existing else None,
+            "expires_at": existing["expires_at"] if existing else None,
+            "token": existing["token"] if existing and existing["token"] else secrets.token_urlsafe(24)
+        }
+        self._store.save(subscription)
+        await self._request(subscription, "subscribe")
+        return _public(subscription)
+    
+    async def unsubscribe(self, channel_id: str) -> bool:
+        """
+        Ask the hub to stop pushing a channel. Returns False if it was not subscribed.
+        
+        Raises:
+            ValueError: If the callback URL is not configured or the hub refuses
+        """
+        subscription = self._store.get(channel_id)
+        if subscription is None:
+            return False
+        previous_state = subscription["state"]
+        # Saved first: the hub may verify before its response to the request arrives
+        subscription["state"] = UNSUBSCRIBING
+        self._store.save(subscription)
+        try:
+            await self._request(subscription, "unsubscribe")
+        except ValueError:
+            subscription["state"] = previous_state
+            self._store.save(subscription)
+            raise
+        return True
+    
+    async def _request(self, subscription: Dict[str, Any], mode: str) -> None:
+        if not YOUTUBE_WEBSUB_CALLBACK_URL:
+            raise ValueError("YOUTUBE_WEBSUB_CALLBACK_URL is not configured")
+        
+        data = {
+            "hub.mode": mode,
+            "hub.topic": subscription["topic"],
+            "hub.callback": (
+                f"{YOUTUBE_WEBSUB_CALLBACK_URL.rstrip('/')}/{subscription['channel_id']}/{subscription['token']}"
+            ),
+            "hub.verify": "async",
+        }
+        if mode == "subscribe":
+            data["hub.secret"] = subscription["secret"]
+            data["hub.lease_seconds"] = str(YOUTUBE_WEBSUB_LEASE_SECONDS)
+        
+        try:
+            response = await get_http_client().post(YOUTUBE_WEBSUB_HUB_URL, data=data)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise ValueError(f"WebSub hub refused {mode}: {e.response.status_code} - {e.response.text}")
+        except httpx.HTTPError as e:
+            raise ValueError(f"Failed to connect to WebSub hub: {str(e)}")
+        logger.info(f"WebSub {mode} requested for {subscription['channel_id']}")
+    
+    def _find(self, channel_id: str, token: str) -> Optional[Dict[str, Any]]:
+        """Return the subscription a callback request is for, or None if the token does not match."""
+        subscription = self._store.get(channel_id)
+        if subscription is None or not subscription["token"]:
+            return None
+        if not hmac.compare_digest(subscription["token"], token):
+            return None
+        return subscription
+    
+    def verify(
+        self,
+        channel_id: str,
+        token: str,
+        mode: str,
+        topic: str,
+        lease_seconds: Optional[int],
+        reason: Optional[str] = None
+    ) -> bool:
+        """
+        Check a hub verification (or denial) request against what we asked for.
+        
+        Returns:
+            True if the request is for one of our subscriptions (the
+            challenge, if any, should be echoed back).
+        """
+        subscription = self._find(channel_id, token)
+        if subscription is None or subscription["topic"] != topic:
+            return False
+        
+        if mode == "subscribe" and subscription["state"] in (PENDING, SUBSCRIBED):
+            now = time.time()
+            # Never trust a longer lease than we asked for: renewal is scheduled from it
+            lease = min(lease_seconds or YOUTUBE_WEBSUB_LEASE_SECONDS, YOUTUBE_WEBSUB_LEASE_SECONDS)
+            subscription.update(
+                state=SUBSCRIBED,
+                lease_seconds=lease,
+                verified_at=now,
+                expires_at=now + lease
+            )
+            self._store.save(subscription)
+            logger.info(f"WebSub subscription verified for {channel_id} (lease {lease}s)")
+            return True
+        
+        if mode == "denied" and subscription["state"] in (PENDING, SUBSCRIBED):
+            subscription["state"] = DENIED
+            self._store.save(subscription)
+            logger.warning(f"WebSub subscription denied for {channel_id}: {reason or 'no reason given'}")
+            return True
+        
+        if mode == "unsubscribe" and subscription["state"] == UNSUBSCRIBING:
+            self._store.delete(channel_id)
+            logger.info(f"WebSub unsubscription verified for {channel_id}")
+            return True
+        
+        return False
+    
+    def handle_notification(self, channel_id: str, token: str, body: bytes, signature: Optional[str]) -> int:
+        """
+        Verify and ingest a pushed feed.
+        
+        Returns:
+            Number of video entries ingested (0 if the notification was ignored).
+        """
+        subscription = self._find(channel_id, token)
+        if subscription is None:
+            logger.warning(f"WebSub notification for unknown subscription {channel_id}")
+            return 0
+        if not _valid_signature(subscription["secret"], body, signature):
+            logger.warning(f"WebSub notification for {channel_id} ignored: bad signature")
+            return 0
+        
+        try:
+            root = ET.fromstring(body)
+        except ET.ParseError as e:
+            logger.warning(f"WebSub notification for {channel_id} is not valid XML: {e}")
+            return 0
+        
+        videos = []
+        for entry in root.findall("atom:entry", NAMESPACES):
+            # Pushes are per topic; ignore entries for other channels
+            entry_channel = _get_text(entry, "yt:channelId")
+            if entry_channel and entry_channel != channel_id:
+                continue
+            video = _parse_video_entry(entry)
+            if video and video["video_id"]:
+                videos.append(video)
+        
+        if videos:
+            apply_pushed_videos(channel_id, videos)
+            new = get_watcher().record_videos(channel_id, videos, _get_text(root, "atom:title"))
+            logger.info(f"WebSub push for {channel_id}: {len(videos)} entries, {len(new)} new")
+        return len(videos)
+    
+    async def _renew_loop(self) -> None:
+        while True:
+            now = time.time()
+            for subscription in self._store.all():
+                if _needs_renewal(subscription, now):
+                    try:
+                        await self.subscribe(subscription["channel_id"])
+                    except ValueError as e:
+                        logger.warning(f"WebSub renewal failed for {subscription['channel_id']}: {e}")
+            await asyncio.sleep(RENEW_CHECK_INTERVAL)
+
+
+def _needs_renewal(subscription: Dict[str, Any], now: float) -> bool:
+    if subscription["state"] in (PENDING, SUBSCRIBED) and not subscription["token"]:
+        # Stored before callback tokens: resubscribe with a tokened callback
+        return True
+    awaiting_verification = subscription["requested_at"] > (subscription["verified_at"] or 0)
+    if awaiting_verification and now - subscription["requested_at"] < PENDING_RETRY_AFTER:
+        # A renewal the hub has not verified yet: give it time before asking again
+        return False
+    if subscription["state"] == SUBSCRIBED:
+        lease = subscription["lease_seconds"] or YOUTUBE_WEBSUB_LEASE_SECONDS
+        return (subscription["expires_at"] or 0) - now < lease * RENEW_AT_FRACTION
+    if subscription["state"] == PENDING:
+        return now - subscription["requested_at"] > PENDING_RETRY_AFTER
+    return False
+
+
+def _valid_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check an X-Hub-Signature header ("sha1=<hex>", or another SHA-2 algorithm)."""
+    if not signature or "=" not in signature:
+        return False
+    algorithm, _, digest = signature.partition("=")
+    hash_function = SIGNATURE_ALGORITHMS.get(algorithm.lower())
+    if hash_function is None:
+        return False
+    expected = hmac.new(secret.encode(), body, hash_function).hexdigest()
+    return hmac.compare_digest(expected, digest.strip().lower())
+
+
+def _public(subscription: Dict[str, Any]) -> Dict[str, Any]:
+    """Subscription as reported by the API (without its secret and callback token)."""
+    return {key: value for key, value in subscription.items() if key not in ("secret", "token")}
+
+
+_manager: Optional[WebSubManager] = None
+
+
+def get_websub_manager() -> WebSubManager:
+    """Return the process-wide WebSub manager, opening its store on first use."""
+    global _manager
+    if _manager is None:
+        _manager = WebSubManager(WebSubStore(YOUTUBE_WEBSUB_DB_PATH))
+        get_watcher().is_pushed = _manager.is_active
+    return _manager
+
+
+def start_websub() -> None:
+    get_websub_manager().start()
+
+
+async def stop_websub() -> None:
+    if _manager is not None:
+        await _manager.stop()
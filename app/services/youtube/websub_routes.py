@@ -0,0 +1,141 @@
+"""
+YouTube WebSub routes: push subscription management and the hub callback.
+"""
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+from app.services.youtube.rss_client import validate_channel_id
+from app.services.youtube.watcher import get_watcher
+from app.services.youtube.websub import get_websub_manager
+
+# Mounted under /api (requires the API key)
+router = APIRouter()
+
+# Mounted under /hooks/youtube; the hub cannot send our API key
+callback_router = APIRouter()
+
+MAX_WEBSUB_CHANNELS = 1000
+
+
+class WebSubRequest(BaseModel):
+    channel_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_WEBSUB_CHANNELS,
+        description="YouTube channel IDs (UC...) to receive pushes for"
+    )
+
+
+@router.post("/websub/subscriptions")
+async def subscribe_channels(body: WebSubRequest):
+    """
+    Subscribe to push notifications for channels.
+    
+    Each channel is also registered with the watcher, whose index and
+    webhook pushes are delivered to. Subscriptions are "pending" until the
+    hub verifies them, and are renewed automatically before the lease expires.
+    """
+    try:
+        channel_ids = [validate_channel_id(channel_id) for channel_id in body.channel_ids]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    manager = get_websub_manager()
+    results = await asyncio.gather(
+        *(manager.subscribe(channel_id) for channel_id in channel_ids),
+        return_exceptions=True
+    )
+    
+    subscriptions = []
+    errors = []
+    for channel_id, result in zip(channel_ids, results):
+        if isinstance(result, Exception):
+            errors.append({"channel_id": channel_id, "error": str(result)})
+            continue
+        get_watcher().add(channel_id)
+        subscriptions.append(result)
+    
+    if errors and not subscriptions:
+        raise HTTPException(
+            status_code=502,
+            detail=errors[0]["error"]
+        )
+    return {"count": len(subscriptions), "subscriptions": subscriptions, "errors": errors}
+
+
+@router.get("/websub/subscriptions")
+async def list_subscriptions():
+    """
+    List push subscriptions with their state and lease expiry.
+    """
+    subscriptions = get_websub_manager().list()
+    return {"count": len(subscriptions), "subscriptions": subscriptions}
+
+
+@router.delete("/websub/subscriptions/{channel_id}")
+async def unsubscribe_channel(channel_id: str):
+    """
+    Stop push notifications for a channel. The channel stays watched.
+    """
+    try:
+        removed = await get_websub_manager().unsubscribe(channel_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=502,
+            detail=str(e)
+        )
+    if not removed:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No push subscription for channel: {channel_id}"
+        )
+    return {"channel_id": channel_id, "unsubscribing": True}
+
+
+@callback_router.get("/websub/{channel_id}/{token}")
+async def verify_subscription(
+    channel_id: str,
+    token: str,
+    mode: str = Query(..., alias="hub.mode"),
+    topic: str = Query(..., alias="hub.topic"),
+    challenge: Optional[str] = Query(default=None, alias="hub.challenge"),
+    lease_seconds: Optional[int] = Query(default=None, alias="hub.lease_seconds"),
+    reason: Optional[str] = Query(default=None, alias="hub.reason")
+):
+    """
+    Answer the hub's intent verification by echoing the challenge.
+    
+    A denial (hub.mode=denied, no challenge) is acknowledged with an empty body.
+    """
+    if mode != "denied" and challenge is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing hub.challenge"
+        )
+    if not get_websub_manager().verify(channel_id, token, mode, topic, lease_seconds, reason):
+        raise HTTPException(
+            status_code=404,
+            detail="Unknown subscription"
+        )
+    return PlainTextResponse(challenge or "")
+
+
+@callback_router.post("/websub/{channel_id}/{token}")
+async def receive_notification(channel_id: str, token: str, request: Request):
+    """
+    Receive a pushed feed from the hub.
+    
+    Always answers 204: notifications with a bad token or signature are
+    dropped silently, as the WebSub spec requires.
+    """
+    body = await request.body()
+    get_websub_manager().handle_notification(
+        channel_id, token, body, request.headers.get("X-Hub-Signature")
+    )
+    return Response(status_code=204)
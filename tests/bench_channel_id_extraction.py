@@ -0,0 +1,190 @@
+"""
+Microbenchmark for channel ID extraction from saved YouTube channel pages.
+
+Compares the current extractor (targeted regexes + JSONDecoder.raw_decode)
+with the previous implementation (character-by-character brace matching,
+full json.loads and a recursive walk into a list).
+
+Usage:
+    python tests/bench_channel_id_extraction.py --save-test-channels 5
+    python tests/bench_channel_id_extraction.py --save https://www.youtube.com/@Fireship
+    python tests/bench_channel_id_extraction.py
+    python tests/bench_channel_id_extraction.py page1.html page2.html --runs 50
+
+Saved pages go to tests/channel_pages/ (fetched with the same plain HTTP
+session the resolver uses). --save-test-channels saves the handle page of
+the first N channels in youtube_test_channels.json and the /channel/UC...
+page each one resolves to. Visitor and session identifiers are blanked
+before saving, so the pages can be committed as fixtures;
+test_channel_id_extraction.py checks both extractors agree on them.
+
+Exits with status 1 if the extractors disagree on any page.
+"""
+
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.youtube import client
+
+PAGES_DIR = Path(__file__).parent / "channel_pages"
+TEST_CHANNELS_FILE = Path(__file__).parent / "youtube_test_channels.json"
+
+# Per-visitor values in the page config; blanked so saved pages carry no session
+VISITOR_FIELDS = re.compile(r'"(visitorData|VISITOR_DATA|EOM_VISITOR_DATA|DELEGATED_SESSION_ID|ID_TOKEN)":"[^"]*"')
+
+
+def legacy_extract_json_object(html, start_marker):
+    """Previous brace-counting scanner."""
+    marker_pos = html.find(start_marker)
+    if marker_pos == -1:
+        return None
+    brace_start = html.find("{", marker_pos)
+    if brace_start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escape_next = False
+    for i, char in enumerate(html[brace_start:], start=brace_start):
+        if escape_next:
+            escape_next = False
+            continue
+        if char == "\\":
+            escape_next = True
+            continue
+        if char == '"' and not escape_next:
+            in_string = not in_string
+            continue
+        if in_string:
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return html[brace_start:i + 1]
+    return None
+
+
+def legacy_find_channel_ids(obj, ids):
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key == "channelId" and isinstance(value, str) and client._is_valid_channel_id(value):
+                ids.append(value)
+            legacy_find_channel_ids(value, ids)
+    elif isinstance(obj, list):
+        for item in obj:
+            legacy_find_channel_ids(item, ids)
+
+
+def legacy_extract_channel_id(html):
+    """Previous _extract_channel_id_from_json."""
+    json_str = legacy_extract_json_object(html, "ytInitialData")
+    if not json_str:
+        json_str = legacy_extract_json_object(html, "ytInitialPlayerResponse")
+    if not json_str:
+        return None
+    try:
+        data = json.loads(json_str)
+    except json.JSONDecodeError:
+        return None
+    for path in client.PRIORITY_CHANNEL_ID_PATHS:
+        channel_id = client._get_nested_value(data, path)
+        if channel_id and client._is_valid_channel_id(channel_id):
+            return channel_id
+    all_ids = []
+    legacy_find_channel_ids(data, all_ids)
+    if all_ids:
+        return Counter(all_ids).most_common(1)[0][0]
+    return None
+
+
+def anonymise(html):
+    return VISITOR_FIELDS.sub(lambda match: f'"{match.group(1)}":""', html)
+
+
+def save_pages(urls):
+    """Fetch channel pages over plain HTTP and store them, anonymised, for benchmarking."""
+    PAGES_DIR.mkdir(exist_ok=True)
+    saved = []
+    for url in urls:
+        html = anonymise(asyncio.run(client._fetch_channel_page_http(url)))
+        name = re.sub(r"[^A-Za-z0-9@_-]+", "_", url.split("youtube.com/")[-1]).strip("_")
+        path = PAGES_DIR / f"{name or 'page'}.html"
+        path.write_text(html, encoding="utf-8")
+        print(f"Saved {url} -> {path} ({len(html):,} chars)")
+        saved.append(html)
+    return saved
+
+
+def save_test_channels(count):
+    """Save the handle pages of the first test channels and the channel pages they resolve to."""
+    data = json.loads(TEST_CHANNELS_FILE.read_text(encoding="utf-8"))
+    urls = [channel["account_url"] for channel in data["for_update"]["data"][:count]]
+    channel_urls = []
+    for html in save_pages(urls):
+        channel_id = client._extract_channel_id_from_json(html)
+        if channel_id:
+            channel_urls.append(f"https://www.youtube.com/channel/{channel_id}")
+    save_pages(channel_urls)
+
+
+def time_it(func, html, runs):
+    started = time.perf_counter()
+    for _ in range(runs):
+        result = func(html)
+    return (time.perf_counter() - started) / runs * 1000, result
+
+
+def run(paths, runs):
+    """Print timings per page; return the number of pages the extractors disagree on."""
+    print(f"{'Page':<32} {'Size':>10} {'Legacy ms':>10} {'New ms':>10} {'Speedup':>8}  Match")
+    print("-" * 84)
+    mismatches = 0
+    for path in paths:
+        html = Path(path).read_text(encoding="utf-8")
+        legacy_ms, legacy_id = time_it(legacy_extract_channel_id, html, runs)
+        new_ms, new_id = time_it(client._extract_channel_id_from_json, html, runs)
+        speedup = legacy_ms / new_ms if new_ms else float("inf")
+        mismatches += legacy_id != new_id
+        print(
+            f"{Path(path).name[:32]:<32} {len(html):>10,} {legacy_ms:>10.2f} {new_ms:>10.3f} "
+            f"{speedup:>7.0f}x  {'yes' if legacy_id == new_id else f'NO ({legacy_id} vs {new_id})'}"
+        )
+    return mismatches
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="Saved HTML pages (default: tests/channel_pages/*.html)")
+    parser.add_argument("--save", nargs="+", metavar="URL", help="Fetch and save channel pages first")
+    parser.add_argument(
+        "--save-test-channels", type=int, metavar="N",
+        help="Fetch and save the handle and channel pages of the first N test channels first"
+    )
+    parser.add_argument("--runs", type=int, default=20, help="Runs per page (default: 20)")
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages(args.save)
+    if args.save_test_channels:
+        save_test_channels(args.save_test_channels)
+
+    pages = args.pages or sorted(str(p) for p in PAGES_DIR.glob("*.html"))
+    if not pages:
+        print("❌ No saved pages. Run with --save URL first or pass HTML files.")
+        sys.exit(1)
+
+    if run(pages, args.runs):
+        print("❌ The extractors disagree on some pages")
+        sys.exit(1)
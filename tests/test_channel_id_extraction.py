@@ -0,0 +1,35 @@
+"""
+Unit tests: the channel ID extractor agrees with the previous implementation
+on saved channel pages (no server or network needed).
+
+Pages are saved to tests/channel_pages/ with
+python tests/bench_channel_id_extraction.py --save-test-channels 5
+
+Run with: python -m pytest tests/test_channel_id_extraction.py
+"""
+from pathlib import Path
+
+import pytest
+
+from app.services.youtube import client
+from bench_channel_id_extraction import PAGES_DIR, anonymise, legacy_extract_channel_id
+
+PAGES = sorted(PAGES_DIR.glob("*.html"))
+
+
+@pytest.mark.skipif(not PAGES, reason="no saved channel pages in tests/channel_pages")
+@pytest.mark.parametrize("path", PAGES, ids=lambda path: path.name)
+def test_extractors_agree_on_saved_page(path: Path):
+    html = path.read_text(encoding="utf-8")
+    channel_id = client._extract_channel_id_from_json(html)
+    
+    assert channel_id is not None and client._is_valid_channel_id(channel_id)
+    assert channel_id == legacy_extract_channel_id(html)
+    if path.name.startswith("channel_"):
+        # /channel/UC... pages resolve to the ID in their URL
+        assert path.stem == f"channel_{channel_id}"
+
+
+def test_anonymise_blanks_visitor_data():
+    html = '{"visitorData":"CgtBQkNERUZHSElKSw%3D%3D","channelId":"UCsBjURrPoezykLs9EqgamOA"}'
+    assert anonymise(html) == '{"visitorData":"","channelId":"UCsBjURrPoezykLs9EqgamOA"}'
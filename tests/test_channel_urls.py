@@ -0,0 +1,29 @@
+"""
+Unit tests for channel URL normalization (no server or network needed).
+
+Run with: python -m pytest tests/test_channel_urls.py
+"""
+import pytest
+
+from app.services.youtube.client import normalize_channel_url
+
+
+@pytest.mark.parametrize("url, key", [
+    ("@MrBeast", "handle:@mrbeast"),
+    ("youtube.com/@MrBeast", "handle:@mrbeast"),
+    ("https://m.youtube.com/@MrBeast/videos", "handle:@mrbeast"),
+    ("https://www.youtube.com/channel/UCX6OQ3DkcsbYNE6H8uQQuVA", "channel:UCX6OQ3DkcsbYNE6H8uQQuVA"),
+    ("https://youtu.be/dQw4w9WgXcQ", "video:dQw4w9WgXcQ"),
+])
+def test_normalize_youtube_urls(url, key):
+    assert normalize_channel_url(url) == key
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/@MrBeast",
+    "https://youtube.com.example.com/@MrBeast",
+    "https://example.com/?u=youtube.com/@MrBeast",
+])
+def test_normalize_rejects_other_hosts(url):
+    with pytest.raises(ValueError):
+        normalize_channel_url(url)
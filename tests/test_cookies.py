@@ -0,0 +1,144 @@
+"""
+Unit tests for the shared cookie jar and its sync with the cookie file (no server or network needed).
+
+Run with: python -m pytest tests/test_cookies.py
+"""
+import os
+import time
+import http.cookiejar
+
+import httpx
+import pytest
+
+from app.services.youtube import cookies as cookies_module
+from app.services.youtube.cookies import CookieManager
+
+COOKIE_LINE = ".youtube.com\tTRUE\t/\tTRUE\t{expires}\t{name}\t{value}\n"
+
+
+def _write_cookie_file(path, cookies) -> None:
+    lines = ["# Netscape HTTP Cookie File\n"]
+    lines += [COOKIE_LINE.format(expires=expires, name=name, value=value) for name, value, expires in cookies]
+    path.write_text("".join(lines))
+
+
+def _cookie(name: str, value: str, expires: int) -> http.cookiejar.Cookie:
+    return http.cookiejar.Cookie(
+        0, name, value, None, False, ".youtube.com", True, True, "/", True,
+        True, expires, False, None, None, {}
+    )
+
+
+def _values(manager: CookieManager) -> dict:
+    return {cookie.name: cookie.value for cookie in manager.jar()}
+
+
+@pytest.fixture
+def cookie_file(tmp_path, monkeypatch):
+    path = tmp_path / "cookies.txt"
+    _write_cookie_file(path, [("SAPISID", "one", int(time.time()) + 3600), ("PREF", "a", 0)])
+    monkeypatch.setattr(cookies_module, "YOUTUBE_COOKIES_PATH", str(path))
+    return path
+
+
+def test_resolve_loads_file_once(cookie_file):
+    manager = CookieManager()
+    jar = manager.jar()
+    
+    assert manager.status()["source"] == f"file: {cookie_file}"
+    assert _values(manager)["SAPISID"] == "one"
+    assert manager.jar() is jar
+
+
+def test_sync_writes_changed_cookies_back(cookie_file):
+    manager = CookieManager()
+    manager.jar().set_cookie(_cookie("SAPISID", "two", int(time.time()) + 3600))
+    manager.sync()
+    
+    assert "\tSAPISID\ttwo" in cookie_file.read_text()
+    
+    # Nothing changed since: the file is not rewritten
+    mtime = os.path.getmtime(cookie_file)
+    os.utime(cookie_file, (mtime, mtime))
+    manager.sync()
+    assert os.path.getmtime(cookie_file) == mtime
+
+
+def test_sync_reloads_replaced_file_into_same_jar(cookie_file):
+    manager = CookieManager()
+    jar = manager.jar()
+    _write_cookie_file(cookie_file, [("SAPISID", "external", int(time.time()) + 3600)])
+    os.utime(cookie_file, (time.time() + 10, time.time() + 10))
+    manager.sync()
+    
+    assert manager.jar() is jar
+    assert _values(manager) == {"SAPISID": "external"}
+
+
+def test_check_requires_unexpired_login_cookie(cookie_file):
+    manager = CookieManager()
+    manager.resolve()
+    assert manager.check()["authenticated"]
+    
+    _write_cookie_file(cookie_file, [("SAPISID", "old", int(time.time()) - 60)])
+    os.utime(cookie_file, (time.time() + 10, time.time() + 10))
+    manager.sync()
+    assert not manager.check()["authenticated"]
+
+
+def _account_page(monkeypatch, handler):
+    """Answer the session probe with handler instead of YouTube."""
+    class ProbeClient(httpx.Client):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+    
+    monkeypatch.setattr(cookies_module.httpx, "Client", ProbeClient)
+
+
+def test_probe_accepts_signed_in_session(cookie_file, monkeypatch):
+    requests = []
+    
+    def signed_in(request):
+        requests.append(request)
+        return httpx.Response(200, text='<script>ytcfg.set({"LOGGED_IN":true})</script>')
+    
+    _account_page(monkeypatch, signed_in)
+    manager = CookieManager()
+    manager.resolve()
+    status = manager.check(probe=True)
+    
+    assert status["authenticated"] and status["session_valid"] is True
+    assert "SAPISID=one" in requests[0].headers["Cookie"]
+
+
+@pytest.mark.parametrize("response", [
+    httpx.Response(303, headers={"Location": "https://accounts.google.com/ServiceLogin"}),
+    httpx.Response(200, text='<script>ytcfg.set({"LOGGED_IN":false})</script>'),
+])
+def test_probe_detects_revoked_session(cookie_file, monkeypatch, response):
+    _account_page(monkeypatch, lambda request: response)
+    manager = CookieManager()
+    manager.resolve()
+    
+    # The cookies themselves look fine: present and unexpired
+    assert manager.check()["authenticated"]
+    
+    status = manager.check(probe=True)
+    assert status["session_valid"] is False
+    assert not status["authenticated"]
+    # The result is kept until the next probe
+    assert manager.status()["session_valid"] is False
+    assert not manager.check()["authenticated"]
+
+
+def test_failed_probe_is_inconclusive(cookie_file, monkeypatch):
+    def unreachable(request):
+        raise httpx.ConnectError("no route to host")
+    
+    _account_page(monkeypatch, unreachable)
+    manager = CookieManager()
+    manager.resolve()
+    status = manager.check(probe=True)
+    
+    assert status["session_valid"] is None
+    assert status["authenticated"]
@@ -0,0 +1,25 @@
+"""
+Unit tests for the Data API response store (no server or network needed).
+
+Run with: python -m pytest tests/test_data_api.py
+"""
+from app.services.youtube.data_api import ResponseStore, request_key
+
+
+def test_request_key_ignores_api_key_and_order():
+    assert request_key("videos", {"id": "a", "part": "snippet", "key": "secret"}) == \
+        request_key("videos", {"part": "snippet", "id": "a"})
+
+
+def test_prune_deletes_only_expired_responses(tmp_path):
+    store = ResponseStore(str(tmp_path / "api.db"))
+    store.set("old", "subscriptions", None, "{}")
+    store.set("new", "subscriptions", None, "{}")
+    store.set("channel", "channels", None, "{}")
+    store._db.execute("UPDATE api_responses SET fetched_at = fetched_at - 1000 WHERE key != 'new'")
+    
+    store.prune(lambda endpoint: 5000 if endpoint == "channels" else 500)
+    
+    assert store.get("old") is None
+    assert store.get("new") is not None
+    assert store.get("channel") is not None
@@ -0,0 +1,155 @@
+"""
+Unit tests for the RSS feed cache and its revalidation (no server or network needed).
+
+Run with: python -m pytest tests/test_feed_cache.py
+"""
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.youtube import rss_client
+from app.services.youtube.rss_client import (
+    CachedFeed,
+    FeedCache,
+    FeedNotFoundError,
+    apply_pushed_videos,
+    get_channel_feed,
+    YOUTUBE_FEED_CACHE_TTL,
+    YOUTUBE_FEED_STALE_TTL,
+)
+
+CHANNEL_ID = "UCaaaaaaaaaaaaaaaaaaaaaa"
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+ <title>Channel</title>
+ <entry>
+  <yt:videoId>video000001</yt:videoId>
+  <title>First</title>
+  <published>2025-01-01T00:00:00+00:00</published>
+ </entry>
+</feed>
+"""
+
+
+class FakeYouTube:
+    """Answers feed requests with the queued status codes and records the requests."""
+    
+    def __init__(self):
+        self.statuses = []
+        self.requests = []
+    
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status == 200:
+            return httpx.Response(200, content=FEED, headers={"ETag": '"v1"'})
+        return httpx.Response(status)
+
+
+@pytest.fixture
+def youtube(monkeypatch):
+    fake = FakeYouTube()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handle))
+    monkeypatch.setattr(rss_client, "get_http_client", lambda: client)
+    monkeypatch.setattr(rss_client, "_feed_cache", FeedCache(10))
+    return fake
+
+
+def _age_cache(seconds: float) -> None:
+    entry = rss_client._feed_cache.get(CHANNEL_ID)
+    rss_client._feed_cache.set(CHANNEL_ID, entry._replace(fetched_at=time.time() - seconds))
+
+
+def test_miss_then_hit(youtube):
+    async def run():
+        first = await get_channel_feed(CHANNEL_ID)
+        second = await get_channel_feed(CHANNEL_ID)
+        return first, second
+    
+    first, second = asyncio.run(run())
+    assert first["cache"]["status"] == "miss"
+    assert second["cache"]["status"] == "hit"
+    assert second["latest_video"]["video_id"] == "video000001"
+    assert len(youtube.requests) == 1
+
+
+def test_max_age_zero_revalidates_conditionally(youtube):
+    youtube.statuses = [200, 304]
+    
+    async def run():
+        await get_channel_feed(CHANNEL_ID)
+        return await get_channel_feed(CHANNEL_ID, max_age=0)
+    
+    result = asyncio.run(run())
+    assert result["cache"]["status"] == "revalidated"
+    assert result["latest_video"]["video_id"] == "video000001"
+    assert youtube.requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_stale_feed_is_served_while_refreshing(youtube):
+    youtube.statuses = [200, 304]
+    
+    async def run():
+        await get_channel_feed(CHANNEL_ID)
+        _age_cache(YOUTUBE_FEED_CACHE_TTL + 1)
+        result = await get_channel_feed(CHANNEL_ID)
+        await asyncio.gather(*rss_client._inflight.values())
+        return result
+    
+    result = asyncio.run(run())
+    assert result["cache"]["status"] == "stale"
+    assert len(youtube.requests) == 2
+    assert rss_client._feed_cache.get(CHANNEL_ID).fetched_at > time.time() - 5
+
+
+def test_refresh_error_serves_cached_feed(youtube):
+    youtube.statuses = [200, 500]
+    
+    async def run():
+        await get_channel_feed(CHANNEL_ID)
+        _age_cache(YOUTUBE_FEED_CACHE_TTL + YOUTUBE_FEED_STALE_TTL + 1)
+        return await get_channel_feed(CHANNEL_ID)
+    
+    result = asyncio.run(run())
+    assert result["cache"]["status"] == "stale"
+    assert result["latest_video"]["video_id"] == "video000001"
+
+
+def test_missing_channel_is_not_served_from_cache(youtube):
+    youtube.statuses = [200, 404]
+    
+    async def run():
+        await get_channel_feed(CHANNEL_ID)
+        return await get_channel_feed(CHANNEL_ID, max_age=0)
+    
+    with pytest.raises(FeedNotFoundError):
+        asyncio.run(run())
+
+
+def test_pushed_videos_are_merged_into_cached_feed(youtube):
+    pushed = {"video_id": "video000002", "title": "Pushed", "published": "2025-01-02T00:00:00+00:00"}
+    
+    async def run():
+        await get_channel_feed(CHANNEL_ID)
+        apply_pushed_videos(CHANNEL_ID, [pushed])
+        return await get_channel_feed(CHANNEL_ID, max_videos=15)
+    
+    result = asyncio.run(run())
+    # Newest first; the feed keeps its length (one entry here), as YouTube's does
+    assert [video["video_id"] for video in result["videos"]] == ["video000002"]
+    assert result["channel_title"] == "Channel"
+    assert len(youtube.requests) == 1
+
+
+def test_feed_cache_evicts_least_recently_used():
+    cache = FeedCache(2)
+    for key in ("a", "b"):
+        cache.set(key, CachedFeed(feed=None, etag=None, last_modified=None, fetched_at=0))
+    cache.get("a")
+    cache.set("c", CachedFeed(feed=None, etag=None, last_modified=None, fetched_at=0))
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
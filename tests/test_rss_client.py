@@ -0,0 +1,106 @@
+"""
+Unit tests for incremental RSS feed parsing and the `since` filter (no server or network needed).
+
+Run with: python -m pytest tests/test_rss_client.py
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.youtube.rss_client import ParsedFeed, parse_since, _take_videos
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+ <title>Channel</title>
+ <link rel="alternate" href="https://www.youtube.com/channel/UCaaaaaaaaaaaaaaaaaaaaaa"/>
+ <author><name>Author</name></author>
+ <entry>
+  <yt:videoId>video000003</yt:videoId>
+  <title>Third</title>
+  <published>2025-01-03T00:00:00+00:00</published>
+  <media:group><media:community><media:statistics views="30"/></media:community></media:group>
+ </entry>
+ <entry>
+  <yt:videoId>video000002</yt:videoId>
+  <title>Second</title>
+  <published>2025-01-02T00:00:00+00:00</published>
+ </entry>
+ <entry>
+  <yt:videoId>video000001</yt:videoId>
+  <title>First</title>
+  <published>2025-01-01T00:00:00+00:00</published>
+ </entry>
+</feed>
+"""
+
+
+def _videos():
+    return ParsedFeed("UCaaaaaaaaaaaaaaaaaaaaaa", FEED).videos()
+
+
+def test_parse_feed():
+    feed = ParsedFeed("UCaaaaaaaaaaaaaaaaaaaaaa", FEED)
+    info = feed.info()
+    assert info["channel_title"] == "Channel"
+    assert info["channel_author"] == "Author"
+    assert info["channel_url"] == "https://www.youtube.com/channel/UCaaaaaaaaaaaaaaaaaaaaaa"
+    videos = feed.videos()
+    assert [video["video_id"] for video in videos] == ["video000003", "video000002", "video000001"]
+    assert videos[0]["views"] == 30
+    assert videos[0]["url"] == "https://www.youtube.com/watch?v=video000003"
+
+
+def test_parse_feed_rejects_malformed_xml():
+    with pytest.raises(ValueError):
+        ParsedFeed("UCaaaaaaaaaaaaaaaaaaaaaa", b"<feed>")
+
+
+def test_parsing_stops_early_and_resumes():
+    feed = ParsedFeed("UCaaaaaaaaaaaaaaaaaaaaaa", FEED)
+    assert feed.parsed_count == 1
+    
+    # The newest video and a "nothing new" check need only the first entry
+    assert [video["video_id"] for video in feed.videos(1)] == ["video000003"]
+    assert feed.videos(since="video000003") == []
+    assert feed.parsed_count == 1
+    
+    # Reading stops at the entry holding the marker
+    assert [video["video_id"] for video in feed.videos(since="video000002")] == ["video000003"]
+    assert feed.parsed_count == 2
+    
+    # Later readers reuse the parsed entries and continue from there
+    assert len(feed.videos()) == 3
+    assert feed.parsed_count == 3
+
+
+def test_feed_cut_short_keeps_entries_read():
+    truncated = FEED[:FEED.index(b"<entry>", FEED.index(b"video000002"))]
+    feed = ParsedFeed("UCaaaaaaaaaaaaaaaaaaaaaa", truncated)
+    assert [video["video_id"] for video in feed.videos()] == ["video000003", "video000002"]
+
+
+def test_parse_since():
+    assert parse_since(None) == (None, None)
+    assert parse_since("2025-01-02T00:00:00Z") == (datetime(2025, 1, 2, tzinfo=timezone.utc), None)
+    # Naive timestamps are taken as UTC
+    assert parse_since("2025-01-02") == (datetime(2025, 1, 2, tzinfo=timezone.utc), None)
+    assert parse_since(" dQw4w9WgXcQ ") == (None, "dQw4w9WgXcQ")
+    with pytest.raises(ValueError):
+        parse_since("yesterday")
+
+
+@pytest.mark.parametrize("max_videos, since, expected", [
+    (None, None, ["video000003", "video000002", "video000001"]),
+    (2, None, ["video000003", "video000002"]),
+    (0, None, []),
+    (None, "2025-01-01T12:00:00Z", ["video000003", "video000002"]),
+    # A video published exactly at the timestamp is not newer
+    (None, "2025-01-02T00:00:00Z", ["video000003"]),
+    (None, "video000002", ["video000003"]),
+    (None, "video000003", []),
+    # A video ID no longer in the feed returns every video
+    (None, "video000000", ["video000003", "video000002", "video000001"]),
+    (1, "2024-12-31T00:00:00Z", ["video000003"]),
+])
+def test_take_videos(max_videos, since, expected):
+    assert [video["video_id"] for video in _take_videos(_videos(), max_videos, since)] == expected
@@ -0,0 +1,48 @@
+"""
+Unit tests for subscription change tracking (no server or network needed).
+
+Run with: python -m pytest tests/test_subscription_snapshots.py
+"""
+from app.services.youtube.subscription_snapshots import SubscriptionSnapshotStore
+
+CHANNEL_ID = "UCsBjURrPoezykLs9EqgamOA"
+
+
+def _sub(channel_id: str) -> dict:
+    return {"channel_id": channel_id, "channel_name": channel_id}
+
+
+def _ids(items) -> list:
+    return sorted(item["channel_id"] for item in items)
+
+
+def test_changes_since_nets_out_changes(tmp_path):
+    store = SubscriptionSnapshotStore(str(tmp_path / "snapshots.db"))
+    baseline = store.save_snapshot(CHANNEL_ID, [_sub("a"), _sub("b"), _sub("c")], [], 3)
+    
+    # d is added; b is removed; e is added then removed; c is removed then re-added;
+    # f is added, removed and added again
+    store.save_snapshot(CHANNEL_ID, [_sub("d"), _sub("e"), _sub("f")], [_sub("b"), _sub("c")], 4)
+    middle = store.save_snapshot(CHANNEL_ID, [_sub("c")], [_sub("e"), _sub("f")], 3)
+    store.save_snapshot(CHANNEL_ID, [_sub("f")], [], 4)
+    
+    added, removed = store.changes_since(CHANNEL_ID, baseline)
+    assert _ids(added) == ["d", "f"]
+    assert _ids(removed) == ["b"]
+    
+    added, removed = store.changes_since(CHANNEL_ID, middle)
+    assert _ids(added) == ["f"]
+    assert removed == []
+    
+    assert sorted(store.members(CHANNEL_ID)) == ["a", "c", "d", "f"]
+
+
+def test_snapshots_are_per_channel(tmp_path):
+    store = SubscriptionSnapshotStore(str(tmp_path / "snapshots.db"))
+    snapshot_id = store.save_snapshot(CHANNEL_ID, [_sub("a")], [], 1)
+    store.save_snapshot("UCother", [_sub("x")], [], 1)
+    
+    assert store.has_snapshot(CHANNEL_ID, snapshot_id)
+    assert not store.has_snapshot("UCother", snapshot_id)
+    assert store.changes_since(CHANNEL_ID, snapshot_id) == ([], [])
+    assert store.latest_snapshot(CHANNEL_ID)[:2] == (snapshot_id, 1)
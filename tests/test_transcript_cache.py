@@ -0,0 +1,55 @@
+"""
+Unit tests for the transcript cache (no server or network needed).
+
+Run with: python -m pytest tests/test_transcript_cache.py
+"""
+import os
+import time
+
+from app.services.youtube.transcript_cache import TranscriptCache
+
+
+def _transcript(video_id: str) -> dict:
+    # Random text so entries do not compress to nothing
+    return {"video_id": video_id, "transcript": os.urandom(2000).hex()}
+
+
+def test_set_and_get(tmp_path):
+    cache = TranscriptCache(str(tmp_path / "t.db"), 10, 10 * 1024 * 1024, 60)
+    assert cache.get("aaaaaaaaaaa", None) == (False, None)
+    
+    cache.set("aaaaaaaaaaa", None, _transcript("aaaaaaaaaaa"))
+    found, transcript = cache.get("aaaaaaaaaaa", None)
+    assert found and transcript["video_id"] == "aaaaaaaaaaa"
+    # Languages are separate entries
+    assert cache.get("aaaaaaaaaaa", "de") == (False, None)
+    
+    # Survives a restart (read back from SQLite)
+    reopened = TranscriptCache(str(tmp_path / "t.db"), 10, 10 * 1024 * 1024, 60)
+    assert reopened.get("aaaaaaaaaaa", None)[0]
+
+
+def test_negative_entry_expires(tmp_path):
+    cache = TranscriptCache(str(tmp_path / "t.db"), 10, 10 * 1024 * 1024, 1)
+    cache.set_missing("aaaaaaaaaaa", "en")
+    assert cache.get("aaaaaaaaaaa", "en") == (True, None)
+    
+    time.sleep(1.1)
+    assert cache.get("aaaaaaaaaaa", "en") == (False, None)
+
+
+def test_eviction_keeps_frequently_read_entries(tmp_path):
+    # Room for about three entries; every entry stays in the memory LRU
+    cache = TranscriptCache(str(tmp_path / "t.db"), 100, 8000, 60)
+    cache.set("hothothot01", None, _transcript("hothothot01"))
+    time.sleep(0.01)
+    cache.set("coldcold001", None, _transcript("coldcold001"))
+    time.sleep(0.01)
+    for _ in range(101):
+        assert cache.get("hothothot01", None)[0]
+    time.sleep(0.01)
+    cache.set("newnewnew01", None, _transcript("newnewnew01"))
+    cache.set("newnewnew02", None, _transcript("newnewnew02"))
+    
+    assert cache.get("hothothot01", None)[0]
+    assert not cache.get("coldcold001", None)[0]
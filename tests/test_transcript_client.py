@@ -0,0 +1,96 @@
+"""
+Unit tests for lean transcript extraction (no server or network needed).
+
+Run with: python -m pytest tests/test_transcript_client.py
+"""
+import json
+
+import httpx
+import pytest
+
+from app.services.youtube import transcript_client
+from app.services.youtube.transcript_cache import TranscriptCache
+from app.services.youtube.transcript_client import NoTranscriptError, get_video_transcript
+
+VIDEO_ID = "aaaaaaaaaaa"
+TRACK_URL = "https://www.youtube.com/api/timedtext?v=aaaaaaaaaaa&fmt=json3"
+
+JSON3 = json.dumps({"events": [{"tStartMs": 0, "dDurationMs": 1000, "segs": [{"utf8": "Hello"}]}]})
+
+
+class FakeYoutubeDL:
+    """Returns a fixed info dict instead of calling YouTube."""
+    
+    info = {}
+    
+    def __init__(self, options):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+    
+    def extract_info(self, url, download=False, process=True):
+        return dict(self.info, title="Video", channel_id="UCaaaaaaaaaaaaaaaaaaaaaa")
+
+
+class NoCookies:
+    def attach(self, ydl):
+        pass
+
+
+@pytest.fixture
+def youtube(tmp_path, monkeypatch):
+    """Serve caption bodies from a dict keyed by URL; record subtitle file fallbacks."""
+    bodies = {}
+    fallbacks = []
+    caption_client = httpx.Client(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, text=bodies.get(str(request.url), ""))
+    ))
+    
+    def extract_files(video_id, language):
+        fallbacks.append(video_id)
+        return {"video_id": video_id, "transcript": "from files", "segments": []}
+    
+    cache = TranscriptCache(str(tmp_path / "t.db"), 10, 10 * 1024 * 1024, 60)
+    monkeypatch.setattr(transcript_client.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+    monkeypatch.setattr(transcript_client, "get_cookie_manager", lambda: NoCookies())
+    monkeypatch.setattr(transcript_client, "_get_caption_client", lambda: caption_client)
+    monkeypatch.setattr(transcript_client, "_extract_transcript_files", extract_files)
+    monkeypatch.setattr(transcript_client, "get_transcript_cache", lambda: cache)
+    monkeypatch.setattr(transcript_client, "YOUTUBE_TRANSCRIPT_LEAN", True)
+    monkeypatch.setattr(FakeYoutubeDL, "info", {"subtitles": {"en": [{"ext": "json3", "url": TRACK_URL}]}})
+    return bodies, fallbacks, cache
+
+
+def test_lean_extraction_downloads_json3(youtube):
+    bodies, fallbacks, _ = youtube
+    bodies[TRACK_URL] = JSON3
+    
+    transcript = get_video_transcript(VIDEO_ID)
+    assert transcript["transcript"] == "Hello"
+    assert transcript["language"] == "en"
+    assert fallbacks == []
+
+
+@pytest.mark.parametrize("body", ["", "<html>not json</html>", json.dumps({"events": []})])
+def test_listed_track_with_empty_body_falls_back(youtube, body):
+    bodies, fallbacks, cache = youtube
+    bodies[TRACK_URL] = body
+    
+    assert transcript_client._extract_transcript_lean(VIDEO_ID, None) is None
+    
+    # The subtitle file download answers, and no "no captions" entry is cached
+    transcript = get_video_transcript(VIDEO_ID)
+    assert transcript["transcript"] == "from files"
+    assert fallbacks == [VIDEO_ID]
+    assert cache.get(VIDEO_ID, None)[1]["transcript"] == "from files"
+
+
+def test_no_listed_track_is_no_transcript(youtube, monkeypatch):
+    monkeypatch.setattr(FakeYoutubeDL, "info", {"subtitles": {}, "automatic_captions": {"fr": []}})
+    
+    with pytest.raises(NoTranscriptError):
+        transcript_client._extract_transcript_lean(VIDEO_ID, None)
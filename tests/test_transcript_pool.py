@@ -0,0 +1,111 @@
+"""
+Unit tests for the transcript pool and batch extraction (no server or network needed).
+
+Run with: python -m pytest tests/test_transcript_pool.py
+"""
+import time
+import asyncio
+
+import pytest
+
+from app.services.youtube import transcript_client, transcript_pool
+from app.services.youtube.transcript_cache import TranscriptCache
+from app.services.youtube.transcript_client import NoTranscriptError
+from app.services.youtube.transcript_pool import TranscriptPool, extract_transcripts
+
+CACHED_ID = "aaaaaaaaaaa"
+MISSING_ID = "bbbbbbbbbbb"
+NEW_ID = "ccccccccccc"
+SILENT_ID = "ddddddddddd"
+BROKEN_ID = "eeeeeeeeeee"
+
+
+@pytest.fixture
+def extractions(tmp_path, monkeypatch):
+    cache = TranscriptCache(str(tmp_path / "t.db"), 10, 10 * 1024 * 1024, 60)
+    cache.set(CACHED_ID, None, {"video_id": CACHED_ID, "transcript": "cached"})
+    cache.set_missing(MISSING_ID, None)
+    calls = []
+    
+    def extract(video_id, language):
+        calls.append(video_id)
+        if video_id == SILENT_ID:
+            raise NoTranscriptError("No transcript available")
+        if video_id == BROKEN_ID:
+            raise ValueError("Video unavailable")
+        return {"video_id": video_id, "transcript": "extracted"}
+    
+    pool = TranscriptPool(2, 10, 5)
+    monkeypatch.setattr(transcript_client, "get_transcript_cache", lambda: cache)
+    monkeypatch.setattr(transcript_client, "_extract_transcript", extract)
+    monkeypatch.setattr(transcript_pool, "_pool", pool)
+    yield calls
+    pool.shutdown()
+
+
+def _collect(inputs):
+    async def run():
+        return [line async for line in extract_transcripts(inputs)]
+    return asyncio.run(run())
+
+
+def test_batch_dedupes_and_reports_status(extractions):
+    lines = _collect([
+        "not a video",
+        CACHED_ID,
+        f"https://youtu.be/{NEW_ID}",
+        NEW_ID,
+        MISSING_ID,
+        SILENT_ID,
+        BROKEN_ID,
+    ])
+    
+    # Invalid inputs, then cache answers, then extractions as they complete
+    assert [line["status"] for line in lines[:3]] == ["invalid", "ok", "no_transcript"]
+    assert lines[1]["cache"] == {"status": "hit"}
+    by_status = {line["status"]: line for line in lines[3:]}
+    assert by_status["ok"]["inputs"] == [f"https://youtu.be/{NEW_ID}", NEW_ID]
+    assert by_status["ok"]["cache"] == {"status": "miss"}
+    assert by_status["no_transcript"]["video_id"] == SILENT_ID
+    assert by_status["error"] == {
+        "inputs": [BROKEN_ID], "video_id": BROKEN_ID, "status": "error", "error": "Video unavailable"
+    }
+    assert sorted(extractions) == [NEW_ID, SILENT_ID, BROKEN_ID]
+    
+    # A second batch is answered from the cache, including the new "no captions" entry
+    lines = _collect([NEW_ID, SILENT_ID])
+    assert [line["status"] for line in lines] == ["ok", "no_transcript"]
+    assert len(extractions) == 3
+    assert transcript_pool.get_transcript_pool().stats()["cache_hits"] == 2
+
+
+def test_full_queue_reports_busy(extractions, monkeypatch):
+    pool = TranscriptPool(1, 0, 5)
+    pool._pending = 1
+    monkeypatch.setattr(transcript_pool, "_pool", pool)
+    
+    lines = _collect([NEW_ID])
+    assert lines[0]["status"] == "busy"
+    assert pool.stats()["rejected"] == 1
+
+
+def test_stop_waits_for_running_jobs_before_closing_client(extractions, monkeypatch):
+    events = []
+    
+    def slow_extract(video_id, language):
+        time.sleep(0.2)
+        events.append("extracted")
+        return {"video_id": video_id, "transcript": "extracted"}
+    
+    monkeypatch.setattr(transcript_client, "_extract_transcript", slow_extract)
+    monkeypatch.setattr(transcript_pool, "close_caption_client", lambda: events.append("closed"))
+    
+    async def run():
+        job = asyncio.create_task(transcript_pool.get_transcript_pool().run(NEW_ID))
+        await asyncio.sleep(0.05)
+        await transcript_pool.stop_transcript_pool()
+        return await job
+    
+    assert asyncio.run(run())["transcript"] == "extracted"
+    assert events == ["extracted", "closed"]
+    assert transcript_pool._pool is None
@@ -0,0 +1,77 @@
+"""
+Unit tests for the transcript routes under the app's middleware stack (no server or network needed).
+
+Run with: python -m pytest tests/test_transcript_routes.py
+"""
+import asyncio
+
+from app.core import auth
+from app.main import app
+from app.services.youtube import transcript_routes
+
+API_KEY = "test-key"
+
+
+class HangingPool:
+    """A pool whose jobs never finish on their own."""
+    
+    def __init__(self):
+        self.cancelled = False
+    
+    async def run(self, video, language=None):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def test_transcript_job_is_cancelled_when_client_disconnects(monkeypatch):
+    pool = HangingPool()
+    monkeypatch.setattr(auth, "API_KEY", API_KEY)
+    monkeypatch.setattr(transcript_routes, "get_transcript_pool", lambda: pool)
+    monkeypatch.setattr(transcript_routes, "DISCONNECT_POLL_INTERVAL", 0.05)
+    
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/youtube/transcript",
+        "raw_path": b"/api/v1/youtube/transcript",
+        "query_string": b"video=dQw4w9WgXcQ",
+        "headers": [(b"host", b"testserver"), (b"x-api-key", API_KEY.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+        "root_path": "",
+        "app": app,
+    }
+    
+    async def run():
+        disconnected = asyncio.Event()
+        sent = []
+        request_read = False
+        
+        async def receive():
+            # Like uvicorn: the request body, then a disconnect as soon as the client is gone
+            nonlocal request_read
+            if not request_read:
+                request_read = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+        
+        async def send(message):
+            sent.append(message)
+        
+        request = asyncio.create_task(app(scope, receive, send))
+        await asyncio.sleep(0.2)
+        assert not request.done()
+        disconnected.set()
+        await asyncio.wait_for(request, timeout=5)
+        return sent
+    
+    sent = asyncio.run(run())
+    assert pool.cancelled
+    assert sent[0]["type"] == "http.response.start" and sent[0]["status"] == 499
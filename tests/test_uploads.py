@@ -0,0 +1,76 @@
+"""
+Unit tests for the upload history sync (no server or network needed).
+
+Run with: python -m pytest tests/test_uploads.py
+"""
+import asyncio
+
+from app.services.youtube import uploads
+from app.services.youtube.uploads import UploadHistoryStore, _sync_new_uploads, iter_uploads
+
+CHANNEL_ID = "UCsBjURrPoezykLs9EqgamOA"
+
+
+def _item(video_id: str, day: int) -> dict:
+    return {
+        "snippet": {"title": video_id},
+        "contentDetails": {"videoId": video_id, "videoPublishedAt": f"2025-01-{day:02d}T00:00:00Z"}
+    }
+
+
+def test_sync_walks_uncached_pages_until_a_stored_video(tmp_path, monkeypatch):
+    store = UploadHistoryStore(str(tmp_path / "uploads.db"))
+    store.save(CHANNEL_ID, [uploads._parse_playlist_item(_item("old", 1))], 1, complete=True)
+    
+    # Three new uploads spread over two pages, then the stored one
+    pages = {
+        None: {"items": [_item("new3", 4), _item("new2", 3)], "nextPageToken": "p2", "pageInfo": {"totalResults": 4}},
+        "p2": {"items": [_item("new1", 2), _item("old", 1)], "pageInfo": {"totalResults": 4}},
+    }
+    calls = []
+    
+    async def fetch_page(channel_id, page_token=None, ttl=None):
+        calls.append((page_token, ttl))
+        return pages[page_token]
+    
+    monkeypatch.setattr(uploads, "_fetch_uploads_page", fetch_page)
+    new = asyncio.run(_sync_new_uploads(CHANNEL_ID, store))
+    
+    assert [video["video_id"] for video in new] == ["new3", "new2", "new1"]
+    # Every page bypasses the response cache
+    assert calls == [(None, 0), ("p2", 0)]
+    assert [video["video_id"] for video in store.videos(CHANNEL_ID)] == ["new3", "new2", "new1", "old"]
+    assert store.state(CHANNEL_ID)["total"] == 4
+
+
+def test_paused_reader_does_not_block_the_channel(tmp_path, monkeypatch):
+    store = UploadHistoryStore(str(tmp_path / "uploads.db"))
+    pages = {
+        None: {"items": [_item("v5", 5), _item("v4", 4)], "nextPageToken": "p2"},
+        "p2": {"items": [_item("v3", 3), _item("v2", 2)], "nextPageToken": "p3"},
+        "p3": {"items": [_item("v1", 1)]},
+    }
+    calls = []
+    
+    async def fetch_page(channel_id, page_token=None, ttl=None):
+        calls.append(page_token)
+        return pages[page_token]
+    
+    monkeypatch.setattr(uploads, "_fetch_uploads_page", fetch_page)
+    monkeypatch.setattr(uploads, "get_upload_store", lambda: store)
+    monkeypatch.setattr(uploads, "YOUTUBE_API_KEY", "key")
+    
+    async def run():
+        slow = iter_uploads(CHANNEL_ID)
+        first = await slow.__anext__()
+        # The slow reader is suspended mid-page; a second reader walks the whole history meanwhile
+        fast = [video["video_id"] async for video in iter_uploads(CHANNEL_ID)]
+        rest = [video["video_id"] async for video in slow]
+        return [first["video_id"]] + rest, fast
+    
+    slow, fast = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert fast == ["v5", "v4", "v3", "v2", "v1"]
+    # The slow reader picks up the pages the other one stored, without fetching them again
+    assert slow == ["v5", "v4", "v3", "v2", "v1"]
+    # Backfill pages are fetched once; the second None is the second reader's check for new uploads
+    assert calls == [None, None, "p2", "p3"]
@@ -0,0 +1,87 @@
+"""
+Unit tests for the channel watcher (no server or network needed).
+
+Run with: python -m pytest tests/test_watcher.py
+"""
+import asyncio
+
+import pytest
+
+from app.services.youtube import watcher as watcher_module
+from app.services.youtube.watcher import ChannelWatcher, WatcherStore, _new_videos
+
+CHANNEL_ID = "UCsBjURrPoezykLs9EqgamOA"
+
+
+def _video(video_id: str, day: int) -> dict:
+    return {"video_id": video_id, "published": f"2025-01-{day:02d}T00:00:00+00:00"}
+
+
+FEED = [_video("v4", 4), _video("v3", 3), _video("v2", 2), _video("v1", 1)]
+
+
+@pytest.mark.parametrize("previous, expected", [
+    # First poll: nothing counts as new
+    (None, []),
+    (_video("v4", 4), []),
+    # New uploads are returned oldest first
+    (_video("v2", 2), ["v3", "v4"]),
+    # The previous latest was deleted: fall back to publish times
+    (_video("gone", 2), ["v3", "v4"]),
+    (_video("gone", 5), []),
+])
+def test_new_videos(previous, expected):
+    assert [video["video_id"] for video in _new_videos(FEED, previous)] == expected
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(watcher_module, "YOUTUBE_WATCHER_WEBHOOK_URL", "")
+    watcher = ChannelWatcher(WatcherStore(str(tmp_path / "watcher.db")))
+    watcher.add(CHANNEL_ID)
+    return watcher
+
+
+def test_record_videos_tracks_latest(watcher):
+    assert watcher.record_videos(CHANNEL_ID, FEED[2:]) == []
+    assert watcher.get(CHANNEL_ID)["latest_video"]["video_id"] == "v2"
+    
+    new = watcher.record_videos(CHANNEL_ID, FEED, "Channel")
+    assert [video["video_id"] for video in new] == ["v3", "v4"]
+    state = watcher.get(CHANNEL_ID)
+    assert state["latest_video"]["video_id"] == "v4"
+    assert state["channel_title"] == "Channel"
+
+
+def test_poll_survives_index_errors(watcher, monkeypatch):
+    async def feed(channel_id, max_videos, max_age):
+        return {"videos": FEED, "channel_title": "Channel"}
+    
+    def broken_record(*args, **kwargs):
+        raise RuntimeError("database is locked")
+    
+    monkeypatch.setattr(watcher_module, "get_channel_feed", feed)
+    monkeypatch.setattr(watcher, "record_videos", broken_record)
+    asyncio.run(watcher._poll(CHANNEL_ID))
+    
+    state = watcher.get(CHANNEL_ID)
+    assert state["consecutive_errors"] == 1
+    assert state["last_error"] == "database is locked"
+    assert state["last_polled_at"] is not None
+
+
+def test_latest_requires_running_loop(watcher):
+    watcher.record_videos(CHANNEL_ID, FEED)
+    assert watcher.latest(CHANNEL_ID) is None
+    
+    async def run():
+        watcher.start()
+        await asyncio.sleep(0)
+        assert watcher.latest(CHANNEL_ID)["latest_video"]["video_id"] == "v4"
+        # A dead loop must not keep serving the frozen index
+        watcher._task.cancel()
+        await asyncio.gather(watcher._task, return_exceptions=True)
+        assert not watcher.running
+        assert watcher.latest(CHANNEL_ID) is None
+    
+    asyncio.run(run())
@@ -0,0 +1,215 @@
+"""
+WebSub flow tests against an in-process stand-in hub (no server or network needed).
+
+The hub side is played by the test: it captures the subscription request,
+calls the callback to verify intent and pushes signed notifications, as
+tests/websub_stand_in_hub.py does against a running service.
+
+Run with: python -m pytest tests/test_websub.py
+"""
+import hmac
+import asyncio
+import hashlib
+from urllib.parse import urlparse
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.youtube import websub, websub_routes
+from app.services.youtube.websub import WebSubManager, WebSubStore, _needs_renewal, _valid_signature
+
+CHANNEL_ID = "UCsBjURrPoezykLs9EqgamOA"
+TOPIC = f"https://www.youtube.com/xml/feeds/videos.xml?channel_id={CHANNEL_ID}"
+
+PUSH = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <title>YouTube video feed</title>
+  <entry>
+    <yt:videoId>pushedVideo</yt:videoId>
+    <yt:channelId>{CHANNEL_ID}</yt:channelId>
+    <title>Pushed</title>
+    <published>2025-01-01T00:00:00+00:00</published>
+  </entry>
+</feed>
+""".encode()
+
+
+class StandInHub:
+    """Captures subscription requests the service sends to the hub."""
+    
+    def __init__(self):
+        self.requests = []
+        self.reachable = True
+    
+    async def post(self, url, data=None, **kwargs):
+        if not self.reachable:
+            raise httpx.ConnectError("hub unreachable")
+        self.requests.append(data)
+        return httpx.Response(202, request=httpx.Request("POST", url))
+
+
+class RecordingWatcher:
+    def __init__(self):
+        self.videos = []
+    
+    def record_videos(self, channel_id, videos, channel_title=None):
+        self.videos.extend(videos)
+        return videos
+
+
+@pytest.fixture
+def hub(tmp_path, monkeypatch):
+    hub = StandInHub()
+    watcher = RecordingWatcher()
+    manager = WebSubManager(WebSubStore(str(tmp_path / "websub.db")))
+    monkeypatch.setattr(websub, "YOUTUBE_WEBSUB_CALLBACK_URL", "http://testserver/hooks/youtube/websub")
+    monkeypatch.setattr(websub, "YOUTUBE_WEBSUB_LEASE_SECONDS", 3600)
+    monkeypatch.setattr(websub, "get_http_client", lambda: hub)
+    monkeypatch.setattr(websub, "get_watcher", lambda: watcher)
+    monkeypatch.setattr(websub, "apply_pushed_videos", lambda channel_id, videos: None)
+    monkeypatch.setattr(websub_routes, "get_websub_manager", lambda: manager)
+    
+    app = FastAPI()
+    app.include_router(websub_routes.callback_router, prefix="/hooks/youtube")
+    hub.client = TestClient(app)
+    hub.manager = manager
+    hub.watcher = watcher
+    return hub
+
+
+def _subscribe(hub):
+    asyncio.run(hub.manager.subscribe(CHANNEL_ID))
+    request = hub.requests[-1]
+    assert request["hub.mode"] == "subscribe"
+    assert request["hub.topic"] == TOPIC
+    return urlparse(request["hub.callback"]).path, request["hub.secret"]
+
+
+def _verify(hub, path, lease_seconds=3600):
+    return hub.client.get(path, params={
+        "hub.mode": "subscribe",
+        "hub.topic": TOPIC,
+        "hub.challenge": "challenge-123",
+        "hub.lease_seconds": str(lease_seconds)
+    })
+
+
+def _push(hub, path, secret, algorithm="sha1"):
+    signature = hmac.new(secret.encode(), PUSH, getattr(hashlib, algorithm)).hexdigest()
+    return hub.client.post(path, content=PUSH, headers={"X-Hub-Signature": f"{algorithm}={signature}"})
+
+
+def test_verification_echoes_challenge_and_caps_lease(hub):
+    path, _ = _subscribe(hub)
+    assert hub.manager.list()[0]["state"] == "pending"
+    assert "token" not in hub.manager.list()[0]
+    
+    response = _verify(hub, path, lease_seconds=10 ** 9)
+    assert response.status_code == 200
+    assert response.text == "challenge-123"
+    
+    subscription = hub.manager.list()[0]
+    assert subscription["state"] == "subscribed"
+    assert subscription["lease_seconds"] == 3600
+    assert hub.manager.is_active(CHANNEL_ID)
+
+
+def test_verification_requires_callback_token(hub):
+    path, _ = _subscribe(hub)
+    
+    assert _verify(hub, f"/hooks/youtube/websub/{CHANNEL_ID}/wrong-token").status_code == 404
+    assert hub.client.get(f"/hooks/youtube/websub/{CHANNEL_ID}", params={
+        "hub.mode": "subscribe", "hub.topic": TOPIC, "hub.challenge": "x"
+    }).status_code == 404
+    assert hub.manager.list()[0]["state"] == "pending"
+
+
+def test_verification_rejects_unrequested_topic(hub):
+    path, _ = _subscribe(hub)
+    response = hub.client.get(path, params={
+        "hub.mode": "subscribe",
+        "hub.topic": "https://www.youtube.com/xml/feeds/videos.xml?channel_id=UCother",
+        "hub.challenge": "x"
+    })
+    assert response.status_code == 404
+
+
+def test_signed_push_is_ingested(hub):
+    path, secret = _subscribe(hub)
+    _verify(hub, path)
+    
+    assert _push(hub, path, secret).status_code == 204
+    assert _push(hub, path, secret, algorithm="sha256").status_code == 204
+    assert [video["video_id"] for video in hub.watcher.videos] == ["pushedVideo", "pushedVideo"]
+
+
+def test_push_with_bad_signature_or_token_is_ignored(hub):
+    path, secret = _subscribe(hub)
+    _verify(hub, path)
+    
+    assert _push(hub, path, "wrong-secret").status_code == 204
+    assert _push(hub, f"/hooks/youtube/websub/{CHANNEL_ID}/wrong-token", secret).status_code == 204
+    assert hub.client.post(path, content=PUSH).status_code == 204
+    assert hub.watcher.videos == []
+
+
+def test_token_is_kept_on_renewal(hub):
+    first, _ = _subscribe(hub)
+    second, _ = _subscribe(hub)
+    assert first == second
+
+
+def test_failed_unsubscribe_keeps_subscription(hub):
+    path, _ = _subscribe(hub)
+    _verify(hub, path)
+    
+    hub.reachable = False
+    with pytest.raises(ValueError):
+        asyncio.run(hub.manager.unsubscribe(CHANNEL_ID))
+    assert hub.manager.list()[0]["state"] == "subscribed"
+    assert hub.manager.is_active(CHANNEL_ID)
+
+
+def test_denied_subscription_is_not_renewed(hub):
+    path, _ = _subscribe(hub)
+    response = hub.client.get(path, params={
+        "hub.mode": "denied", "hub.topic": TOPIC, "hub.reason": "topic not allowed"
+    })
+    assert response.status_code == 200
+    
+    subscription = hub.manager._store.get(CHANNEL_ID)
+    assert subscription["state"] == "denied"
+    assert not _needs_renewal(subscription, subscription["requested_at"] + 10 ** 6)
+    
+    # Subscribing again asks the hub once more
+    asyncio.run(hub.manager.subscribe(CHANNEL_ID))
+    assert hub.manager.list()[0]["state"] == "pending"
+
+
+def test_unverified_renewal_is_not_repeated(hub):
+    path, _ = _subscribe(hub)
+    _verify(hub, path)
+    subscription = hub.manager._store.get(CHANNEL_ID)
+    
+    # Near the end of the lease a renewal is due
+    near_expiry = subscription["expires_at"] - 60
+    assert _needs_renewal(subscription, near_expiry)
+    
+    # Once requested, it waits for the hub instead of being re-POSTed every check
+    subscription["requested_at"] = near_expiry
+    assert not _needs_renewal(subscription, near_expiry + websub.RENEW_CHECK_INTERVAL)
+    assert _needs_renewal(subscription, near_expiry + websub.PENDING_RETRY_AFTER + 1)
+
+
+@pytest.mark.parametrize("signature, valid", [
+    ("sha1=" + hmac.new(b"secret", b"body", hashlib.sha1).hexdigest(), True),
+    ("SHA256=" + hmac.new(b"secret", b"body", hashlib.sha256).hexdigest().upper(), True),
+    ("sha1=" + hmac.new(b"other", b"body", hashlib.sha1).hexdigest(), False),
+    ("md5=" + hashlib.md5(b"body").hexdigest(), False),
+    ("sha1", False),
+    (None, False),
+])
+def test_valid_signature(signature, valid):
+    assert _valid_signature("secret", b"body", signature) is valid
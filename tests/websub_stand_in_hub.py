@@ -0,0 +1,196 @@
+"""
+Local stand-in for the YouTube WebSub hub.
+
+Implements the parts of the hub protocol the service relies on: it accepts
+subscribe/unsubscribe requests, verifies intent by calling the callback with
+a hub.challenge, and publishes signed Atom notifications to verified
+subscribers on demand.
+
+Usage:
+    python tests/websub_stand_in_hub.py                # hub on :8090
+    
+    # service, pointed at the stand-in hub
+    YOUTUBE_WEBSUB_HUB_URL=http://localhost:8090/subscribe \\
+    YOUTUBE_WEBSUB_CALLBACK_URL=http://localhost:2277/hooks/youtube/websub \\
+    uvicorn app.main:app --port 2277
+    
+    python tests/websub_stand_in_hub.py --subscribe UCsBjURrPoezykLs9EqgamOA
+    python tests/websub_stand_in_hub.py --publish UCsBjURrPoezykLs9EqgamOA
+    python tests/websub_stand_in_hub.py --publish UCsBjURrPoezykLs9EqgamOA --bad-signature
+
+--subscribe goes through the service API (subscriptions are listed at
+/api/v1/youtube/websub/subscriptions); --publish asks the running hub to push
+a new video to that channel's subscriber.
+"""
+
+import os
+import sys
+import hmac
+import time
+import random
+import string
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HUB_PORT = int(os.getenv("HUB_PORT", "8090"))
+HUB_URL = f"http://localhost:{HUB_PORT}"
+BASE_URL = os.getenv("BASE_URL", "http://localhost:2277")
+API_KEY = os.getenv("API_KEY", "supersecretapikey")
+
+ENTRY_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <link rel="hub" href="{hub}"/>
+  <link rel="self" href="{topic}"/>
+  <title>YouTube video feed</title>
+  <updated>{now}</updated>
+  <entry>
+    <id>yt:video:{video_id}</id>
+    <yt:videoId>{video_id}</yt:videoId>
+    <yt:channelId>{channel_id}</yt:channelId>
+    <title>Stand-in upload {video_id}</title>
+    <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+    <author>
+      <name>Stand-in channel</name>
+      <uri>https://www.youtube.com/channel/{channel_id}</uri>
+    </author>
+    <published>{now}</published>
+    <updated>{now}</updated>
+  </entry>
+</feed>
+"""
+
+
+def run_hub():
+    """Serve the stand-in hub until interrupted."""
+    import uvicorn
+    from fastapi import FastAPI, Request, Response, HTTPException
+    
+    app = FastAPI(title="WebSub stand-in hub")
+    # topic -> {"callback": ..., "secret": ..., "channel_id": ...}
+    subscribers = {}
+    
+    @app.post("/subscribe")
+    async def subscribe(request: Request):
+        form = parse_qs((await request.body()).decode())
+        field = lambda name: form.get(name, [None])[0]
+        mode, topic, callback = field("hub.mode"), field("hub.topic"), field("hub.callback")
+        if mode not in ("subscribe", "unsubscribe") or not topic or not callback:
+            raise HTTPException(status_code=400, detail="hub.mode, hub.topic and hub.callback are required")
+        
+        # Verification is done inline for simplicity; a real hub does it asynchronously
+        challenge = "".join(random.choices(string.ascii_letters + string.digits, k=32))
+        params = {"hub.mode": mode, "hub.topic": topic, "hub.challenge": challenge}
+        if mode == "subscribe":
+            params["hub.lease_seconds"] = field("hub.lease_seconds") or "432000"
+        verification = requests.get(callback, params=params, timeout=10)
+        if verification.status_code != 200 or verification.text != challenge:
+            print(f"❌ Intent verification failed for {callback}: {verification.status_code}")
+            return Response(status_code=202)
+        
+        channel_id = parse_qs(urlparse(topic).query).get("channel_id", [""])[0]
+        if mode == "subscribe":
+            subscribers[topic] = {"callback": callback, "secret": field("hub.secret"), "channel_id": channel_id}
+            print(f"✅ Verified subscription for {channel_id}")
+        else:
+            subscribers.pop(topic, None)
+            print(f"✅ Verified unsubscription for {channel_id}")
+        return Response(status_code=202)
+    
+    @app.post("/publish")
+    async def publish(channel_id: str, bad_signature: bool = False):
+        topic = f"https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
+        subscriber = subscribers.get(topic)
+        if subscriber is None:
+            raise HTTPException(status_code=404, detail=f"No subscriber for {channel_id}")
+        
+        video_id = "".join(random.choices(string.ascii_letters + string.digits + "-_", k=11))
+        now = datetime.now(timezone.utc).isoformat()
+        body = ENTRY_TEMPLATE.format(
+            hub=f"{HUB_URL}/subscribe", topic=topic, now=now, video_id=video_id, channel_id=channel_id
+        ).encode()
+        
+        secret = "wrong-secret" if bad_signature else (subscriber["secret"] or "")
+        signature = hmac.new(secret.encode(), body, hashlib.sha1).hexdigest()
+        response = requests.post(
+            subscriber["callback"],
+            data=body,
+            headers={"Content-Type": "application/atom+xml", "X-Hub-Signature": f"sha1={signature}"},
+            timeout=10
+        )
+        print(f"📤 Pushed {video_id} to {channel_id}: {response.status_code}")
+        return {"video_id": video_id, "callback_status": response.status_code}
+    
+    uvicorn.run(app, host="0.0.0.0", port=HUB_PORT)
+
+
+def subscribe(channel_id):
+    """Subscribe through the service and show the resulting subscription."""
+    headers = {"X-API-Key": API_KEY}
+    response = requests.post(
+        f"{BASE_URL}/api/v1/youtube/websub/subscriptions",
+        json={"channel_ids": [channel_id]},
+        headers=headers,
+        timeout=30
+    )
+    print(f"Subscribe: {response.status_code} {response.json()}")
+    
+    time.sleep(1)
+    response = requests.get(f"{BASE_URL}/api/v1/youtube/websub/subscriptions", headers=headers, timeout=10)
+    for subscription in response.json().get("subscriptions", []):
+        if subscription["channel_id"] == channel_id:
+            ok = subscription["state"] == "subscribed"
+            print(f"{'✅' if ok else '❌'} {channel_id}: {subscription['state']}")
+            return ok
+    print(f"❌ {channel_id} not listed")
+    return False
+
+
+def publish(channel_id, bad_signature=False):
+    """Push a new video and check whether the watcher picked it up."""
+    response = requests.post(
+        f"{HUB_URL}/publish",
+        params={"channel_id": channel_id, "bad_signature": str(bad_signature).lower()},
+        timeout=30
+    )
+    if response.status_code != 200:
+        print(f"❌ Publish failed: {response.status_code} {response.text}")
+        return False
+    video_id = response.json()["video_id"]
+    
+    response = requests.get(
+        f"{BASE_URL}/api/v1/youtube/watcher/channels",
+        headers={"X-API-Key": API_KEY},
+        timeout=10
+    )
+    latest = next(
+        (
+            channel["latest_video"] for channel in response.json().get("channels", [])
+            if channel["channel_id"] == channel_id
+        ),
+        None
+    )
+    delivered = bool(latest) and latest["video_id"] == video_id
+    expected = not bad_signature
+    print(f"{'✅' if delivered == expected else '❌'} {video_id} {'delivered' if delivered else 'not delivered'}")
+    return delivered == expected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribe", metavar="CHANNEL_ID", help="subscribe a channel through the service")
+    parser.add_argument("--publish", metavar="CHANNEL_ID", help="push a new video for a channel")
+    parser.add_argument("--bad-signature", action="store_true", help="sign the push with the wrong secret")
+    args = parser.parse_args()
+    
+    if args.subscribe:
+        sys.exit(0 if subscribe(args.subscribe) else 1)
+    if args.publish:
+        sys.exit(0 if publish(args.publish, args.bad_signature) else 1)
+    run_hub()